@@ -1,5 +1,11 @@
 import streamlit as st
 from utils.ai_problem_generator import AIProblemGenerator
+from utils.quota_ledger import format_wait
+from utils.feedback_queue import get_feedback_queue
+from utils.feedback_pipeline import (
+    PIPELINES, REQUIRED_STAGES, STAGE_REGISTRY, FeedbackSettings, get_pipeline_stage_names, get_stage_metrics
+)
+import pandas as pd
 
 def show_api_settings():
     """API 설정을 관리하는 섹션을 표시합니다."""
@@ -12,9 +18,8 @@ def show_api_settings():
     if current_key:
         st.success("✅ API 키가 설정되어 있습니다")
         
-        # 남은 생성 횟수 표시
-        remaining = ai_generator.get_remaining_generations()
-        st.info(f"🔄 오늘 남은 문제 생성 횟수: {remaining}개")
+        # 남은 생성 횟수 표시 (모든 세션과 서버 프로세스가 함께 쓰는 한도)
+        show_quota_status(ai_generator)
         
         # API 키 제거 버튼
         if st.button("🗑 API 키 제거"):
@@ -40,6 +45,111 @@ def show_api_settings():
                 else:
                     st.error("❌ 잘못된 API 키입니다. 다시 확인해주세요.")
 
+def show_quota_status(ai_generator):
+    """최근 24시간 동안의 공유 AI 생성 한도 사용 현황을 표시합니다."""
+    quota = ai_generator.get_quota_status()
+    st.info(f"🔄 남은 문제 생성 횟수: {quota['remaining']}개 / {quota['limit']}개 (최근 24시간, 모든 사용자 공용)")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("사용량", f"{quota['used']}개")
+    with col2:
+        st.metric("대기 중인 요청", quota['waiting'])
+    with col3:
+        next_release = format_wait(quota['next_release']) if quota['next_release'] is not None else "-"
+        st.metric("다음 한도 회복까지", next_release)
+    st.progress(min(quota['used'] / quota['limit'], 1.0) if quota['limit'] else 0.0)
+
+def show_feedback_queue_status():
+    """첨삭 작업 큐 상태를 표시합니다."""
+    st.subheader("📬 첨삭 작업 큐")
+    
+    metrics = get_feedback_queue().get_metrics()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("대기 중", metrics['queue_depth'])
+    with col2:
+        st.metric("처리 중", metrics['running'])
+    with col3:
+        st.metric("완료", metrics['done'])
+    with col4:
+        st.metric("실패", metrics['failed'])
+    
+    if 'latency_avg' in metrics:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("평균 지연", f"{metrics['latency_avg']:.2f}초")
+        with col2:
+            st.metric("지연 p50", f"{metrics['latency_p50']:.2f}초")
+        with col3:
+            st.metric("지연 p95", f"{metrics['latency_p95']:.2f}초")
+        with col4:
+            st.metric("평균 대기", f"{metrics['wait_avg']:.2f}초")
+    
+    if st.button("🔄 새로고침", key="refresh_queue_metrics"):
+        st.rerun()
+
+def show_feedback_pipeline_settings():
+    """첨삭 분석 단계별 실행 시간과 문제 유형별 사용 단계를 표시합니다."""
+    st.subheader("⏱ 첨삭 분석 단계")
+    
+    summary = get_stage_metrics().get_summary()
+    if summary:
+        df = pd.DataFrame(summary)[['label', 'count', 'mean_ms', 'p50_ms', 'p95_ms']]
+        df.columns = ['단계', '실행 횟수', '평균(ms)', 'p50(ms)', 'p95(ms)']
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("아직 기록된 분석 단계 실행 시간이 없습니다.")
+    
+    settings = FeedbackSettings()
+    disabled_stages = dict(settings.get()['disabled_stages'])
+    with st.form("feedback_pipeline_form"):
+        time_budget = st.number_input(
+            "첨삭 시간 예산 (초)",
+            min_value=0.0,
+            max_value=60.0,
+            value=settings.get_time_budget(),
+            step=0.5,
+            help="예산을 넘기면 우선순위가 낮은 분석은 나중에 처리하고 먼저 부분 결과를 보여줍니다. 0이면 제한하지 않습니다."
+        )
+        fuzzy_credit = st.text_input(
+            "단어 문제 오타 부분 점수",
+            value=", ".join(str(credit) for credit in settings.get_fuzzy_credit()),
+            help="편집 거리 0(정답), 1, 2, … 순서의 점수를 쉼표로 구분해 입력하세요. 예: 100, 70, 40"
+        )
+        st.caption("문제 유형별로 사용할 분석 단계를 선택하세요. 끈 단계는 첨삭에서 제외됩니다. "
+                   f"{', '.join(STAGE_REGISTRY[name].label for name in REQUIRED_STAGES)} 단계는 끌 수 없습니다.")
+        for problem_type in PIPELINES:
+            stage_names = get_pipeline_stage_names(problem_type)
+            enabled = st.multiselect(
+                problem_type,
+                stage_names,
+                default=[name for name in stage_names if name not in disabled_stages.get(problem_type, [])],
+                format_func=lambda name: STAGE_REGISTRY[name].label,
+                key=f"pipeline_{problem_type}"
+            )
+            disabled_stages[problem_type] = [name for name in stage_names if name not in enabled]
+        
+        if st.form_submit_button("💾 분석 단계 저장"):
+            try:
+                fuzzy_credit = [int(credit) for credit in fuzzy_credit.split(',') if credit.strip()]
+            except ValueError:
+                fuzzy_credit = []
+            if not fuzzy_credit or not all(0 <= credit <= 100 for credit in fuzzy_credit):
+                st.error("오타 부분 점수는 0~100 사이의 숫자를 쉼표로 구분해 입력해주세요.")
+                return
+            required_off = [
+                problem_type for problem_type, names in disabled_stages.items()
+                if any(name in REQUIRED_STAGES for name in names)
+            ]
+            if required_off:
+                st.error(f"{', '.join(required_off)}: "
+                         f"{', '.join(STAGE_REGISTRY[name].label for name in REQUIRED_STAGES)} 단계는 끌 수 없습니다.")
+                return
+            if settings.update(disabled_stages=disabled_stages, time_budget=time_budget, fuzzy_credit=fuzzy_credit):
+                st.success("✅ 분석 단계 설정이 저장되었습니다.")
+            else:
+                st.error("설정 저장 중 오류가 발생했습니다.")
+
 def show_admin_settings():
     """관리자 설정 페이지를 표시합니다."""
     st.title("⚙️ 관리자 설정")
@@ -57,7 +167,8 @@ def show_admin_settings():
         
     with tab2:
         st.subheader("🛠 기타 설정")
-        # 여기에 추가 설정 옵션 구현
+        show_feedback_queue_status()
+        show_feedback_pipeline_settings()
 
 def main():
     show_admin_settings()
@@ -8,6 +8,7 @@ import json
 from utils.problem_generator import ProblemGenerator
 from pathlib import Path
 from utils.ai_problem_generator import AIProblemGenerator
+from utils.quota_ledger import INTERACTIVE_WAIT_SECONDS, QuotaExceededError, format_wait
 import os
 
 # 문제 관리자 초기화
@@ -389,27 +390,30 @@ def show_ai_generation_section():
             st.info("관리자 설정 페이지에서 API 키를 설정할 수 있습니다.")
         return
         
-    # 남은 생성 횟수 표시
-    remaining = ai_generator.get_remaining_generations()
+    # 남은 생성 횟수 표시 (모든 사용자가 함께 쓰는 한도입니다)
+    quota = ai_generator.get_quota_status()
+    remaining = quota['remaining']
     st.markdown('<div class="stat-box">', unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("오늘 남은 생성 횟수", f"{remaining}개")
+        st.metric("남은 생성 횟수 (최근 24시간)", f"{remaining}개")
     with col2:
-        st.metric("일일 최대 생성 한도", "100개")
+        st.metric("일일 최대 생성 한도", f"{quota['limit']}개")
     st.markdown('</div>', unsafe_allow_html=True)
     
-    if not ai_generator.can_generate_more():
-        st.error("❌ 오늘의 문제 생성 한도를 모두 사용했습니다. 내일 다시 시도해주세요.")
+    if remaining <= 0:
+        wait = f" 약 {format_wait(quota['next_release'])} 후에" if quota['next_release'] else ""
+        st.error(f"❌ 문제 생성 한도를 모두 사용했습니다.{wait} 다시 시도해주세요.")
         return
         
     st.markdown('<div class="info-box">', unsafe_allow_html=True)
-    st.markdown("""
+    st.markdown(f"""
     ### 📝 AI 문제 생성 가이드
     1. 문제 유형과 난이도를 선택하세요
     2. 주제를 지정하면 더 구체적인 문제가 생성됩니다
     3. 한 번에 최대 5개까지 문제를 생성할 수 있습니다
     4. 생성된 문제는 검토 후 저장할 수 있습니다
+    5. 한도가 모자라면 요청은 최대 {INTERACTIVE_WAIT_SECONDS}초 동안 차례를 기다린 뒤 거절되며, 저장되었다가 나중에 생성되지 않습니다
     """)
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -494,13 +498,71 @@ def show_ai_generation_section():
                 else:
                     st.error("❌ 문제 저장 중 오류가 발생했습니다.")
                     
+        except QuotaExceededError as e:
+            wait = f"약 {format_wait(e.wait_seconds)} 후에" if e.wait_seconds else "진행 중인 생성이 끝난 뒤"
+            st.warning(f"⏳ 생성 한도가 모자라 요청이 거절되었습니다. 요청은 저장되지 않으니 {wait} 다시 시도해주세요. "
+                       f"(남은 생성 가능 횟수: {e.remaining}개)")
         except Exception as e:
             st.error(f"문제 생성 중 오류가 발생했습니다: {str(e)}")
             if "rate limit" in str(e).lower():
                 st.warning("⚠️ API 호출 한도에 도달했습니다. 잠시 후 다시 시도해주세요.")
+    
+    show_batch_generation_section(ai_generator, remaining)
                 
     st.markdown('</div>', unsafe_allow_html=True)
 
+def show_batch_generation_section(ai_generator, remaining):
+    """여러 유형과 난이도의 문제를 한 번에 생성하는 섹션을 표시합니다."""
+    st.markdown("---")
+    st.subheader("📦 AI 문제 대량 생성")
+    st.caption("요청을 여러 번의 호출로 나눠 동시에 생성하며, API 속도 제한에 맞춰 자동으로 조절하고 실패한 호출은 다시 시도합니다. "
+               f"생성 한도를 {INTERACTIVE_WAIT_SECONDS}초 안에 받지 못한 호출은 거절되어 오류 목록에 표시됩니다.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        problem_types = st.multiselect("문제 유형", ["단어", "문법", "독해", "회화"], default=["단어", "문법"],
+                                       key="batch_problem_types")
+        total = st.number_input("생성할 문제 수", min_value=1, max_value=max(1, remaining), value=min(20, max(1, remaining)),
+                                key="batch_total")
+    with col2:
+        difficulties = st.multiselect("난이도", [1, 2, 3, 4, 5], default=[2, 3, 4], key="batch_difficulties")
+        topic = st.text_input("주제 (선택사항)", key="batch_topic")
+    
+    if st.button("🤖 대량 생성 시작", use_container_width=True, disabled=not (problem_types and difficulties)):
+        st.session_state.batch_problems = []
+        progress = st.progress(0.0, text="생성을 시작합니다...")
+        errors = []
+        try:
+            for result in ai_generator.generate_problems_batch(problem_types, difficulties, int(total), topic or None):
+                st.session_state.batch_problems.extend(result['problems'])
+                if result['error']:
+                    job = result['job']
+                    errors.append(f"{job['problem_type']} / 난이도 {job['difficulty']} ({job['count']}개): {result['error']}")
+                done = len(st.session_state.batch_problems)
+                progress.progress(min(done / int(total), 1.0), text=f"{done}/{int(total)}개 생성")
+        except Exception as e:
+            st.error(f"문제 생성 중 오류가 발생했습니다: {str(e)}")
+        if errors:
+            st.warning("일부 호출이 재시도 후에도 실패했습니다:\n\n" + "\n".join(f"- {error}" for error in errors))
+    
+    problems = st.session_state.get('batch_problems', [])
+    if not problems:
+        return
+    
+    st.success(f"✨ {len(problems)}개의 문제가 생성되었습니다!")
+    st.dataframe(
+        pd.DataFrame(problems)[['type', 'difficulty', 'title', 'correct_answer']].rename(columns={
+            'type': '유형', 'difficulty': '난이도', 'title': '제목', 'correct_answer': '정답'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    if st.button("💾 생성된 문제 모두 저장", type="primary", use_container_width=True):
+        # 유사도 인덱스를 문제마다 다시 계산하지 않도록 한 번에 추가합니다.
+        problem_manager.add_problems(problems)
+        del st.session_state.batch_problems
+        st.success(f"✅ {len(problems)}개의 문제가 저장되었습니다!")
+
 def show_manual_input_form():
     """직접 입력 폼을 표시합니다."""
     st.markdown("""
@@ -1,7 +1,9 @@
 import streamlit as st
-from utils.student_manager import StudentManager
+from utils.student_manager import StudentManager, get_student_class
 from utils.problem_manager import ProblemManager
-from utils.feedback_generator import FeedbackGenerator
+from utils.ranking_service import RANKING_METRICS
+from utils.feedback_queue import get_feedback_queue
+from utils.feedback_generator import format_feedback_summary
 import pandas as pd
 from datetime import datetime
 import time
@@ -9,7 +11,6 @@ import time
 # 관리자 초기화
 student_manager = StudentManager()
 problem_manager = ProblemManager()
-feedback_generator = FeedbackGenerator()
 
 def display_student_dashboard(student):
     """학생 대시보드를 표시합니다."""
@@ -76,6 +77,15 @@ def display_student_dashboard(student):
     </div>
     """.format(total_problems, completed_problems, average_score), unsafe_allow_html=True)
 
+    # 반 내 주간 순위
+    ranking_service = student_manager.get_ranking_service()
+    class_student_ids = student_manager.get_class_student_ids(get_student_class(student))
+    rank_cols = st.columns(len(RANKING_METRICS))
+    for col, (metric, label) in zip(rank_cols, RANKING_METRICS.items()):
+        rank, total = ranking_service.get_rank(student['id'], metric, student_ids=class_student_ids)
+        with col:
+            st.metric(f"이번 주 {label} 순위", f"{rank}위 / {total}명" if rank else "-")
+
     # 최근 제출한 문제
     st.markdown("<div class='dashboard-card'>", unsafe_allow_html=True)
     st.markdown("### 📝 최근 제출한 문제")
@@ -287,7 +297,15 @@ def display_problem_solving_interface():
             # 제출 버튼
             if st.button("제출하기", use_container_width=True):
                 # 답안 저장
-                if student_manager.submit_answer(st.session_state.current_assignment_id, answer):
+                if student_manager.submit_assignment(st.session_state.current_assignment_id, answer):
+                    # 첨삭은 백그라운드 작업자가 생성하므로 제출은 바로 끝납니다.
+                    st.session_state.feedback_job_id = get_feedback_queue().enqueue(
+                        st.session_state.current_assignment_id,
+                        answer,
+                        problem["model_answer"],
+                        problem["type"],
+                        problem=problem
+                    )
                     st.session_state.submitted_answer = answer
                     st.session_state.submission_time = datetime.now()
                     st.rerun()
@@ -299,19 +317,39 @@ def display_problem_solving_interface():
             st.markdown("### 제출된 답안")
             st.write(st.session_state.submitted_answer)
             
-            # 첨삭 피드백 생성
-            if "feedback" not in st.session_state:
-                with st.spinner("첨삭을 생성하는 중..."):
-                    st.session_state.feedback = feedback_generator.generate_detailed_feedback(
-                        st.session_state.submitted_answer,
-                        problem["model_answer"],
-                        problem["type"]
-                    )
+            # 첨삭 결과 확인 (백그라운드 작업 완료 여부 조회)
+            job = None
+            feedback = st.session_state.get("feedback")
+            if (feedback is None or feedback.get("partial")) and "feedback_job_id" in st.session_state:
+                job = get_feedback_queue().get_job(st.session_state.feedback_job_id)
+                if job and job['status'] == 'done':
+                    st.session_state.feedback = job['result']
+                    # 시간 예산 때문에 미뤄진 분석은 이어서 처리하는 작업의 결과를 기다립니다.
+                    if job['result'].get('completion_job_id'):
+                        st.session_state.feedback_job_id = job['result']['completion_job_id']
+                elif job and job['status'] == 'failed':
+                    if feedback is None:
+                        st.error("첨삭 생성 중 오류가 발생했습니다. 선생님께 문의해주세요.")
+                    del st.session_state.feedback_job_id
             
             # 피드백 표시
             st.markdown('<div class="feedback-section">', unsafe_allow_html=True)
             st.markdown("### 📝 첨삭 결과")
-            st.markdown(st.session_state.feedback["korean_summary"])
+            if "feedback" in st.session_state:
+                st.markdown(st.session_state.feedback["korean_summary"])
+                if st.session_state.feedback.get("partial") and "feedback_job_id" in st.session_state:
+                    time.sleep(1)
+                    st.rerun()
+            elif job and job['status'] in ('pending', 'running'):
+                if job['status'] == 'pending':
+                    st.info(f"⏳ 첨삭 대기 중입니다. (대기 순서: {job['position']}번째)")
+                else:
+                    st.info("✍️ 첨삭을 생성하는 중입니다...")
+                    # 먼저 끝난 분석 단계의 결과를 바로 보여줍니다.
+                    if job.get('partial'):
+                        st.markdown(format_feedback_summary(job['partial'], include_score=False))
+                time.sleep(1)
+                st.rerun()
             
             # 모범 답안 표시
             st.markdown("### ✨ 모범 답안")
@@ -324,6 +362,8 @@ def display_problem_solving_interface():
                 del st.session_state.submitted_answer
                 if "feedback" in st.session_state:
                     del st.session_state.feedback
+                if "feedback_job_id" in st.session_state:
+                    del st.session_state.feedback_job_id
                 st.rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
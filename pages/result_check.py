@@ -1,10 +1,19 @@
 import streamlit as st
-from utils.student_manager import StudentManager
+from utils.student_manager import StudentManager, get_student_class
 from utils.problem_manager import ProblemManager
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.analytics import get_data_version, build_analytics_frame, compute_class_mastery
+from utils.ranking_service import RANKING_METRICS, get_week_key
+from utils.result_exporter import MAX_DOWNLOAD_BYTES, ResultExporter, cleanup_exports
+from utils.feedback_generator import FeedbackGenerator
+from utils.model_answer_store import get_model_answer_text
+from utils.feedback_cache import get_analyzer_version
+from utils.error_mining import ERROR_KINDS, GROUP_BY, ErrorMiner
+from pathlib import Path
+import os
 
 # 관리자 초기화
 student_manager = StudentManager()
@@ -204,17 +213,315 @@ def display_statistics():
                  barmode='group')
     st.plotly_chart(fig)
 
+@st.cache_data(show_spinner=False)
+def load_class_mastery(data_version, class_name):
+    """데이터 버전별로 반별 숙달도 표를 계산해 캐시합니다."""
+    students = StudentManager()
+    frame = build_analytics_frame(students.get_all_students(), students.assignments,
+                                  ProblemManager().get_all_problems())
+    return compute_class_mastery(frame, class_name)
+
+def display_class_mastery():
+    """반 전체의 학생 × 문제 유형별 숙달도를 히트맵으로 표시합니다."""
+    st.subheader("반별 숙달도")
+    
+    students = student_manager.get_all_students()
+    if not students:
+        st.info("등록된 학생이 없습니다.")
+        return
+    
+    classes = student_manager.get_class_names()
+    selected_class = st.selectbox("반 선택", ["전체"] + classes, key="mastery_class")
+    
+    mastery = load_class_mastery(get_data_version(), None if selected_class == "전체" else selected_class)
+    if mastery.empty:
+        st.info("채점된 제출 기록이 없습니다.")
+        return
+    
+    fig = px.imshow(
+        mastery,
+        labels={'x': '문제 유형', 'y': '학생', 'color': '평균 점수'},
+        color_continuous_scale='RdYlGn',
+        zmin=0,
+        zmax=100,
+        aspect='auto',
+        title='학생 × 문제 유형별 평균 점수'
+    )
+    fig.update_layout(height=max(400, min(20 * len(mastery), 4000)))
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("표로 보기"):
+        st.dataframe(mastery, use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def update_error_mining(data_version):
+    """데이터가 바뀌었을 때만 날짜별 오류 집계를 갱신합니다.
+
+    페이지에서는 프로세스를 띄우지 않고 바로 계산합니다. 쌓인 기록을 한꺼번에 다시 집계할 때는
+    `python -m utils.error_mining --workers N`을 사용합니다.
+    """
+    students = StudentManager()
+    return ErrorMiner().update(students.assignments, students.get_all_students())
+
+def display_common_errors():
+    """반별로 자주 나오는 오류 순위를 표시합니다."""
+    st.subheader("자주 틀리는 오류")
+    
+    students = student_manager.get_all_students()
+    if not students:
+        st.info("등록된 학생이 없습니다.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        classes = student_manager.get_class_names()
+        selected_class = st.selectbox("반 선택", ["전체"] + classes, key="errors_class")
+    with col2:
+        period = st.selectbox("기간", ["이번 주", "최근 30일", "전체"], key="errors_period")
+    with col3:
+        kind = st.selectbox("종류", ["전체"] + list(ERROR_KINDS.values()), key="errors_kind")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        group_by = st.selectbox("묶는 기준", list(GROUP_BY.keys()), format_func=GROUP_BY.get, key="errors_group_by")
+    with col2:
+        limit = st.slider("표시할 개수", 3, 30, 5, key="errors_limit")
+    
+    update_error_mining(get_data_version())
+    today = datetime.now().date()
+    start = {
+        "이번 주": today - timedelta(days=today.weekday()),
+        "최근 30일": today - timedelta(days=29),
+        "전체": None
+    }[period]
+    ranking = ErrorMiner().top_errors(
+        None if selected_class == "전체" else selected_class,
+        start=start,
+        kind=None if kind == "전체" else kind,
+        group_by=group_by,
+        limit=limit
+    )
+    if not ranking:
+        st.info("해당 기간에 기록된 오류가 없습니다.")
+        return
+    
+    ranking_df = pd.DataFrame([
+        {'순위': row['rank'], '종류': row['kind'], '오류 유형': row['category'], '문맥': row['context'],
+         '원형': row['lemma'], '횟수': row['count'], '학생 수': row['students']}
+        for row in ranking
+    ])
+    if group_by != 'context':
+        ranking_df = ranking_df.drop(columns=['문맥'] + (['원형'] if group_by == 'category' else []))
+    st.dataframe(ranking_df, use_container_width=True, hide_index=True)
+
+def display_rankings():
+    """반별 주간 순위를 표시합니다."""
+    st.subheader("주간 순위")
+    
+    students = student_manager.get_all_students()
+    if not students:
+        st.info("등록된 학생이 없습니다.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        classes = student_manager.get_class_names()
+        selected_class = st.selectbox("반 선택", ["전체"] + classes, key="ranking_class")
+    with col2:
+        metric = st.selectbox(
+            "순위 기준",
+            list(RANKING_METRICS.keys()),
+            format_func=lambda x: RANKING_METRICS[x],
+            key="ranking_metric"
+        )
+    with col3:
+        week_date = st.date_input("기준 주", value=datetime.now().date(), key="ranking_week")
+    
+    k = st.slider("표시할 인원", 3, 30, 10, key="ranking_k")
+    
+    ranking_service = student_manager.get_ranking_service()
+    student_ids = student_manager.get_class_student_ids(None if selected_class == "전체" else selected_class)
+    top = ranking_service.top_k(metric, k, get_week_key(datetime.combine(week_date, datetime.min.time())), student_ids)
+    if not top:
+        st.info("해당 주의 기록이 없습니다.")
+        return
+    
+    names = {s['id']: s['name'] for s in students}
+    ranking_df = pd.DataFrame([
+        {'순위': entry['rank'], '이름': names.get(entry['student_id'], '-'), RANKING_METRICS[metric]: entry['value']}
+        for entry in top
+    ])
+    st.dataframe(ranking_df, use_container_width=True, hide_index=True)
+
+def display_export():
+    """결과 내보내기 화면을 표시합니다."""
+    st.subheader("결과 내보내기")
+    
+    students = student_manager.get_all_students()
+    problems = problem_manager.get_all_problems()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        date_range = st.date_input(
+            "제출 기간",
+            value=(datetime.now().date().replace(day=1), datetime.now().date()),
+            key="export_date_range"
+        )
+        classes = student_manager.get_class_names()
+        selected_class = st.selectbox("반", ["전체"] + classes, key="export_class")
+    with col2:
+        types = sorted({p['type'] for p in problems if p.get('type')})
+        selected_type = st.selectbox("문제 유형", ["전체"] + types, key="export_type")
+        fmt = st.selectbox("파일 형식", ResultExporter.available_formats(), key="export_format")
+    
+    if st.button("내보내기 파일 생성", use_container_width=True):
+        # 기간을 하나만 선택한 경우 시작일만 적용합니다.
+        if isinstance(date_range, tuple):
+            start_date = date_range[0] if len(date_range) > 0 else None
+            end_date = date_range[1] if len(date_range) > 1 else None
+        else:
+            start_date, end_date = date_range, None
+        exporter = ResultExporter(students, student_manager.assignments, problems)
+        export_dir = Path("data") / "exports"
+        # 이전 내보내기 파일과 보관 시간이 지난 파일을 정리합니다.
+        previous_path = st.session_state.get('export_path')
+        if previous_path and Path(previous_path).exists():
+            Path(previous_path).unlink()
+        cleanup_exports(export_dir)
+        export_path = export_dir / f"results_{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+        with st.spinner("파일을 생성하는 중..."):
+            count = exporter.export(
+                export_path,
+                fmt,
+                start_date=start_date,
+                end_date=end_date,
+                class_name=None if selected_class == "전체" else selected_class,
+                problem_type=None if selected_type == "전체" else selected_type
+            )
+        st.session_state.export_path = str(export_path)
+        st.success(f"✅ {count}건의 결과를 내보냈습니다.")
+    
+    export_path = st.session_state.get('export_path')
+    if export_path and Path(export_path).exists():
+        # 다운로드 버튼은 파일 전체를 메모리에 올리므로 큰 파일은 서버 경로만 안내합니다.
+        size = Path(export_path).stat().st_size
+        if size > MAX_DOWNLOAD_BYTES:
+            st.info(f"파일이 커서({size / 1024 / 1024:.0f}MB) 다운로드 버튼을 표시하지 않습니다. "
+                    f"서버의 `{export_path}` 파일을 사용하거나 기간/반을 나눠 내보내주세요.")
+            return
+        with open(export_path, 'rb') as f:
+            st.download_button(
+                "📥 다운로드",
+                data=f,
+                file_name=Path(export_path).name,
+                use_container_width=True
+            )
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_generator():
+    """재채점에 사용할 첨삭 생성기를 프로세스당 하나만 만듭니다."""
+    return FeedbackGenerator()
+
+def display_regrade():
+    """선택한 제출 답안을 일괄 재채점합니다."""
+    st.subheader("선택 항목 재채점")
+    
+    students = {s['id']: s for s in student_manager.get_all_students()}
+    problems = {p['id']: p for p in problem_manager.get_all_problems()}
+    submitted = [
+        a for a in student_manager.assignments
+        if a.get('completed') and a.get('student_answer') and a['student_id'] in students and a['problem_id'] in problems
+    ]
+    if not submitted:
+        st.info("재채점할 제출 답안이 없습니다.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        classes = student_manager.get_class_names()
+        selected_class = st.selectbox("반", ["전체"] + classes, key="regrade_class")
+    with col2:
+        types = sorted({problems[a['problem_id']]['type'] for a in submitted})
+        selected_type = st.selectbox("문제 유형", ["전체"] + types, key="regrade_type")
+    
+    analyzer_version = get_analyzer_version()
+    outdated_only = st.checkbox(
+        "이전 분석기 버전으로 채점된 답안만",
+        value=True,
+        key="regrade_outdated_only",
+        help=f"현재 분석기 버전: {analyzer_version}. 전체 재채점은 `python -m utils.regrade`로도 실행할 수 있습니다."
+    )
+    candidates = [
+        a for a in submitted
+        if (selected_class == "전체" or get_student_class(students[a['student_id']]) == selected_class)
+        and (selected_type == "전체" or problems[a['problem_id']]['type'] == selected_type)
+        and (not outdated_only or a.get('analyzer_version') != analyzer_version)
+    ]
+    labels = {
+        a['id']: f"{students[a['student_id']]['name']} - {problems[a['problem_id']]['title']} ({a['submitted_at'][:16]})"
+        for a in candidates
+    }
+    
+    select_all = st.checkbox(f"조건에 맞는 {len(candidates)}건 전체 선택", key="regrade_select_all")
+    if select_all:
+        selected_ids = [a['id'] for a in candidates]
+    else:
+        selected_ids = st.multiselect("재채점할 답안", list(labels.keys()), format_func=labels.get, key="regrade_selection")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        batch_size = st.number_input("배치 크기", min_value=1, max_value=512, value=32, key="regrade_batch_size")
+    with col2:
+        n_process = st.number_input("프로세스 수", min_value=1, max_value=os.cpu_count() or 1, value=1, key="regrade_n_process")
+    
+    if st.button("재채점하기", use_container_width=True, disabled=not selected_ids):
+        selected = [a for a in candidates if a['id'] in set(selected_ids)]
+        items = [
+            (a['student_answer'], get_model_answer_text(problems[a['problem_id']]),
+             problems[a['problem_id']]['type'], problems[a['problem_id']])
+            for a in selected
+        ]
+        feedback_generator = get_feedback_generator()
+        progress = st.progress(0.0)
+        results = []
+        for i, (assignment, feedback) in enumerate(zip(selected, feedback_generator.generate_feedback_batch(
+                items, batch_size=int(batch_size), n_process=int(n_process))), 1):
+            results.append((assignment['id'], feedback['overall_score'], feedback))
+            stats = feedback_generator.batch_stats
+            progress.progress(i / len(selected), text=f"{i}/{len(selected)}건 · {stats['answers_per_sec']:.1f}건/초")
+        
+        student_manager.grade_assignments(results)
+        stats = feedback_generator.batch_stats
+        st.success(f"✅ {len(results)}건을 재채점했습니다. ({stats['elapsed']:.1f}초, {stats['answers_per_sec']:.1f}건/초)")
+
 def main():
     st.title("결과 확인")
     
     # 탭 생성
-    tab1, tab2 = st.tabs(["학생별 결과", "전체 통계"])
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+        ["학생별 결과", "전체 통계", "반별 숙달도", "자주 틀리는 오류", "주간 순위", "내보내기", "재채점"]
+    )
     
     with tab1:
         display_student_results()
     
     with tab2:
         display_statistics()
+    
+    with tab3:
+        display_class_mastery()
+    
+    with tab4:
+        display_common_errors()
+    
+    with tab5:
+        display_rankings()
+    
+    with tab6:
+        display_export()
+    
+    with tab7:
+        display_regrade()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.student_manager import StudentManager
-from utils.problem_manager import ProblemManager
+from utils.problem_manager import ProblemManager, DIFFICULTY_MAPPING
 import pandas as pd
 from datetime import datetime
 
@@ -280,9 +280,10 @@ def show_problem_assignment_section():
         )
     
     # 필터링된 문제 목록
+    selected_levels = {DIFFICULTY_MAPPING[d] for d in difficulty}
     filtered_problems = [p for p in problems 
                         if p['type'] in problem_type 
-                        and p['difficulty'] in difficulty]
+                        and problem_manager.get_difficulty_level(p) in selected_levels]
     
     if not filtered_problems:
         st.warning("⚠️ 선택한 조건에 맞는 문제가 없습니다.")
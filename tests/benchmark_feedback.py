@@ -0,0 +1,231 @@
+"""첨삭 생성 벤치마크
+
+고정된 합성 답안 코퍼스(`tests/benchmark_corpus.json`, 문제 유형별 10/100/1,000단어)로
+`FeedbackGenerator`의 답안 한 건 처리(single)와 일괄 처리(batch) 시간을 측정하고,
+새 프로세스에서 모델을 처음 로드하는 경우(cold)와 로드된 뒤(warm)의 첫 요청 시간을 비교합니다.
+결과는 커밋 간 비교할 수 있도록 JSON으로 출력합니다.
+
+첨삭 결과 캐시와 설정이 측정에 영향을 주지 않도록 임시 디렉터리를 작업 디렉터리로 사용하며,
+시간 예산 없이 모든 분석 단계를 실행합니다.
+
+    python tests/benchmark_feedback.py [--repeat 3] [--output result.json]
+    python tests/benchmark_feedback.py --write-corpus   # 코퍼스 다시 만들기
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CORPUS_FILE = Path(__file__).resolve().parent / "benchmark_corpus.json"
+LENGTHS = [10, 100, 1000]
+ANSWERS_PER_LENGTH = 3
+
+PROBLEMS = {
+    "영작문": {
+        'model_answer': "I went to the library with my friend last weekend and we read interesting books together.",
+        'keywords': ["library", "friend", "weekend"]
+    },
+    "문법": {
+        'model_answer': "She has lived in Seoul for ten years, and she is studying English now.",
+        'keywords': ["has lived", "is studying"]
+    },
+    "어휘": {
+        'model_answer': "The environment is important, so we should protect nature and reduce waste.",
+        'keywords': ["environment", "protect", "reduce"]
+    },
+    "독해": {
+        'model_answer': "The main idea is that regular exercise improves both physical and mental health.",
+        'keywords': ["exercise", "health"]
+    },
+    "회화": {
+        'model_answer': "Excuse me, could you tell me how to get to the nearest subway station?",
+        'keywords': ["excuse me", "subway station"]
+    },
+}
+
+SUBJECTS = ["I", "We", "My friend", "The students", "He", "She", "They", "My teacher"]
+VERBS = ["go", "went", "like", "visit", "read", "study", "protect", "enjoy", "reduce", "explain"]
+OBJECTS = ["the library", "interesting books", "the environment", "English", "the subway station",
+           "a crucial idea", "our community", "regular exercise", "the weekend", "a sustainable plan"]
+ENDINGS = ["every day", "last weekend", "with my friend", "because it is important", "in Seoul",
+           "for ten years", "together", "after school", "", ""]
+
+
+def make_answer(rng, n_words):
+    """문법 오류가 섞인 합성 답안을 단어 수에 맞춰 만듭니다."""
+    words = []
+    while len(words) < n_words:
+        sentence = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(ENDINGS)}".split()
+        words.extend(sentence[:n_words - len(words)])
+        words[-1] += "."
+    return " ".join(words)
+
+
+def build_corpus(seed=0):
+    """문제 유형별로 길이마다 답안 여러 개를 가진 코퍼스를 만듭니다."""
+    rng = random.Random(seed)
+    corpus = {}
+    for problem_type, problem in PROBLEMS.items():
+        corpus[problem_type] = {
+            'problem': dict(problem, id=f"bench-{problem_type}", type=problem_type),
+            'answers': {str(n): [make_answer(rng, n) for _ in range(ANSWERS_PER_LENGTH)] for n in LENGTHS}
+        }
+    return corpus
+
+
+def load_corpus():
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def summarize(times, count=None):
+    """측정 시간(초) 목록의 평균/p95(밀리초)와 처리량(건/초)을 반환합니다."""
+    times = np.array(times)
+    count = count or len(times)
+    return {
+        'mean_ms': round(float(times.mean()) * 1000, 3),
+        'p95_ms': round(float(np.percentile(times, 95)) * 1000, 3),
+        'answers_per_sec': round(count / float(times.sum()), 2) if times.sum() else 0.0
+    }
+
+
+def run_single(generator, corpus, repeat):
+    """답안을 한 건씩 첨삭하며 유형/길이별 시간을 측정합니다."""
+    results = {}
+    for problem_type, entry in corpus.items():
+        problem = entry['problem']
+        results[problem_type] = {}
+        for length, answers in entry['answers'].items():
+            times = []
+            for _ in range(repeat):
+                for answer in answers:
+                    generator.feedback_cache.clear()
+                    generator.doc_cache.clear()
+                    start = time.perf_counter()
+                    for _ in generator.iter_feedback(answer, problem['model_answer'], problem_type, problem, time_budget=0):
+                        pass
+                    times.append(time.perf_counter() - start)
+            results[problem_type][length] = summarize(times)
+    return results
+
+
+def run_batch(generator, corpus, repeat):
+    """유형/길이별 답안 묶음을 `generate_feedback_batch`로 첨삭하며 시간을 측정합니다."""
+    results = {}
+    for problem_type, entry in corpus.items():
+        problem = entry['problem']
+        results[problem_type] = {}
+        for length, answers in entry['answers'].items():
+            items = [(answer, problem['model_answer'], problem_type, problem) for answer in answers]
+            times = []
+            for _ in range(repeat):
+                generator.feedback_cache.clear()
+                generator.doc_cache.clear()
+                start = time.perf_counter()
+                for _ in generator.generate_feedback_batch(items):
+                    pass
+                times.append((time.perf_counter() - start) / len(items))
+            results[problem_type][length] = summarize(times)
+    return results
+
+
+COLD_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from utils.feedback_generator import FeedbackGenerator
+from utils.nlp_loader import get_nlp
+generator = FeedbackGenerator()
+imported = time.perf_counter()
+get_nlp()
+loaded = time.perf_counter()
+for _ in generator.iter_feedback({answer!r}, {model_answer!r}, "영작문", time_budget=0):
+    pass
+done = time.perf_counter()
+start_warm = time.perf_counter()
+for _ in generator.iter_feedback({answer!r} + " Again.", {model_answer!r}, "영작문", time_budget=0):
+    pass
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'model_load_ms': (loaded - imported) * 1000,
+    'cold_request_ms': (done - start) * 1000,
+    'warm_request_ms': (time.perf_counter() - start_warm) * 1000
+}}))
+"""
+
+
+def run_cold(corpus, workdir):
+    """새 프로세스에서 import, 모델 로드, 첫 요청(cold)과 두 번째 요청(warm) 시간을 측정합니다."""
+    entry = corpus["영작문"]
+    script = COLD_SCRIPT.format(root=str(ROOT), answer=entry['answers']['100'][0],
+                                model_answer=entry['problem']['model_answer'])
+    try:
+        result = subprocess.run([sys.executable, "-c", script], cwd=workdir, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        return {'error': e.stderr.strip().splitlines()[-1] if e.stderr.strip() else str(e)}
+    return {name: round(value, 3) for name, value in json.loads(result.stdout.strip().splitlines()[-1]).items()}
+
+
+def get_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="첨삭 생성 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON을 저장할 파일")
+    parser.add_argument("--write-corpus", action="store_true", help="코퍼스를 다시 만들어 저장합니다")
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        with open(CORPUS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(build_corpus(), f, ensure_ascii=False, indent=1)
+        print(f"코퍼스를 저장했습니다: {CORPUS_FILE}")
+        return
+
+    import spacy
+    corpus = load_corpus()
+    output = Path(args.output).resolve() if args.output else None
+    with tempfile.TemporaryDirectory() as workdir:
+        cold = run_cold(corpus, workdir)
+        os.chdir(workdir)
+        from utils.feedback_generator import FeedbackGenerator
+        generator = FeedbackGenerator()
+        # 모델 로드와 첫 호출 비용은 cold 측정에서 따로 보고합니다.
+        for _ in generator.iter_feedback("Warm up.", "Warm up.", "영작문", time_budget=0):
+            pass
+        results = {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'spacy': spacy.__version__,
+            'model': generator.nlp.meta.get('name'),
+            'repeat': args.repeat,
+            'answers_per_length': ANSWERS_PER_LENGTH,
+            'cold': cold,
+            'single': run_single(generator, corpus, args.repeat),
+            'batch': run_batch(generator, corpus, args.repeat)
+        }
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if output:
+        output.write_text(text, encoding='utf-8')
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""앱 시작 시간 벤치마크
+
+각 측정은 별도 프로세스에서 실행되어 import/모델 캐시의 영향을 받지 않습니다.
+
+    python tests/benchmark_startup.py
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    # 기존 방식: 페이지 import 시 전체 파이프라인 로드
+    "eager_full_pipeline": (
+        "import spacy; from utils.feedback_generator import FeedbackGenerator; "
+        "FeedbackGenerator(); spacy.load('en_core_web_sm')"
+    ),
+    # 현재 방식: 첨삭 생성기 생성만 (모델은 첫 요청 시 로드)
+    "lazy_startup": "from utils.feedback_generator import FeedbackGenerator; FeedbackGenerator()",
+    # 첫 첨삭 요청 시 로드되는 축소 파이프라인
+    "lazy_first_request": (
+        "from utils.feedback_generator import FeedbackGenerator; "
+        "FeedbackGenerator().generate_detailed_feedback('He go to school.', 'He goes to school.', '영작문')"
+    ),
+}
+
+def measure(code, repeat=3):
+    """코드를 새 프로세스에서 실행하고 가장 짧은 실행 시간(초)을 반환합니다."""
+    timer = f"import time; _s = time.perf_counter(); {code}; print(time.perf_counter() - _s)"
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", timer], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+def main():
+    results = {name: round(measure(code), 3) for name, code in SCENARIOS.items()}
+    results["startup_speedup"] = round(results["eager_full_pipeline"] / results["lazy_startup"], 1)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
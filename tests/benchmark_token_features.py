@@ -0,0 +1,114 @@
+"""토큰 속성 배열 기반 분석기 마이크로 벤치마크
+
+1,000단어 에세이에 대해 토큰마다 Python 속성에 접근하던 기존 방식과
+`TokenFeatures` 한 번 추출 후 벡터 연산으로 검사하는 현재 방식을 비교합니다.
+언어 모델 없이 품사/의존 관계가 채워진 합성 Doc을 사용합니다.
+
+    python tests/benchmark_token_features.py
+"""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import spacy
+from spacy.tokens import Doc
+
+from utils.feedback_generator import FeedbackGenerator
+from utils.token_features import TokenFeatures
+
+WORDS = {
+    'NOUN': ['school', 'friend', 'information', 'books', 'community', 'weekend'],
+    'VERB': ['go', 'have', 'explore', 'make', 'remember', 'visited'],
+    'DET': ['the', 'a', 'this'],
+    'ADJ': ['big', 'wonderful', 'important', 'red'],
+    'PRON': ['he', 'she', 'they', 'I'],
+    'ADP': ['to', 'in', 'with'],
+}
+TAGS = {'NOUN': ['NN', 'NNS'], 'VERB': ['VBP', 'VBZ', 'VBD'], 'DET': ['DT'], 'ADJ': ['JJ'], 'PRON': ['PRP'], 'ADP': ['IN']}
+DEPS = ['nsubj', 'dobj', 'det', 'amod', 'prep', 'pobj', 'compound']
+
+
+def make_essay(vocab, n_words=1000, seed=0):
+    """품사/태그/의존 관계/형태 정보가 채워진 합성 에세이 Doc을 만듭니다."""
+    rng = random.Random(seed)
+    columns = {key: [] for key in ('words', 'pos', 'tags', 'deps', 'heads', 'lemmas', 'morphs', 'sent_starts')}
+    while len(columns['words']) < n_words:
+        start, length = len(columns['words']), rng.randint(8, 24)
+        root = start + rng.randrange(length - 1)
+        for i in range(length):
+            pos = 'PUNCT' if i == length - 1 else rng.choice(list(WORDS))
+            word = '.' if pos == 'PUNCT' else rng.choice(WORDS[pos])
+            columns['words'].append(word)
+            columns['pos'].append(pos)
+            columns['tags'].append('.' if pos == 'PUNCT' else rng.choice(TAGS[pos]))
+            columns['deps'].append('ROOT' if start + i == root else 'punct' if pos == 'PUNCT' else rng.choice(DEPS))
+            columns['heads'].append(start + i if start + i == root else root)
+            columns['lemmas'].append(word.lower())
+            columns['morphs'].append(rng.choice(['Tense=Past|VerbForm=Fin', 'Tense=Pres|VerbForm=Fin']) if pos == 'VERB' else '')
+            columns['sent_starts'].append(i == 0)
+    return Doc(vocab, **columns)
+
+
+def legacy_analyze(doc):
+    """기존 방식: 분석기마다 모든 토큰을 순회하며 속성에 접근합니다."""
+    for sent in doc.sents:
+        subject = main_verb = None
+        for token in sent:
+            if token.dep_ == "nsubj":
+                subject = token
+            if token.pos_ == "VERB" and token.dep_ in ["ROOT", "VERB"]:
+                main_verb = token
+    for token in doc:
+        if token.pos_ == "NOUN" and token.dep_ not in ["compound"]:
+            any(child.pos_ == "DET" for child in token.children) or token.tag_ == "NNS"
+    [len(sent) for sent in doc.sents]
+    [sent[0].pos_ for sent in doc.sents]
+    words = [token.text.lower() for token in doc if token.is_alpha]
+    set(words)
+    sum(1 for token in doc if token.is_alpha and len(token.text) > 8)
+    basic_verbs = {"be", "have", "do", "make", "get", "go", "take", "come", "see", "know"}
+    sum(1 for token in doc if token.pos_ == "VERB" and token.lemma_.lower() in basic_verbs)
+    [i for i in range(len(doc) - 1) if doc[i].pos_ == "ADJ" and doc[i + 1].pos_ == "ADJ"]
+    [t for token in doc if token.pos_ == "VERB" for t in token.morph.get("Tense")]
+    [len(sent.text.strip().split()) for sent in doc.sents]
+
+
+def vectorized_analyze(generator, doc):
+    """현재 방식: 속성 배열을 한 번 추출하고 모든 분석기가 공유합니다."""
+    features = TokenFeatures(doc)
+    generator._check_basic_grammar(features)
+    generator._analyze_sentence_structure(features)
+    generator._analyze_vocabulary_diversity(features)
+    generator._analyze_word_choice(features)
+    generator._analyze_specific_grammar(features)
+    features.sentence_word_counts()
+
+
+def measure(func, repeat=50):
+    """함수를 반복 실행하고 1회 평균 시간(밀리초)을 반환합니다."""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    doc = make_essay(spacy.blank('en').vocab)
+    generator = FeedbackGenerator.__new__(FeedbackGenerator)
+    results = {
+        'tokens': len(doc),
+        'extract_ms': round(measure(lambda: TokenFeatures(doc)), 3),
+        'legacy_ms': round(measure(lambda: legacy_analyze(doc)), 3),
+        'vectorized_ms': round(measure(lambda: vectorized_analyze(generator, doc)), 3),
+    }
+    results['speedup'] = round(results['legacy_ms'] / results['vectorized_ms'], 1)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from utils.analytics import build_analytics_frame, compute_class_mastery
+from utils.student_manager import StudentManager, get_student_class
+
+class TestClassAnalytics(unittest.TestCase):
+    def setUp(self):
+        # StudentManager는 현재 디렉터리의 data/를 사용하므로 임시 디렉터리에서 실행합니다.
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.manager = StudentManager()
+        self.students = {}
+        for name, class_name in [('김철수', '3A'), ('이영희', '3A'), ('박민수', '3B')]:
+            student = self.manager.add_student(name, 3, '중급')
+            # 학생 관리 화면과 같이 반을 'class_name'으로 저장합니다.
+            self.manager.update_student(student['id'], class_name=class_name)
+            self.students[name] = student['id']
+        self.problems = [
+            {'id': 'p1', 'title': '문법 1', 'type': '문법', 'difficulty': 2},
+            {'id': 'p2', 'title': '어휘 1', 'type': '어휘', 'difficulty': 3},
+        ]
+        scores = {'김철수': [90, 70], '이영희': [60, None], '박민수': [100, 100]}
+        for name, student_scores in scores.items():
+            self.manager.assign_problems(self.students[name], ['p1', 'p2'])
+            for assignment, score in zip(self.manager.get_student_assignments(self.students[name]), student_scores):
+                if score is not None:
+                    self.manager.submit_assignment(assignment['id'], "answer", score)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_student_class_field(self):
+        """'class_name'을 우선 읽고 이전 기록의 'class'도 읽는지 확인"""
+        self.assertEqual(get_student_class({'class_name': '3A', 'class': '2B'}), '3A')
+        self.assertEqual(get_student_class({'class': '2B'}), '2B')
+        self.assertIsNone(get_student_class({'class_name': ''}))
+        self.assertEqual(self.manager.get_class_names(), ['3A', '3B'])
+
+    def test_class_mastery(self):
+        """반을 지정하면 그 반 학생만 숙달도 표에 포함되는지 확인"""
+        frame = build_analytics_frame(self.manager.get_all_students(), self.manager.assignments, self.problems)
+        mastery = compute_class_mastery(frame, '3A')
+        self.assertEqual(sorted(mastery.index), ['김철수', '이영희'])
+        self.assertEqual(mastery.loc['김철수', '어휘'], 70)
+
+    def test_rankings_by_class(self):
+        """반별 주간 순위가 그 반 학생만 포함하는지 확인"""
+        ranking_service = self.manager.get_ranking_service()
+        class_ids = self.manager.get_class_student_ids('3A')
+        top = ranking_service.top_k('average', 10, student_ids=class_ids)
+        self.assertEqual([entry['student_id'] for entry in top], [self.students['김철수'], self.students['이영희']])
+        self.assertEqual([entry['value'] for entry in top], [80.0, 60.0])
+        self.assertEqual(len(ranking_service.top_k('completed', 10)), 3)
+
+if __name__ == '__main__':
+    unittest.main()
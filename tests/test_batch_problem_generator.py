@@ -0,0 +1,106 @@
+import json
+import re
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+from utils.batch_problem_generator import BatchProblemGenerator, TokenBucket, split_request
+from utils.problem_prompt import parse_problem_response
+from utils.quota_ledger import QuotaLedger
+
+class FakeModel:
+    """프롬프트의 유형/난이도/문제 수에 맞는 문제를 돌려주는 가짜 모델 (처음 몇 번은 실패합니다)"""
+
+    def __init__(self, failures=0, bad_json=0):
+        self.failures = failures
+        self.bad_json = bad_json
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self.lock:
+            self.calls += 1
+            if self.failures > 0:
+                self.failures -= 1
+                raise RuntimeError("429 rate limit exceeded")
+            if self.bad_json > 0:
+                self.bad_json -= 1
+                return SimpleNamespace(text="죄송합니다. 다시 시도해주세요.")
+        problem_type = re.search(r"문제 유형: (\S+)", prompt).group(1)
+        difficulty = int(re.search(r"난이도: (\d)", prompt).group(1))
+        count = int(re.search(r"생성할 문제 수: (\d+)", prompt).group(1))
+        problems = [{
+            'type': problem_type, 'title': f"{problem_type} {i}", 'content': "Fill in the blank.",
+            'difficulty': difficulty, 'correct_answer': "went", 'keywords': ["went"], 'explanation': "과거형"
+        } for i in range(count)]
+        return SimpleNamespace(text="```json\n" + json.dumps(problems, ensure_ascii=False) + "\n```")
+
+class TestBatchProblemGenerator(unittest.TestCase):
+    def make_generator(self, model, **kwargs):
+        return BatchProblemGenerator(model, requests_per_minute=6000, sleep=lambda seconds: None, **kwargs)
+
+    def test_split_request(self):
+        """유형 × 난이도 조합에 고르게 나누고 호출당 5개 이하로 쪼개는지 확인"""
+        jobs = split_request(["단어", "문법"], [1, 2, 3], 200)
+        self.assertEqual(sum(job['count'] for job in jobs), 200)
+        self.assertTrue(all(job['count'] <= 5 for job in jobs))
+        self.assertEqual({(job['problem_type'], job['difficulty']) for job in jobs},
+                         {(t, d) for t in ["단어", "문법"] for d in [1, 2, 3]})
+
+    def test_generate_streams_all_problems(self):
+        """모든 작업의 검증된 문제가 결과로 생성되는지 확인"""
+        model = FakeModel()
+        results = list(self.make_generator(model).generate(split_request(["단어", "독해"], [2, 4], 47)))
+        problems = [p for result in results for p in result['problems']]
+        self.assertEqual(len(problems), 47)
+        self.assertTrue(all(result['error'] is None for result in results))
+        self.assertEqual(model.calls, len(results))
+
+    def test_retries_with_backoff(self):
+        """실패/잘못된 응답을 재시도하고, 재시도 한도를 넘으면 오류로 보고하는지 확인"""
+        delays = []
+        model = FakeModel(failures=2, bad_json=1)
+        generator = BatchProblemGenerator(model, max_workers=1, requests_per_minute=6000, sleep=delays.append)
+        results = list(generator.generate(split_request(["단어"], [1], 3)))
+        self.assertEqual(len(results[0]['problems']), 3)
+        self.assertEqual(generator.stats['retries'], 3)
+        # 지연 시간은 0 ~ base_delay * 2^attempt 사이입니다.
+        backoff = [d for d in delays if d >= 0.05]
+        self.assertTrue(all(0 <= d <= 4 for d in backoff))
+
+        failing = self.make_generator(FakeModel(failures=100), max_retries=2)
+        results = list(failing.generate(split_request(["문법"], [3], 4)))
+        self.assertIn("rate limit", results[0]['error'])
+        self.assertEqual(failing.stats['failed_jobs'], 1)
+
+    def test_quota_charges_generated_problems(self):
+        """공유 한도에서 실제로 생성한 문제 수만큼만 사용하는지 확인"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            quota = QuotaLedger(temp_dir, limit=20)
+            generator = self.make_generator(FakeModel(failures=100), max_retries=0, quota=quota)
+            list(generator.generate(split_request(["단어"], [1], 5)))
+            self.assertEqual(quota.remaining(), 20)
+            generator = self.make_generator(FakeModel(), quota=quota)
+            list(generator.generate(split_request(["단어", "문법"], [1], 12)))
+            self.assertEqual(quota.remaining(), 8)
+
+    def test_token_bucket(self):
+        """토큰이 없으면 채워질 때까지 기다리는지 확인"""
+        now = [0.0]
+        waits = []
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+        bucket = TokenBucket(rate=0.5, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertEqual(waits, [2.0, 2.0])
+
+    def test_parse_problem_array(self):
+        """코드 블록으로 감싼 JSON 배열 응답을 파싱하는지 확인"""
+        problems = parse_problem_response('결과입니다:\n[{"title": "a"}, {"title": "b"}]')
+        self.assertEqual([p['title'] for p in problems], ["a", "b"])
+
+if __name__ == '__main__':
+    unittest.main()
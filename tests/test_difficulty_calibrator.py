@@ -0,0 +1,50 @@
+import unittest
+import tempfile
+import numpy as np
+from utils.difficulty_calibrator import DifficultyCalibrator
+
+class TestDifficultyCalibrator(unittest.TestCase):
+    def setUp(self):
+        """테스트용 응답 데이터 생성"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.true_difficulties = np.array([-1.5, -0.5, 0.0, 0.5, 1.5])
+        abilities = rng.normal(0, 1, 200)
+
+        self.assignments = []
+        for i, ability in enumerate(abilities):
+            for j, difficulty in enumerate(self.true_difficulties):
+                p = 1 / (1 + np.exp(difficulty - ability))
+                self.assignments.append({
+                    'student_id': f"s{i}",
+                    'problem_id': f"p{j}",
+                    'completed': True,
+                    'score': 100 if rng.random() < p else 0
+                })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_recovers_difficulty_order(self):
+        """추정된 난이도 순서 확인"""
+        calibrator = DifficultyCalibrator(self.temp_dir.name)
+        calibrator.calibrate(self.assignments)
+        estimated = [calibrator.get_difficulty(f"p{j}") for j in range(5)]
+        self.assertEqual(estimated, sorted(estimated))
+        self.assertLess(np.abs(np.array(estimated) - self.true_difficulties).max(), 0.5)
+
+    def test_warm_start_converges_faster(self):
+        """이전 추정값을 초기값으로 사용하는지 확인"""
+        calibrator = DifficultyCalibrator(self.temp_dir.name)
+        first = calibrator.calibrate(self.assignments)
+        second = DifficultyCalibrator(self.temp_dir.name).calibrate(self.assignments)
+        self.assertLess(second['iterations'], first['iterations'])
+
+    def test_min_responses(self):
+        """응답 수가 부족한 문제는 보정하지 않음"""
+        calibrator = DifficultyCalibrator(self.temp_dir.name, min_responses=500)
+        calibrator.calibrate(self.assignments)
+        self.assertIsNone(calibrator.get_difficulty("p0"))
+
+if __name__ == '__main__':
+    unittest.main()
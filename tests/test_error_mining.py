@@ -0,0 +1,64 @@
+import unittest
+import tempfile
+from datetime import date
+from utils.error_mining import ErrorMiner, extract_errors, simple_lemma
+
+def make_assignment(assignment_id, student_id, day, contexts):
+    return {
+        'id': assignment_id,
+        'student_id': student_id,
+        'completed': True,
+        'submitted_at': f"{day}T10:00:00",
+        'score': 80,
+        'feedback': {
+            'grammar_feedback': [{'error': '주어-동사 불일치', 'context': context} for context in contexts],
+            'vocabulary_feedback': [{'point': '어휘 수준'}],
+            'content_feedback': []
+        }
+    }
+
+class TestErrorMining(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.miner = ErrorMiner(self.temp_dir.name)
+        self.students = [{'id': 's1', 'class': '3A'}, {'id': 's2', 'class': '3A'}, {'id': 's3', 'class_name': '3B'}]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_extract_errors(self):
+        """피드백에서 오류 유형, 문맥, 원형을 뽑는지 확인"""
+        self.assertEqual(simple_lemma("went"), "go")
+        self.assertEqual(simple_lemma("studies"), "study")
+        errors = extract_errors(make_assignment('a', 's1', '2024-03-04', ['He go'])['feedback'])
+        self.assertEqual(errors, [('문법', '주어-동사 불일치', 'he go', 'go'), ('어휘', '어휘 수준', '', '')])
+
+    def test_top_errors_by_class_and_period(self):
+        """반/기간별 집계와 순위 확인"""
+        assignments = [
+            make_assignment('a1', 's1', '2024-03-04', ['He go', 'She go']),
+            make_assignment('a2', 's2', '2024-03-05', ['He go']),
+            make_assignment('a3', 's3', '2024-03-05', ['It run']),
+            make_assignment('a4', 's1', '2024-02-01', ['He run']),
+        ]
+        self.assertEqual(self.miner.update(assignments, self.students), {'days': 3, 'updated': 3})
+        ranking = self.miner.top_errors('3A', start=date(2024, 3, 4), kind='문법')
+        self.assertEqual([(r['context'], r['count'], r['students']) for r in ranking], [('he go', 2, 2), ('she go', 1, 1)])
+        by_lemma = self.miner.top_errors('3A', start=date(2024, 3, 4), kind='문법', group_by='lemma')
+        self.assertEqual([(r['lemma'], r['count']) for r in by_lemma], [('go', 3)])
+        by_category = self.miner.top_errors(group_by='category')
+        self.assertEqual(by_category[0]['count'], 5)
+
+    def test_incremental_update(self):
+        """바뀐 날짜의 부분 결과만 다시 계산하는지 확인"""
+        assignments = [make_assignment('a1', 's1', '2024-03-04', ['He go']),
+                       make_assignment('a2', 's2', '2024-03-05', ['He go'])]
+        self.miner.update(assignments, self.students)
+        self.assertEqual(self.miner.update(assignments, self.students)['updated'], 0)
+        assignments.append(make_assignment('a3', 's1', '2024-03-05', ['She go']))
+        self.assertEqual(self.miner.update(assignments, self.students)['updated'], 1)
+        self.assertEqual(self.miner.update(assignments[1:], self.students), {'days': 1, 'updated': 0})
+        self.assertEqual(self.miner.top_errors(group_by='category', kind='문법')[0]['count'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import tempfile
+from unittest import mock
+from utils.feedback_cache import FeedbackCache
+
+class TestFeedbackCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.problem = {'id': 'p1', 'correct_answer': 'I have an apple.', 'keywords': ['apple']}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_normalizes_whitespace(self):
+        """공백만 다른 답안은 같은 키를 갖는지 확인"""
+        cache = FeedbackCache(self.temp_dir.name)
+        key = cache.make_key(self.problem, 'I have  an apple. ', 'I have an apple.', '영작문')
+        self.assertEqual(key, cache.make_key(self.problem, 'I have an apple.', 'I have an apple.', '영작문'))
+        changed = dict(self.problem, keywords=['apple', 'have'])
+        self.assertNotEqual(key, cache.make_key(changed, 'I have an apple.', 'I have an apple.', '영작문'))
+
+    def test_lru_eviction(self):
+        """최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목 삭제"""
+        cache = FeedbackCache(self.temp_dir.name, max_entries=2)
+        cache.put('a', {'overall_score': 1})
+        cache.put('b', {'overall_score': 2})
+        self.assertEqual(cache.get('a'), {'overall_score': 1})
+        cache.put('c', {'overall_score': 3})
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['size'], 2)
+
+    def test_version_change_invalidates(self):
+        """분석기 버전이 바뀌면 이전 결과를 사용하지 않는지 확인"""
+        cache = FeedbackCache(self.temp_dir.name)
+        key = cache.make_key(self.problem, 'answer', 'I have an apple.', '영작문')
+        cache.put(key, {'overall_score': 90})
+        with mock.patch('utils.feedback_cache.get_analyzer_version', return_value='new-version'):
+            new_cache = FeedbackCache(self.temp_dir.name)
+        new_key = new_cache.make_key(self.problem, 'answer', 'I have an apple.', '영작문')
+        self.assertNotEqual(key, new_key)
+        self.assertIsNone(new_cache.get(new_key))
+        self.assertEqual(new_cache.get_stats()['size'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
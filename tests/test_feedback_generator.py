@@ -0,0 +1,130 @@
+import itertools
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import spacy
+
+from utils import feedback_pipeline, lexicon, nlp_loader, similarity
+from utils.feedback_generator import FeedbackGenerator
+from utils.feedback_pipeline import get_pipeline_stage_names
+
+STUDENT_ANSWER = "I goes to school yesterday and buyed a apple."
+MODEL_ANSWER = "I went to school yesterday and bought an apple."
+
+class CountingNlp:
+    """빈 영어 파이프라인으로 파싱하며 텍스트별 파싱 횟수를 세는 모델"""
+
+    def __init__(self):
+        self.blank = spacy.blank('en')
+        self.calls = Counter()
+        self.pipe_calls = []
+
+    def __call__(self, text):
+        self.calls[text] += 1
+        return self.blank(text)
+
+    def pipe(self, texts, **kwargs):
+        texts = list(texts)
+        self.calls.update(texts)
+        self.pipe_calls.append(texts)
+        return self.blank.pipe(texts)
+
+class FeedbackGeneratorTestCase(unittest.TestCase):
+    """임시 디렉터리의 data/와 빈 spaCy 파이프라인으로 첨삭 생성기를 만듭니다."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.nlp = CountingNlp()
+        for target, name, value in ((nlp_loader, "_nlp", self.nlp), (lexicon, "_lexicon", None),
+                                    (similarity, "_service", None), (feedback_pipeline, "_stage_metrics", None)):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.generator = FeedbackGenerator()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+class TestDocCacheInFeedback(FeedbackGeneratorTestCase):
+    def test_student_answer_parsed_once_per_request(self):
+        """여러 분석 단계가 토큰 정보를 써도 학생 답안은 한 번만 파싱되는지 확인"""
+        stages = [stage for stage, _ in self.generator.iter_feedback(STUDENT_ANSWER, MODEL_ANSWER, "영작문",
+                                                                      time_budget=0)]
+        self.assertGreater(len(stages), 3)
+        self.assertEqual(self.nlp.calls[STUDENT_ANSWER], 1)
+        self.assertEqual(self.generator.get_cache_stats()['misses'], 1)
+
+class TestIterFeedback(FeedbackGeneratorTestCase):
+    def test_sections_in_priority_order(self):
+        """분석 단계마다 결과가 우선순위 순서로 생성되고 마지막에 summary가 오는지 확인"""
+        sections = []
+        for stage, feedback in self.generator.iter_feedback(STUDENT_ANSWER, MODEL_ANSWER, "영작문", time_budget=0):
+            sections.append((stage, feedback['overall_score']))
+        self.assertEqual([stage for stage, _ in sections], get_pipeline_stage_names("영작문") + ["summary"])
+        # 점수는 모든 단계가 끝난 뒤 summary에서만 계산됩니다.
+        self.assertTrue(all(score == 0 for _, score in sections[:-1]))
+        self.assertGreater(sections[-1][1], 0)
+        self.assertNotIn('partial', feedback)
+
+    def test_time_budget_then_complete(self):
+        """시간 예산을 넘기면 남은 단계를 미루고, complete_feedback으로 마저 실행한 결과가 전체 결과와 같은지 확인"""
+        stage_names = get_pipeline_stage_names("영작문")
+        full = self.generator.generate_detailed_feedback(STUDENT_ANSWER, MODEL_ANSWER, "영작문")
+
+        # perf_counter를 호출할 때마다 1초씩 흐르게 해 첫 단계 뒤에 예산(1.5초)을 넘깁니다.
+        clock = itertools.count(0.0)
+        with mock.patch('utils.feedback_generator.time.perf_counter', side_effect=lambda: next(clock)):
+            sections = list(self.generator.iter_feedback(STUDENT_ANSWER, MODEL_ANSWER, "영작문", time_budget=1.5))
+        self.assertEqual([stage for stage, _ in sections], stage_names[:1] + ["summary"])
+        partial = sections[-1][1]
+        self.assertTrue(partial['partial'])
+        self.assertEqual(partial['pending_stages'], stage_names[1:])
+
+        completed = self.generator.complete_feedback(partial, STUDENT_ANSWER, MODEL_ANSWER, "영작문")
+        self.assertNotIn('partial', completed)
+        self.assertNotIn('pending_stages', completed)
+        self.assertEqual(completed['overall_score'], full['overall_score'])
+        self.assertEqual(completed['grammar_feedback'], full['grammar_feedback'])
+
+class TestFeedbackBatch(FeedbackGeneratorTestCase):
+    def test_batch_matches_single_feedback(self):
+        """일괄 첨삭이 입력 순서대로, 객관식/캐시 답안은 파싱하지 않고, 하나씩 만든 결과와 같은 점수를 내는지 확인"""
+        cached_problem = {'id': 'p1', 'correct_answer': MODEL_ANSWER, 'keywords': ['school']}
+        items = [
+            (STUDENT_ANSWER, MODEL_ANSWER, "영작문"),
+            ("apple", "apple", "단어"),
+            ("I go to school.", MODEL_ANSWER, "영작문", cached_problem),
+            ("We bought apples at school.", MODEL_ANSWER, "작문"),
+        ]
+        expected = [self.generator.generate_detailed_feedback(*item) for item in items]
+        self.nlp.calls.clear()
+
+        results = list(FeedbackGenerator().generate_feedback_batch(items, batch_size=2))
+
+        self.assertEqual(self.nlp.pipe_calls, [[STUDENT_ANSWER, "We bought apples at school."]])
+        self.assertEqual(sum(self.nlp.calls.values()), 2)
+        self.assertEqual([feedback['overall_score'] for feedback in results],
+                         [feedback['overall_score'] for feedback in expected])
+        self.assertEqual(results[1]['objective_match']['correct'], True)
+        self.assertEqual(results[2]['korean_summary'], expected[2]['korean_summary'])
+
+    def test_batch_stats(self):
+        """처리한 답안 수와 처리량이 batch_stats에 기록되는지 확인"""
+        generator = self.generator
+        items = [(STUDENT_ANSWER, MODEL_ANSWER, "영작문"), ("apple", "apple", "단어")]
+        for i, _ in enumerate(generator.generate_feedback_batch(items), 1):
+            self.assertEqual(generator.batch_stats['processed'], i - 1)
+        self.assertEqual(generator.batch_stats['total'], 2)
+        self.assertEqual(generator.batch_stats['processed'], 2)
+        self.assertGreaterEqual(generator.batch_stats['answers_per_sec'], 0)
+        self.assertEqual(list(generator.generate_feedback_batch([])), [])
+        self.assertEqual(generator.batch_stats, {'total': 0, 'processed': 0, 'elapsed': 0.0, 'answers_per_sec': 0.0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import tempfile
+from utils.feedback_pipeline import (
+    PIPELINES, STAGE_REGISTRY, DEFAULT_PIPELINE, FeedbackSettings, StageMetrics, get_pipeline
+)
+
+class TestFeedbackPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pipelines_use_registered_stages(self):
+        """모든 문제 유형의 단계가 등록되어 있는지 확인"""
+        for stage_names in list(PIPELINES.values()) + [DEFAULT_PIPELINE]:
+            for name in stage_names:
+                self.assertIn(name, STAGE_REGISTRY)
+        self.assertEqual([s.name for s in get_pipeline('없는 유형')], DEFAULT_PIPELINE)
+
+    def test_disabled_stages(self):
+        """설정에서 끈 단계가 파이프라인에서 제외되는지 확인"""
+        settings = FeedbackSettings(self.temp_dir.name)
+        self.assertTrue(settings.update(disabled_stages={'작문': ['positives']}))
+        reloaded = FeedbackSettings(self.temp_dir.name)
+        stages = [s.name for s in get_pipeline('작문', reloaded.get_disabled_stages('작문'))]
+        self.assertNotIn('positives', stages)
+        self.assertIn('grammar', stages)
+        # 모든 단계를 꺼도 키워드 단계는 남아 감점 없이 100점이 되지 않습니다.
+        self.assertEqual([s.name for s in get_pipeline('단어', PIPELINES['단어'])], ['keywords'])
+
+    def test_priority_order_and_time_budget(self):
+        """단계가 우선순위 순서로 실행되고 시간 예산 설정이 저장되는지 확인"""
+        priorities = [s.priority for s in get_pipeline('작문')]
+        self.assertEqual(priorities, sorted(priorities))
+        self.assertEqual(get_pipeline('작문')[0].name, 'keywords')
+        settings = FeedbackSettings(self.temp_dir.name)
+        self.assertTrue(settings.update(time_budget=1.5))
+        self.assertEqual(FeedbackSettings(self.temp_dir.name).get_time_budget(), 1.5)
+
+    def test_stage_metrics(self):
+        """단계별 p50/p95 계산과 저장/불러오기 확인"""
+        metrics = StageMetrics(self.temp_dir.name, window=10)
+        for seconds in [0.001, 0.002, 0.003, 0.004, 0.1]:
+            metrics.record('grammar', seconds)
+        metrics.record('keywords', 0.0001)
+        metrics.save()
+        summary = StageMetrics(self.temp_dir.name).get_summary()
+        self.assertEqual(summary[0]['stage'], 'grammar')
+        self.assertEqual(summary[0]['count'], 5)
+        self.assertEqual(summary[0]['p50_ms'], 3.0)
+        self.assertGreater(summary[0]['p95_ms'], 50)
+
+if __name__ == '__main__':
+    unittest.main()
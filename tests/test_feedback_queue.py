@@ -0,0 +1,197 @@
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from utils.feedback_cache import get_analyzer_version
+from utils.feedback_queue import FeedbackJobQueue
+from utils.regrade import iter_outdated_assignments
+from utils.student_manager import StudentManager
+
+class FakeFeedbackGenerator:
+    """분석 없이 정해진 첨삭 결과를 돌려주는 생성기"""
+
+    def __init__(self, partial=False):
+        self.stage_metrics = mock.Mock()
+        self.partial = partial
+
+    def iter_feedback(self, student_answer, model_answer, problem_type, problem=None):
+        feedback = {'overall_score': 85, 'summary': '좋아요', 'keyword_matches': {'matched': ['go']}}
+        if self.partial:
+            feedback.update(partial=True, pending_stages=['grammar'])
+        yield 'summary', feedback
+
+    def complete_feedback(self, feedback, student_answer, model_answer, problem_type, problem=None):
+        feedback = {key: value for key, value in feedback.items() if key not in ('partial', 'pending_stages')}
+        return dict(feedback, overall_score=70)
+
+class TestFeedbackJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = FeedbackJobQueue(self.temp_dir.name, workers=0)
+        self.queue._local.feedback_generator = FakeFeedbackGenerator()
+        # 등록 순서가 시각으로 구분되도록 1초씩 증가하는 시계를 씁니다.
+        clock = itertools.count(1000.0)
+        patcher = mock.patch('utils.feedback_queue.time.time', side_effect=lambda: next(clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def enqueue(self, answer):
+        return self.queue.enqueue(None, answer, "I went to school.", "영작문")
+
+    def set_running(self, job_id, owner, heartbeat):
+        with self.queue._connect() as connection:
+            connection.execute("UPDATE jobs SET status = 'running', owner = ?, heartbeat = ? WHERE id = ?",
+                               (owner, heartbeat, job_id))
+
+    def test_claim_order_and_position(self):
+        """먼저 등록된 작업부터 처리하고 대기 순번을 계산하는지 확인"""
+        first, second, third = self.enqueue("a"), self.enqueue("b"), self.enqueue("c")
+        self.assertEqual([self.queue.get_job(job)['position'] for job in (first, second, third)], [1, 2, 3])
+
+        row = self.queue._claim()
+        self.assertEqual(row['id'], first)
+        job = self.queue.get_job(first)
+        self.assertEqual((job['status'], job['owner']), ('running', self.queue.owner))
+        self.assertNotIn('position', job)
+        self.assertEqual(self.queue.get_job(third)['position'], 2)
+        self.assertEqual(self.queue._claim()['id'], second)
+        self.assertIsNone(self.queue.get_job("missing"))
+
+    def test_requeue_only_abandoned_jobs(self):
+        """다른 서버 프로세스가 처리 중인 작업은 두고, 종료되었거나 신호가 끊긴 작업만 다시 대기시키는지 확인"""
+        host = socket.gethostname()
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        now = time.time()
+        jobs = {
+            'live': (f"{host}:{os.getppid()}", now),
+            'other_host': ("other-host:1", now),
+            'dead': (f"{host}:{finished.pid}", now),
+            'stale': ("other-host:2", now - 1000),
+            'previous_run': (self.queue.owner, now),
+        }
+        ids = {}
+        for name, (owner, heartbeat) in jobs.items():
+            ids[name] = self.enqueue(name)
+            self.set_running(ids[name], owner, heartbeat)
+
+        self.assertEqual(self.queue.requeue_abandoned(), 2)
+        self.assertEqual(self.queue.get_job(ids['previous_run'])['status'], 'running')
+        self.assertEqual(self.queue.requeue_abandoned(restarting=True), 1)
+        statuses = {name: self.queue.get_job(job_id)['status'] for name, job_id in ids.items()}
+        self.assertEqual(statuses, {'live': 'running', 'other_host': 'running', 'dead': 'pending',
+                                    'stale': 'pending', 'previous_run': 'pending'})
+        self.assertIsNone(self.queue.get_job(ids['dead'])['owner'])
+
+    def test_metrics(self):
+        """상태별 작업 수와 완료된 작업의 지연 시간 통계 확인"""
+        for answer in ("a", "b", "c", "d"):
+            self.enqueue(answer)
+        row = self.queue._claim()
+        self.queue._finish(row['id'], result=self.queue.process_job(row))
+        row = self.queue._claim()
+        self.queue._finish(row['id'], error="실패")
+        self.queue._claim()
+
+        metrics = self.queue.get_metrics()
+        self.assertEqual({key: metrics[key] for key in ('queue_depth', 'running', 'done', 'failed', 'workers')},
+                         {'queue_depth': 1, 'running': 1, 'done': 1, 'failed': 1, 'workers': 0})
+        self.assertGreater(metrics['latency_avg'], metrics['wait_avg'])
+        self.assertEqual(metrics['latency_p50'], metrics['latency_avg'])
+
+class TestFeedbackQueueWriteBack(unittest.TestCase):
+    def setUp(self):
+        # StudentManager는 현재 디렉터리의 data/를 사용하므로 임시 디렉터리에서 실행합니다.
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.queue = FeedbackJobQueue("data", workers=0)
+        self.queue._local.feedback_generator = FakeFeedbackGenerator()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def process_next(self):
+        row = self.queue._claim()
+        self.queue._finish(row['id'], result=self.queue.process_job(row))
+
+    def test_worker_result_survives_stale_page_instance(self):
+        """페이지의 오래된 인스턴스가 저장해도 작업자가 기록한 점수와 피드백이 남는지 확인"""
+        page_manager = StudentManager()
+        student = page_manager.add_student('김철수', 3, '중급')
+        page_manager.assign_problems(student['id'], ['p1', 'p2'])
+        first, second = [a['id'] for a in page_manager.get_student_assignments(student['id'])]
+
+        page_manager.submit_assignment(first, "I go to school.")
+        self.queue.enqueue(first, "I go to school.", "I went to school.", "영작문")
+        self.process_next()
+
+        # 페이지 인스턴스는 작업자의 결과를 모른 채 다음 답안을 제출합니다.
+        page_manager.submit_assignment(second, "She like apples.")
+
+        assignments = {a['id']: a for a in StudentManager().assignments}
+        self.assertEqual(assignments[first]['score'], 85)
+        self.assertEqual(assignments[first]['feedback']['summary'], '좋아요')
+        self.assertTrue(assignments[second]['completed'])
+        self.assertEqual(page_manager.get_student_assignments(student['id'])[0]['score'], 85)
+
+    def test_partial_feedback_stays_outdated(self):
+        """시간 예산으로 일부만 채점된 과제는 분석기 버전이 기록되지 않아 재채점 대상으로 남는지 확인"""
+        self.queue._local.feedback_generator = FakeFeedbackGenerator(partial=True)
+        manager = StudentManager()
+        student = manager.add_student('김철수', 3, '중급')
+        manager.assign_problems(student['id'], ['p1'])
+        assignment_id = manager.get_student_assignments(student['id'])[0]['id']
+        manager.submit_assignment(assignment_id, "I go to school.")
+        problems = {'p1': {'id': 'p1', 'type': '영작문', 'correct_answer': "I went to school."}}
+
+        self.queue.enqueue(assignment_id, "I go to school.", "I went to school.", "영작문")
+        self.process_next()
+        manager = StudentManager()
+        assignment = manager.get_student_assignments(student['id'])[0]
+        self.assertEqual(assignment['score'], 85)
+        self.assertNotIn('analyzer_version', assignment)
+        self.assertNotIn('matched_keywords', assignment)
+        outdated = iter_outdated_assignments(manager, problems, get_analyzer_version(), skip=set())
+        self.assertEqual([item[0] for item in outdated], [assignment_id])
+
+        # 이어서 처리하는 작업이 끝나면 버전이 기록됩니다.
+        self.process_next()
+        manager = StudentManager()
+        assignment = manager.get_student_assignments(student['id'])[0]
+        self.assertEqual(assignment['score'], 70)
+        self.assertEqual(assignment['analyzer_version'], get_analyzer_version())
+        self.assertEqual(assignment['matched_keywords'], ['go'])
+        self.assertEqual(list(iter_outdated_assignments(manager, problems, get_analyzer_version(), skip=set())), [])
+
+    def test_student_page_submission_is_graded(self):
+        """학생 페이지처럼 이름으로 학생을 찾아 제출한 답안이 작업 등록 → 처리 → 채점 기록까지 이어지는지 확인"""
+        StudentManager().add_student('이영희', 2, '초급')
+        page_manager = StudentManager()
+        student = page_manager.get_student_by_name(' 이영희 ')
+        self.assertIsNone(page_manager.get_student_by_name('박민수'))
+        page_manager.assign_problems(student['id'], ['p1'])
+        assignment_id = page_manager.get_student_assignments(student['id'])[0]['id']
+        page_manager.submit_assignment(assignment_id, "I go to school.")
+
+        job_id = self.queue.enqueue(assignment_id, "I go to school.", "I went to school.", "영작문")
+        self.assertEqual(self.queue.get_job(job_id)['status'], 'pending')
+        self.process_next()
+
+        self.assertEqual(self.queue.get_job(job_id)['status'], 'done')
+        assignment = StudentManager().get_student_assignments(student['id'])[0]
+        self.assertEqual(assignment['score'], 85)
+        self.assertEqual(assignment['feedback']['summary'], '좋아요')
+
+if __name__ == '__main__':
+    unittest.main()
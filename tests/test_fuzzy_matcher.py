@@ -0,0 +1,34 @@
+import unittest
+from utils.fuzzy_matcher import FuzzyMatcher, bounded_levenshtein, get_fuzzy_matcher
+
+class TestFuzzyMatcher(unittest.TestCase):
+    def test_bounded_levenshtein(self):
+        """편집 거리 계산과 상한 초과 시 조기 종료 확인"""
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 5), 3)
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 1), 2)
+        self.assertEqual(bounded_levenshtein("a", "abcdef", 2), 3)
+
+    def test_match_with_typos(self):
+        """오타 답안이 가장 가까운 정답과 편집 거리로 채점되는지 확인"""
+        matcher = FuzzyMatcher(["beautiful", "necessary", "color", "colour"], max_distance=2)
+        self.assertEqual(matcher.match("Beatiful"), ("beautiful", 1))
+        self.assertEqual(matcher.match("neccesary"), ("necessary", 2))
+        self.assertEqual(matcher.match("colour"), ("colour", 0))
+        self.assertIsNone(matcher.match("banana"))
+
+    def test_short_answers_need_exact_match(self):
+        """짧은 정답은 한 글자 오타도 인정하지 않는지 확인"""
+        matcher = FuzzyMatcher(["cat", "go"], max_distance=2)
+        self.assertIsNone(matcher.match("cut"))
+        self.assertIsNone(matcher.match("do"))
+
+    def test_partial_credit(self):
+        """거리별 점수표와 일괄 채점 확인"""
+        matcher = get_fuzzy_matcher(["beautiful"], 2)
+        self.assertIs(matcher, get_fuzzy_matcher(["beautiful"], 2))
+        scores = matcher.score_batch(["beautiful", "beatiful", "BEATIFUL", "beutful"], [100, 60, 30])
+        self.assertEqual([s['credit'] for s in scores], [100, 60, 60, 30])
+        self.assertEqual(matcher.score("beatiful", [100])['credit'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
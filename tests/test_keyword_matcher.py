@@ -0,0 +1,33 @@
+import unittest
+from utils.keyword_matcher import KeywordMatcher, get_inflections, get_keyword_matcher
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_inflections(self):
+        """규칙/불규칙 변화형 생성 확인"""
+        self.assertIn('studies', get_inflections('study'))
+        self.assertIn('stopped', get_inflections('stop'))
+        self.assertIn('went', get_inflections('go'))
+        self.assertIn('go', get_inflections('went'))
+
+    def test_score(self):
+        """변화형, 구, 단어 경계 처리 확인"""
+        matcher = KeywordMatcher(['go', 'pick up', 'cat', 'library'])
+        result = matcher.score('She went to school and picked up her books. Education matters.')
+        self.assertEqual(result['matched'], ['go', 'pick up'])
+        self.assertEqual(result['missing'], ['cat', 'library'])
+        self.assertEqual(result['coverage'], 0.5)
+
+    def test_korean_keyword_with_particle(self):
+        """조사가 붙은 한글 핵심 단어 인정"""
+        matcher = KeywordMatcher(['사과'])
+        self.assertEqual(matcher.score('사과를 먹었다')['matched'], ['사과'])
+
+    def test_matcher_cached_per_keywords(self):
+        """같은 핵심 단어 목록은 한 번만 컴파일"""
+        first = get_keyword_matcher({'id': 'p1', 'keywords': ['apple', 'banana']})
+        second = get_keyword_matcher({'id': 'p2', 'keywords': ['apple', 'banana']})
+        self.assertIs(first, second)
+        self.assertIsNone(get_keyword_matcher({'id': 'p3', 'keywords': []}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+import spacy
+from spacy.tokens import Doc
+
+from utils.lexicon import Lexicon, LEVELS, compile_lexicon
+from utils.token_features import TokenFeatures
+
+class TestLexicon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "words.tsv"
+        self.source.write_text("# 주석\nthe\tA1\ngo\tA1\nachieve\tB1\ncrucial\tB2\nubiquitous\tC2\ngo\tA2\n", encoding='utf-8')
+        self.lexicon = Lexicon(self.temp_dir.name, source=self.source)
+        self.vocab = spacy.blank('en').vocab
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compile_and_lookup(self):
+        """컴파일한 사전에서 수준과 빈도 순위를 찾는지 확인"""
+        self.assertEqual(len(self.lexicon), 5)
+        self.assertTrue((Path(self.temp_dir.name) / "cefr_lexicon.npy").exists())
+        strings = self.vocab.strings
+        levels, ranks = self.lexicon.lookup([strings.add("crucial"), strings.add("go"), strings.add("zebra")])
+        self.assertEqual([LEVELS[level] for level in levels], ["B2", "A1", ""])
+        self.assertEqual(list(ranks), [4, 2, 0])
+
+    def test_recompile_only_when_source_changes(self):
+        """원본 내용이 바뀌면 다시 컴파일하고, 다른 목록으로 컴파일한 사전은 그대로 두는지 확인"""
+        self.source.write_text("the\tA1\ncrucial\tB2\n", encoding='utf-8')
+        self.assertEqual(len(Lexicon(self.temp_dir.name, source=self.source)), 2)
+
+        custom = Path(self.temp_dir.name) / "custom.tsv"
+        custom.write_text("the\tA1\ngo\tA1\nachieve\tB1\n", encoding='utf-8')
+        compile_lexicon(custom, Path(self.temp_dir.name) / "cefr_lexicon.npy")
+        self.source.write_text("the\tA1\n", encoding='utf-8')
+        self.assertEqual(len(Lexicon(self.temp_dir.name, source=self.source)), 3)
+
+    def test_levels_for_tokens(self):
+        """토큰별 수준, 고급 어휘, 수준 분포 확인"""
+        doc = Doc(self.vocab, words=["The", "crucial", "ubiquitous", "information", "go", "."],
+                  lemmas=["the", "crucial", "ubiquitous", "information", "go", "."])
+        features = TokenFeatures(doc)
+        self.assertEqual(list(self.lexicon.token_levels(features)), [1, 4, 6, 0, 1, 0])
+        # 사전에 없는 긴 단어(information)는 고급 어휘로 봅니다.
+        self.assertEqual(list(features.texts(self.lexicon.advanced_mask(features).nonzero()[0])),
+                         ["crucial", "ubiquitous", "information"])
+        distribution = self.lexicon.level_distribution(features)
+        self.assertEqual(distribution, {"A1": 0.4, "B2": 0.2, "C2": 0.2, "미분류": 0.2})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+from utils.nlp_cache import DocCache
+
+class TestDocCache(unittest.TestCase):
+    def setUp(self):
+        self.parsed = []
+        self.cache = DocCache(self.parse, max_size=2)
+
+    def parse(self, text):
+        self.parsed.append(text)
+        return text.split()
+
+    def test_hits_misses_and_eviction(self):
+        """같은 텍스트는 한 번만 파싱하고, 가장 오래 쓰지 않은 문서부터 내보내는지 확인"""
+        # 파싱할 때마다 시작/끝 시각을 차례로 돌려줍니다 (a: 0.5초, b: 0.2초, c: 0.1초, a: 0.5초).
+        times = [0.0, 0.5, 1.0, 1.2, 2.0, 2.1, 3.0, 3.5]
+        with mock.patch('utils.nlp_cache.time.perf_counter', side_effect=times):
+            first = self.cache.get("a b")
+            self.assertIs(self.cache.get("a b"), first)
+            self.cache.get("b c")
+            self.cache.get("c d")
+            self.assertNotIn(DocCache.make_key("a b"), self.cache)
+            self.cache.get("a b")
+
+        self.assertEqual(self.parsed, ["a b", "b c", "c d", "a b"])
+        stats = self.cache.get_stats()
+        self.assertEqual({key: stats[key] for key in ('size', 'hits', 'misses')}, {'size': 2, 'hits': 1, 'misses': 4})
+        self.assertEqual(stats['hit_rate'], 0.2)
+        self.assertAlmostEqual(stats['parse_time'], 1.3)
+        self.assertAlmostEqual(stats['time_saved'], 0.5)
+
+    def test_put_and_clear(self):
+        """미리 파싱해 넣은 문서를 다시 파싱하지 않고, 비운 뒤에는 다시 파싱하는지 확인"""
+        self.cache.put("x y", ["x", "y"], parse_time=0.25)
+        self.assertEqual(self.cache.get("x y"), ["x", "y"])
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(self.cache.get_stats()['time_saved'], 0.25)
+        self.cache.clear()
+        self.cache.get("x y")
+        self.assertEqual(self.parsed, ["x y"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import unittest
+import tempfile
+import threading
+from unittest import mock
+from utils import lexicon, nlp_loader
+from utils.feedback_generator import FeedbackGenerator
+
+class TestNlpLoader(unittest.TestCase):
+    def setUp(self):
+        """공유 모델 초기화"""
+        nlp_loader._nlp = None
+
+    def tearDown(self):
+        nlp_loader._nlp = None
+
+    def test_feedback_generator_does_not_load_model(self):
+        """첨삭 생성기 생성 시 모델을 로드하지 않음"""
+        # 첨삭 캐시와 어휘 사전 파일이 저장소의 data/에 만들어지지 않도록 임시 디렉터리에서 생성합니다.
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(lexicon, "_lexicon", None), \
+                mock.patch("spacy.load") as load:
+            os.chdir(temp_dir)
+            try:
+                FeedbackGenerator()
+            finally:
+                os.chdir(cwd)
+            load.assert_not_called()
+        self.assertFalse(nlp_loader.is_loaded())
+
+    def test_model_loaded_once_without_ner(self):
+        """여러 스레드에서 요청해도 한 번만 로드하고 NER은 제외"""
+        with mock.patch("spacy.load", return_value=object()) as load:
+            threads = [threading.Thread(target=nlp_loader.get_nlp) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            load.assert_called_once_with(nlp_loader.NLP_MODEL, exclude=["ner"])
+
+if __name__ == '__main__':
+    unittest.main()
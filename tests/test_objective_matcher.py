@@ -0,0 +1,31 @@
+import unittest
+from utils.objective_matcher import (
+    ObjectiveMatcher, get_objective_matcher, normalize_objective_answer
+)
+
+class TestObjectiveMatcher(unittest.TestCase):
+    def test_normalize(self):
+        """대소문자/공백/문장 부호/전각 문자 정규화 확인"""
+        self.assertEqual(normalize_objective_answer("  Went. "), "went")
+        self.assertEqual(normalize_objective_answer("ＧＯ"), "go")
+        self.assertEqual(normalize_objective_answer("Don’t  give up!"), "dont give up")
+        self.assertEqual(normalize_objective_answer("①"), "1")
+
+    def test_alternative_answers(self):
+        """'/'로 구분된 여러 정답 인정 확인"""
+        matcher = ObjectiveMatcher(["color/colour"])
+        self.assertEqual(matcher.match("Colour"), "colour")
+        result = matcher.score("colr")
+        self.assertFalse(result['correct'])
+        self.assertEqual(result['answers'], ["color", "colour"])
+
+    def test_routing(self):
+        """문제 유형과 정답 길이에 따른 객관식 채점 대상 판단 확인"""
+        self.assertIsNotNone(get_objective_matcher("어휘", "apple"))
+        self.assertIsNotNone(get_objective_matcher("문법", "", {'correct_answer': 'has been'}))
+        self.assertIsNone(get_objective_matcher("문법", "She has been living here for ten years."))
+        self.assertIsNone(get_objective_matcher("영작문", "apple"))
+        self.assertIsNone(get_objective_matcher("어휘", ""))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.quota_ledger import QuotaExceededError, QuotaLedger
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestQuotaLedger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_ledger(self, limit=10, window=100):
+        return QuotaLedger(self.temp_dir.name, limit=limit, window=window, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_shared_between_instances(self):
+        """다른 세션/프로세스의 원장 인스턴스와 사용량을 공유하는지 확인"""
+        first, second = self.make_ledger(), self.make_ledger()
+        first.acquire(4)
+        second.acquire(5)
+        self.assertEqual(first.remaining(), 1)
+        self.assertEqual(second.get_status()['used'], 9)
+
+    def test_sliding_window_and_settle(self):
+        """정산으로 남은 예약을 돌려받고, 기록이 만료되면 한도가 다시 채워지는지 확인"""
+        ledger = self.make_ledger()
+        reservation = ledger.acquire(5)
+        ledger.settle(reservation, 2)
+        self.assertEqual(ledger.remaining(), 8)
+        self.clock.now += 50
+        ledger.acquire(8)
+        self.assertEqual(ledger.remaining(), 0)
+        self.assertEqual(ledger.get_status()['next_release'], 50)
+        self.clock.now += 51
+        self.assertEqual(ledger.remaining(), 2)
+
+    def test_acquire_waits_for_quota(self):
+        """한도가 모자라면 실패하지 않고 기록이 만료될 때까지 기다리는지 확인"""
+        ledger = self.make_ledger()
+        ledger.acquire(10)
+        start = self.clock.now
+        ledger.acquire(3, timeout=200)
+        self.assertGreaterEqual(self.clock.now - start, 100)
+        self.assertEqual(ledger.get_status()['waiting'], 0)
+
+    def test_acquire_fails_when_wait_exceeds_timeout(self):
+        """기한 안에 한도를 받을 수 없으면 바로 예상 대기 시간과 함께 실패하는지 확인"""
+        ledger = self.make_ledger()
+        ledger.settle(ledger.acquire(10), 10)
+        with self.assertRaises(QuotaExceededError) as context:
+            ledger.acquire(1, timeout=10)
+        self.assertEqual(context.exception.wait_seconds, 100)
+        self.assertEqual(ledger.get_status()['waiting'], 0)
+        with self.assertRaises(QuotaExceededError):
+            ledger.acquire(11)
+
+    def test_acquire_without_waiting(self):
+        """timeout=0이면 진행 중인 예약을 기다리지 않고 바로 실패하는지 확인"""
+        ledger = self.make_ledger()
+        holder = ledger.acquire(8)
+        start = self.clock.now
+        with self.assertRaises(QuotaExceededError) as context:
+            ledger.acquire(3, timeout=0)
+        self.assertEqual(self.clock.now, start)
+        self.assertEqual(context.exception.remaining, 2)
+        self.assertEqual(ledger.get_status()['waiting'], 0)
+        ledger.settle(holder, 5)
+        ledger.acquire(3, timeout=0)
+
+    def test_concurrent_requests_queue(self):
+        """동시에 들어온 요청이 한도를 넘지 않고 정산된 한도를 차례로 받는지 확인"""
+        ledger = QuotaLedger(self.temp_dir.name, limit=5, poll_interval=0.01)
+        holder = ledger.acquire(5)
+        admitted = []
+
+        def request():
+            other = QuotaLedger(self.temp_dir.name, limit=5, poll_interval=0.01)
+            reservation = other.acquire(2, timeout=5)
+            admitted.append(reservation)
+            other.settle(reservation, 0)
+
+        threads = [threading.Thread(target=request) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.assertEqual(admitted, [])
+        self.assertEqual(ledger.get_status()['waiting'], 3)
+        ledger.settle(holder, 0)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(admitted), 3)
+        self.assertEqual(ledger.get_status(), dict(ledger.get_status(), used=0, waiting=0))
+
+if __name__ == '__main__':
+    unittest.main()
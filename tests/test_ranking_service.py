@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.ranking_service import RankingService
+
+WEEK = "2024-W10"
+LAST_WEEK = "2024-W09"
+
+class TestRankingService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.service = RankingService(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_top_k_tie_breaking(self):
+        """점수가 같으면 마지막 제출이 빠른 학생이 앞서는지 확인"""
+        self.service.record_submission('late', "2024-03-06T15:00:00", 90)
+        self.service.record_submission('early', "2024-03-05T09:00:00", 90)
+        self.service.record_submission('best', "2024-03-07T10:00:00", 95)
+        self.service.record_submission('low', "2024-03-04T10:00:00", 60)
+
+        top = self.service.top_k('average', k=3, week=WEEK)
+        self.assertEqual([entry['student_id'] for entry in top], ['best', 'early', 'late'])
+        self.assertEqual([entry['rank'] for entry in top], [1, 2, 3])
+        self.assertEqual(self.service.get_rank('late', 'average', week=WEEK), (3, 4))
+        self.assertEqual(self.service.top_k('average', k=2, week=WEEK, student_ids={'late', 'low'})[0]['student_id'],
+                         'late')
+
+    def test_record_grade_replaces_previous_score(self):
+        """재채점 시 이전 점수를 빼고 새 점수를 더하며, 저장한 집계값을 다시 읽을 수 있는지 확인"""
+        self.service.record_submission('s1', "2024-03-05T09:00:00")
+        self.service.record_grade('s1', "2024-03-05T09:00:00", 60)
+        self.service.record_submission('s1', "2024-03-06T09:00:00", 80)
+        self.service.record_grade('s1', "2024-03-05T09:00:00", 90, previous_score=60)
+
+        stats = self.service.weekly[WEEK]['s1']
+        self.assertEqual((stats['completed'], stats['score_sum'], stats['score_count']), (2, 170, 2))
+        self.assertEqual(self.service.top_k('average', week=WEEK)[0]['value'], 85.0)
+        self.assertEqual(RankingService(self.temp_dir.name).weekly, self.service.weekly)
+        self.assertFalse(list(Path(self.temp_dir.name).glob("*.tmp")))
+
+    def test_improvement_ranking(self):
+        """지난주 대비 평균 점수 향상도 순위와, 지난주 기록이 없는 학생 제외 확인"""
+        self.service.rebuild([
+            {'student_id': 's1', 'completed': True, 'submitted_at': "2024-02-27T10:00:00", 'score': 50},
+            {'student_id': 's1', 'completed': True, 'submitted_at': "2024-03-05T10:00:00", 'score': 80},
+            {'student_id': 's2', 'completed': True, 'submitted_at': "2024-02-28T10:00:00", 'score': 90},
+            {'student_id': 's2', 'completed': True, 'submitted_at': "2024-03-06T10:00:00", 'score': 85},
+            {'student_id': 's3', 'completed': True, 'submitted_at': "2024-03-06T10:00:00", 'score': 100},
+            {'student_id': 's4', 'completed': False, 'submitted_at': None, 'score': None},
+        ])
+        self.assertEqual(set(self.service.weekly), {WEEK, LAST_WEEK})
+        top = self.service.top_k('improvement', week=WEEK)
+        self.assertEqual([(entry['student_id'], entry['value']) for entry in top], [('s1', 30.0), ('s2', -5.0)])
+        self.assertEqual(self.service.get_rank('s3', 'improvement', week=WEEK), (None, 2))
+
+if __name__ == '__main__':
+    unittest.main()
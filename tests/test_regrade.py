@@ -0,0 +1,53 @@
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from utils.problem_manager import ProblemManager
+from utils.regrade import RegradeCheckpoint, iter_outdated_assignments, regrade
+from utils.student_manager import StudentManager
+
+class TestRegrade(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "checkpoint.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_checkpoint_resume(self):
+        """같은 분석기 버전의 체크포인트만 이어서 사용하는지 확인"""
+        RegradeCheckpoint(self.path, "v1").add(["a1", "a2"])
+        self.assertEqual(RegradeCheckpoint(self.path, "v1").done, {"a1", "a2"})
+        self.assertEqual(RegradeCheckpoint(self.path, "v2").done, set())
+
+    def test_outdated_assignments(self):
+        """제출됐고 분석기 버전이 다른 과제만 재채점 대상인지 확인"""
+        problems = {'p1': {'id': 'p1', 'type': '작문', 'correct_answer': 'I like apples.'}}
+        manager = SimpleNamespace(assignments=[
+            {'id': 'a1', 'problem_id': 'p1', 'completed': True, 'student_answer': 'I like apple.'},
+            {'id': 'a2', 'problem_id': 'p1', 'completed': True, 'student_answer': 'Apples.', 'analyzer_version': 'v1'},
+            {'id': 'a3', 'problem_id': 'p1', 'completed': False, 'student_answer': None},
+            {'id': 'a4', 'problem_id': 'deleted', 'completed': True, 'student_answer': 'Hi.'},
+            {'id': 'a5', 'problem_id': 'p1', 'completed': True, 'student_answer': 'I like it.'},
+        ])
+        items = list(iter_outdated_assignments(manager, problems, 'v1', skip={'a5'}))
+        self.assertEqual([item[0] for item in items], ['a1'])
+        self.assertEqual(items[0][1:4], ('I like apple.', 'I like apples.', '작문'))
+        forced = list(iter_outdated_assignments(manager, problems, 'v1', skip=set(), force=True))
+        self.assertEqual([item[0] for item in forced], ['a1', 'a2', 'a5'])
+
+    def test_regrade_uses_data_dir(self):
+        """data_dir의 학생/문제 데이터로 재채점 대상을 찾고 체크포인트도 그곳에 두는지 확인"""
+        problems = ProblemManager(self.temp_dir.name)
+        problems.problems = [{'id': 'p1', 'type': '작문', 'correct_answer': 'I like apples.'}]
+        problems._save_problems()
+        students = StudentManager(self.temp_dir.name)
+        student = students.add_student('김철수', 3, '중급')
+        students.assign_problems(student['id'], ['p1'])
+        students.submit_assignment(students.assignments[0]['id'], 'I like apple.')
+
+        stats = regrade(dry_run=True, data_dir=self.temp_dir.name)
+        self.assertEqual((stats['pending'], stats['resumed']), (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
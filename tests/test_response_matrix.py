@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import numpy as np
+from utils.response_matrix import ResponseMatrix
+
+class TestResponseMatrix(unittest.TestCase):
+    def setUp(self):
+        """테스트용 과제 기록 생성"""
+        self.assignments = [
+            {'student_id': 's1', 'problem_id': 'p1', 'completed': True, 'score': 80, 'submitted_at': '2024-03-01T10:00:00'},
+            {'student_id': 's1', 'problem_id': 'p2', 'completed': True, 'score': 60, 'submitted_at': '2024-03-02T10:00:00'},
+            {'student_id': 's2', 'problem_id': 'p1', 'completed': True, 'score': 90, 'submitted_at': '2024-03-01T11:00:00'},
+            {'student_id': 's3', 'problem_id': 'p2', 'completed': False, 'score': None, 'submitted_at': None},
+        ]
+
+    def test_row_and_column(self):
+        """행/열 조회 확인"""
+        matrix = ResponseMatrix.from_assignments(self.assignments)
+        self.assertEqual(matrix.shape, (2, 2))
+        problem_ids, scores, _ = matrix.row('s1')
+        self.assertEqual(problem_ids, ['p1', 'p2'])
+        np.testing.assert_array_equal(scores, [80, 60])
+        student_ids, scores, _ = matrix.column('p1')
+        self.assertEqual(sorted(zip(student_ids, scores.tolist())), [('s1', 80.0), ('s2', 90.0)])
+
+    def test_append_and_compact(self):
+        """제출 추가 후 압축 전후 조회 결과가 같은지 확인"""
+        matrix = ResponseMatrix.from_assignments(self.assignments)
+        matrix.append('s3', 'p3', 70, '2024-03-03T10:00:00')
+        before = matrix.column('p3')
+        matrix.compact()
+        after = matrix.column('p3')
+        self.assertEqual(before[0], after[0])
+        self.assertEqual(matrix.nnz, 4)
+        self.assertEqual(matrix.row('s3')[0], ['p3'])
+
+    def test_save_and_load(self):
+        """저장 후 다시 불러오기"""
+        matrix = ResponseMatrix.from_assignments(self.assignments)
+        matrix.append('s2', 'p2', 50)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            matrix.save(temp_dir)
+            loaded = ResponseMatrix.load(temp_dir)
+            self.assertEqual(loaded.nnz, matrix.nnz)
+            self.assertEqual(loaded.row('s2')[0], ['p1', 'p2'])
+
+    def test_regrade_after_load(self):
+        """불러온 행렬의 점수를 바꿔 같은 위치에 다시 저장해도 다른 응답이 보존되는지 확인"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ResponseMatrix.from_assignments(self.assignments).save(temp_dir)
+            for score in (75, 85):
+                loaded = ResponseMatrix.load(temp_dir)
+                loaded.set_score('s1', 'p2', score, '2024-03-02T10:00:00')
+                loaded.save(temp_dir)
+            reloaded = ResponseMatrix.load(temp_dir)
+            problem_ids, scores, _ = reloaded.row('s1')
+            self.assertEqual(problem_ids, ['p1', 'p2'])
+            np.testing.assert_array_equal(scores, [80, 85])
+            self.assertEqual(reloaded.nnz, 3)
+            self.assertEqual(reloaded.column('p1')[0], ['s1', 's2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+
+from utils.result_exporter import EXPORT_COLUMNS, ResultExporter, cleanup_exports
+
+class TestResultExporter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        # 학생 관리 화면은 학년을 정수로, 반을 'class_name'으로 저장합니다.
+        students = [
+            {'id': 's1', 'name': '김철수', 'grade': 3, 'class_name': '3A'},
+            {'id': 's2', 'name': '이영희', 'grade': 2, 'class_name': '2B'},
+        ]
+        problems = [{'id': 'p1', 'title': '문법 1', 'type': '문법', 'difficulty': 2}]
+        assignments = [
+            {'id': f"a{i}", 'student_id': 's1' if i % 2 else 's2', 'problem_id': 'p1', 'completed': True,
+             'assigned_at': '2024-03-01T09:00:00', 'submitted_at': f"2024-03-{i + 1:02d}T10:00:00", 'score': 50 + i}
+            for i in range(7)
+        ]
+        assignments.append({'id': 'a-open', 'student_id': 's1', 'problem_id': 'p1', 'completed': False,
+                            'assigned_at': '2024-03-01T09:00:00', 'submitted_at': None, 'score': None})
+        self.exporter = ResultExporter(students, assignments, problems, chunk_size=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_csv_and_filters(self):
+        """CSV 내보내기와 기간/반 필터 확인"""
+        path = self.dir / "results.csv"
+        count = self.exporter.export(path, 'csv', start_date=date(2024, 3, 2), end_date=date(2024, 3, 6),
+                                     class_name='3A')
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(count, 3)
+        self.assertEqual([row['assignment_id'] for row in rows], ['a1', 'a3', 'a5'])
+        self.assertEqual(rows[0]['student_class'], '3A')
+        self.assertEqual(list(rows[0].keys()), EXPORT_COLUMNS)
+
+    def test_jsonl(self):
+        """JSONL 내보내기가 모든 과제를 한 줄씩 기록하는지 확인"""
+        path = self.dir / "results.jsonl"
+        self.assertEqual(self.exporter.export(path, 'jsonl'), 8)
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[-1]['assignment_id'], 'a-open')
+        self.assertEqual(rows[0]['student_grade'], 2)
+
+    def test_parquet_with_int_grade(self):
+        """정수 학년이 있어도 Parquet로 내보내지는지 확인"""
+        if 'parquet' not in ResultExporter.available_formats():
+            self.skipTest("pyarrow가 설치되어 있지 않습니다.")
+        import pyarrow.parquet as pq
+        path = self.dir / "results.parquet"
+        self.assertEqual(self.exporter.export(path, 'parquet'), 8)
+        table = pq.read_table(path)
+        self.assertEqual(table.column_names, EXPORT_COLUMNS)
+        self.assertEqual(table.column('student_grade').to_pylist()[:2], ['2', '3'])
+        self.assertEqual(table.column('score').to_pylist()[-1], None)
+
+    def test_cleanup_exports(self):
+        """보관 시간이 지난 내보내기 파일만 삭제하는지 확인"""
+        old, new = self.dir / "results_old.csv", self.dir / "results_new.csv"
+        old.write_text("old")
+        new.write_text("new")
+        os.utime(old, (time.time() - 3600, time.time() - 3600))
+        self.assertEqual(cleanup_exports(self.dir, max_age=60), 1)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ['results_new.csv'])
+
+if __name__ == '__main__':
+    unittest.main()
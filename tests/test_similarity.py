@@ -0,0 +1,69 @@
+import unittest
+import tempfile
+import numpy as np
+from unittest import mock
+from utils.problem_manager import ProblemManager
+from utils.similarity import SimilarityService
+
+class TestSimilarityService(unittest.TestCase):
+    def setUp(self):
+        """테스트용 문제 은행으로 인덱스 생성"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.problems = [
+            {'id': 'p1', 'correct_answer': 'I went to the park with my family last weekend.'},
+            {'id': 'p2', 'correct_answer': 'She has been studying English for three years.'},
+            {'id': 'p3', 'model_answer': 'The weather was sunny, so we had a picnic.'},
+        ]
+        self.service = SimilarityService(self.temp_dir.name)
+        self.service.build(self.problems)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_similarity_range(self):
+        """같은 답안은 1, 관련 없는 답안은 더 낮은 유사도를 갖는지 확인"""
+        model = self.problems[0]['correct_answer']
+        self.assertAlmostEqual(self.service.similarity(model, model), 1.0, places=5)
+        close = self.service.similarity('I went to the park with my family.', model)
+        far = self.service.similarity('She has been studying English.', model)
+        self.assertGreater(close, far)
+        self.assertEqual(self.service.similarity('', model), 0.0)
+
+    def test_batch_matches_single(self):
+        """일괄 계산 결과가 개별 계산과 같은지 확인"""
+        model = self.problems[1]['correct_answer']
+        answers = ['She studied English for three years.', 'I like apples.', '', model]
+        batch = self.service.score_batch(answers, model)
+        single = [self.service.similarity(answer, model) for answer in answers]
+        np.testing.assert_allclose(batch, single, atol=1e-5)
+
+    def test_load_saved_index(self):
+        """저장된 인덱스를 다른 인스턴스에서 불러오기"""
+        loaded = SimilarityService(self.temp_dir.name)
+        model = self.problems[2]['model_answer']
+        self.assertEqual(loaded.n_docs, 0)
+        score = loaded.similarity('we had a picnic', model)
+        self.assertEqual(loaded.n_docs, 3)
+        self.assertAlmostEqual(score, self.service.similarity('we had a picnic', model), places=5)
+        self.assertFalse(list(self.service.data_dir.glob("*.tmp")))
+
+    def test_bulk_add_builds_index_once(self):
+        """여러 문제를 한 번에 추가하면 유사도 인덱스를 한 번만 계산하는지 확인"""
+        manager = ProblemManager(self.temp_dir.name)
+        problems = [
+            {'title': f"문제 {i}", 'type': '영작문', 'content': '...', 'difficulty': 2,
+             'correct_answer': answer, 'keywords': []}
+            for i, answer in enumerate(['I like apples.', 'He plays soccer after school.', 'We read books.'])
+        ]
+        with mock.patch.object(SimilarityService, 'build', autospec=True,
+                               side_effect=SimilarityService.build) as build:
+            added = manager.add_problems(problems)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(len(manager.get_all_problems()), 3)
+        self.assertEqual(len({p['id'] for p in added}), 3)
+        service = SimilarityService(self.temp_dir.name)
+        self.assertAlmostEqual(service.similarity('We read books.', 'We read books.'), 1.0, places=5)
+        self.assertEqual(service.n_docs, 3)
+
+if __name__ == '__main__':
+    unittest.main()
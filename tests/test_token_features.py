@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+import spacy
+from spacy.tokens import Doc
+from utils.token_features import TokenFeatures
+from utils.feedback_generator import FeedbackGenerator
+
+class TestTokenFeatures(unittest.TestCase):
+    def setUp(self):
+        """품사/의존 관계가 채워진 테스트용 Doc 생성"""
+        self.doc = Doc(
+            spacy.blank('en').vocab,
+            words=['He', 'go', 'to', 'school', '.', 'She', 'visited', 'the', 'big', 'old', 'library', '.'],
+            spaces=[True, True, True, False, True, True, True, True, True, True, False, False],
+            pos=['PRON', 'VERB', 'ADP', 'NOUN', 'PUNCT', 'PRON', 'VERB', 'DET', 'ADJ', 'ADJ', 'NOUN', 'PUNCT'],
+            tags=['PRP', 'VBP', 'IN', 'NN', '.', 'PRP', 'VBD', 'DT', 'JJ', 'JJ', 'NN', '.'],
+            deps=['nsubj', 'ROOT', 'prep', 'pobj', 'punct', 'nsubj', 'ROOT', 'det', 'amod', 'amod', 'dobj', 'punct'],
+            heads=[1, 1, 1, 2, 1, 6, 6, 10, 10, 10, 6, 6],
+            morphs=['', 'Tense=Pres', '', '', '', '', 'Tense=Past', '', '', '', '', ''],
+            sent_starts=[True] + [False] * 4 + [True] + [False] * 6
+        )
+        self.features = TokenFeatures(self.doc)
+        self.generator = FeedbackGenerator.__new__(FeedbackGenerator)
+
+    def test_sentence_arrays(self):
+        """문장 번호, 문장 길이, 자식 토큰 확인"""
+        np.testing.assert_array_equal(self.features.sentence_lengths(), [5, 7])
+        np.testing.assert_array_equal(self.features.sentence_word_counts(), [4, 6])
+        has_det = self.features.has_child(self.features.is_in(self.features.pos, "DET"))
+        self.assertEqual(np.flatnonzero(has_det).tolist(), [10])
+        self.assertEqual(self.features.morph_values(self.features.is_in(self.features.pos, "VERB"), "Tense"), {'Pres', 'Past'})
+
+    def test_vectorized_analyzers(self):
+        """벡터화된 분석기 결과 확인"""
+        errors = self.generator._check_basic_grammar(self.features)
+        self.assertEqual([e['error'] for e in errors], ['주어-동사 불일치', '관사 누락'])
+        self.assertEqual(errors[0]['context'], 'He go')
+        self.assertEqual(errors[1]['context'], 'school')
+        self.assertEqual(len(self.generator._analyze_specific_grammar(self.features)), 1)
+        word_choice = self.generator._analyze_word_choice(self.features)
+        self.assertIn("'big old'", word_choice[-1]['details'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,26 +1,18 @@
 import google.generativeai as genai
-import json
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import streamlit as st
 import os
-from datetime import datetime, timedelta
+from utils.problem_prompt import build_problem_prompt, parse_problem_response, validate_problem
+from utils.batch_problem_generator import BatchProblemGenerator, split_request
+from utils.quota_ledger import INTERACTIVE_WAIT_SECONDS, get_quota_ledger
 
 class AIProblemGenerator:
     def __init__(self):
         """AI 문제 생성기를 초기화합니다."""
-        self._initialize_daily_count()
+        # 생성 한도는 세션이 아닌 모든 세션/프로세스가 함께 쓰는 원장에 기록합니다.
+        self.quota = get_quota_ledger()
         self._load_api_key()
         
-    def _initialize_daily_count(self):
-        """일일 생성 카운트를 초기화합니다."""
-        # 날짜가 바뀌었는지 확인
-        current_date = datetime.now().date()
-        last_reset = st.session_state.get('last_count_reset')
-        
-        if not last_reset or last_reset != current_date:
-            st.session_state.daily_generation_count = 0
-            st.session_state.last_count_reset = current_date
-            
     def _load_api_key(self):
         """API 키를 로드하고 설정합니다."""
         api_key = st.session_state.get('gemini_api_key')
@@ -48,11 +40,15 @@ class AIProblemGenerator:
         
     def can_generate_more(self) -> bool:
         """추가 생성이 가능한지 확인합니다."""
-        return st.session_state.get('daily_generation_count', 0) < 100
+        return self.quota.remaining() > 0
         
     def get_remaining_generations(self) -> int:
         """남은 생성 가능 횟수를 반환합니다."""
-        return 100 - st.session_state.get('daily_generation_count', 0)
+        return self.quota.remaining()
+        
+    def get_quota_status(self) -> Dict:
+        """공유 생성 한도의 사용량과 대기 상태를 반환합니다."""
+        return self.quota.get_status()
         
     def generate_problems(self, 
                          problem_type: str,
@@ -65,59 +61,20 @@ class AIProblemGenerator:
         if not self.model:
             raise ValueError("API 키가 설정되지 않았습니다.")
             
-        # 일일 생성 한도 확인
-        current_count = st.session_state.get('daily_generation_count', 0)
-        if current_count + count > 100:
-            raise ValueError(f"일일 생성 한도(100개)를 초과했습니다. 남은 생성 가능 횟수: {100 - current_count}개")
+        # 생성 한도 예약 (페이지가 멈추지 않도록 잠깐만 기다리고, 더 기다려야 하면 QuotaExceededError가 발생합니다)
+        reservation = self.quota.acquire(count, timeout=INTERACTIVE_WAIT_SECONDS, source="single")
+        validated_problems = []
             
         # 프롬프트 생성
-        prompt = f"""
-        영어 교육 전문가로서 다음 조건에 맞는 영어 문제를 생성해주세요:
-        
-        조건:
-        - 문제 유형: {problem_type}
-        - 난이도: {difficulty}점 (1-5점 척도)
-        {f'- 주제: {topic}' if topic else ''}
-        - 생성할 문제 수: {count}개
-        
-        각 문제는 다음 JSON 형식으로 생성해주세요:
-        {{
-            "type": "문제 유형",
-            "title": "문제 제목",
-            "content": "문제 내용",
-            "difficulty": 난이도,
-            "correct_answer": "정답",
-            "keywords": ["채점", "키워드", "목록"],
-            "explanation": "문제 해설"
-        }}
-        
-        응답은 반드시 유효한 JSON 형식이어야 하며, 여러 문제의 경우 JSON 배열로 반환해주세요.
-        """
+        prompt = build_problem_prompt(problem_type, difficulty, count, topic)
         
         try:
             response = self.model.generate_content(prompt)
             
             # JSON 응답 파싱
-            response_text = response.text
-            # JSON 부분만 추출 (텍스트에서 {...} 또는 [...] 찾기)
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            if json_start == -1:
-                json_start = response_text.find('[')
-                json_end = response_text.rfind(']') + 1
-                
-            if json_start == -1 or json_end == 0:
-                raise ValueError("유효한 JSON 응답을 찾을 수 없습니다.")
-                
-            json_str = response_text[json_start:json_end]
-            problems = json.loads(json_str)
-            
-            # 단일 문제인 경우 리스트로 변환
-            if not isinstance(problems, list):
-                problems = [problems]
+            problems = parse_problem_response(response.text)
                 
             # 문제 검증
-            validated_problems = []
             for problem in problems:
                 if self.validate_problem(problem):
                     validated_problems.append(problem)
@@ -125,33 +82,34 @@ class AIProblemGenerator:
             if not validated_problems:
                 raise ValueError("유효한 문제가 생성되지 않았습니다.")
                 
-            # 생성 카운트 증가
-            st.session_state.daily_generation_count = current_count + len(validated_problems)
-                
+            # 모델이 요청보다 많이 만들어도 예약한 수만큼만 사용합니다.
+            validated_problems = validated_problems[:count]
             return validated_problems
             
         except Exception as e:
             raise Exception(f"문제 생성 중 오류가 발생했습니다: {str(e)}")
+        finally:
+            # 실제로 생성한 문제 수만큼만 한도를 사용합니다.
+            self.quota.settle(reservation, len(validated_problems))
+            
+    def generate_problems_batch(self,
+                                problem_types: List[str],
+                                difficulties: List[int],
+                                total: int,
+                                topic: str = None,
+                                max_workers: int = 4) -> Iterator[Dict]:
+        """여러 유형/난이도의 문제를 동시에 생성하며, 호출이 끝날 때마다 결과를 생성합니다.
+
+        결과 형식은 `BatchProblemGenerator.generate`와 같습니다.
+        """
+        if not self.model:
+            raise ValueError("API 키가 설정되지 않았습니다.")
+            
+        # 작업마다 공유 한도를 예약하므로, 한도가 모자란 작업은 대기열에서 기다립니다.
+        generator = BatchProblemGenerator(self.model, max_workers=max_workers, quota=self.quota,
+                                          quota_timeout=INTERACTIVE_WAIT_SECONDS)
+        yield from generator.generate(split_request(problem_types, difficulties, total, topic))
             
     def validate_problem(self, problem: Dict) -> bool:
         """생성된 문제가 올바른 형식인지 검증합니다."""
-        required_fields = ['type', 'title', 'content', 'difficulty', 
-                         'correct_answer', 'keywords', 'explanation']
-        
-        # 모든 필수 필드가 있는지 확인
-        if not all(field in problem for field in required_fields):
-            return False
-            
-        # 타입 검증
-        try:
-            assert isinstance(problem['type'], str)
-            assert isinstance(problem['title'], str)
-            assert isinstance(problem['content'], str)
-            assert isinstance(problem['difficulty'], (int, float))
-            assert isinstance(problem['correct_answer'], str)
-            assert isinstance(problem['keywords'], list)
-            assert isinstance(problem['explanation'], str)
-            assert all(isinstance(k, str) for k in problem['keywords'])
-            return True
-        except:
-            return False 
\ No newline at end of file
+        return validate_problem(problem)
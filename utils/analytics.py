@@ -0,0 +1,54 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.student_manager import get_student_class
+
+ANALYTICS_DATA_FILES = ("students.json", "assignments.json", "problems.json")
+
+
+def get_data_version(data_dir: str = "data") -> Tuple[int, ...]:
+    """분석에 쓰이는 데이터 파일들의 수정 시각으로 데이터 버전을 만듭니다."""
+    data_dir = Path(data_dir)
+    return tuple(
+        (data_dir / name).stat().st_mtime_ns if (data_dir / name).exists() else 0
+        for name in ANALYTICS_DATA_FILES
+    )
+
+
+def build_analytics_frame(students: List[Dict], assignments: List[Dict], problems: List[Dict]) -> pd.DataFrame:
+    """과제 기록에 학생/문제 정보를 결합한 분석용 데이터프레임을 만듭니다."""
+    columns = ['id', 'student_id', 'problem_id', 'completed', 'score', 'assigned_at', 'submitted_at']
+    frame = pd.DataFrame(assignments, columns=columns)
+    if frame.empty:
+        return frame.assign(student_name=None, student_grade=None, student_class=None,
+                            problem_title=None, problem_type=None, difficulty=None)
+
+    student_df = pd.DataFrame(
+        [(s['id'], s.get('name'), s.get('grade'), get_student_class(s)) for s in students],
+        columns=['student_id', 'student_name', 'student_grade', 'student_class']
+    )
+    problem_df = pd.DataFrame(problems, columns=['id', 'title', 'type', 'difficulty']).rename(columns={
+        'id': 'problem_id', 'title': 'problem_title', 'type': 'problem_type'
+    })
+
+    frame = frame.merge(student_df, on='student_id', how='inner')
+    frame = frame.merge(problem_df, on='problem_id', how='inner')
+    frame['score'] = pd.to_numeric(frame['score'], errors='coerce')
+    frame['completed'] = frame['completed'].fillna(False).astype(bool)
+    frame['submitted_at'] = pd.to_datetime(frame['submitted_at'], errors='coerce')
+    return frame
+
+
+def compute_class_mastery(frame: pd.DataFrame, class_name: Optional[str] = None) -> pd.DataFrame:
+    """학생 × 문제 유형별 평균 점수 표를 한 번의 groupby로 계산합니다."""
+    graded = frame[frame['completed'] & frame['score'].notna()]
+    if class_name:
+        graded = graded[graded['student_class'] == class_name]
+    if graded.empty:
+        return pd.DataFrame()
+
+    mastery = graded.groupby(['student_id', 'student_name', 'problem_type'], sort=False)['score'].mean().unstack('problem_type')
+    mastery = mastery.reset_index(level='student_id', drop=True).sort_index()
+    return mastery.round(1)
@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import product
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.problem_prompt import build_problem_prompt, parse_problem_response, validate_problem
+
+# 한 번의 호출로 요청하는 최대 문제 수 (응답이 길어지면 JSON이 잘리기 쉽습니다)
+PROBLEMS_PER_CALL = 5
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷입니다. 여러 스레드가 함께 사용합니다."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 기다립니다."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+def split_request(problem_types: List[str], difficulties: List[int], total: int,
+                  topic: Optional[str] = None, per_call: int = PROBLEMS_PER_CALL) -> List[Dict]:
+    """전체 문제 수를 유형 × 난이도 조합에 고르게 나누고, 호출 하나당 per_call개 이하로 쪼갭니다."""
+    combos = list(product(problem_types, difficulties))
+    if not combos or total <= 0:
+        return []
+    counts = [total // len(combos) + (1 if i < total % len(combos) else 0) for i in range(len(combos))]
+    jobs = []
+    for (problem_type, difficulty), count in zip(combos, counts):
+        while count > 0:
+            size = min(per_call, count)
+            jobs.append({'problem_type': problem_type, 'difficulty': difficulty, 'count': size, 'topic': topic})
+            count -= size
+    return jobs
+
+
+class BatchProblemGenerator:
+    """대량의 AI 문제 생성을 여러 호출로 나눠 동시에 실행합니다.
+
+    모든 호출은 토큰 버킷(분당 requests_per_minute회)을 거쳐 API 속도 제한을 넘지 않으며,
+    실패한 호출(속도 제한, 잘못된 JSON 등)은 지수 백오프에 무작위 지연(full jitter)을 더해 다시 시도합니다.
+    결과는 호출이 끝나는 대로 검증된 문제만 하나씩 돌려줍니다.
+    quota(`QuotaLedger`)를 주면 작업마다 생성 한도를 예약하고, 실제로 생성한 수로 정산합니다.
+    model은 `generate_content(prompt)`가 `.text`를 가진 응답을 반환하는 객체이면 됩니다.
+    """
+
+    def __init__(self, model, max_workers: int = 4, requests_per_minute: float = 15, max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 30.0, sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None, quota=None, quota_timeout: float = 60.0):
+        self.model = model
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(requests_per_minute / 60.0, max(1.0, min(max_workers, requests_per_minute)),
+                                  sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.quota = quota
+        self.quota_timeout = quota_timeout
+        self.stats = {'calls': 0, 'retries': 0, 'failed_jobs': 0, 'generated': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, value: int = 1):
+        with self._stats_lock:
+            self.stats[name] += value
+
+    def _backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (0 ~ min(max_delay, base_delay * 2^attempt) 사이 무작위)"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _run_job(self, job: Dict) -> List[Dict]:
+        if self.quota is None:
+            return self._call_with_retries(job)
+        reservation = self.quota.acquire(job['count'], timeout=self.quota_timeout, source="batch")
+        problems = []
+        try:
+            problems = self._call_with_retries(job)
+            return problems
+        finally:
+            self.quota.settle(reservation, len(problems))
+
+    def _call_with_retries(self, job: Dict) -> List[Dict]:
+        prompt = build_problem_prompt(job['problem_type'], job['difficulty'], job['count'], job.get('topic'))
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            self._count('calls')
+            try:
+                response = self.model.generate_content(prompt)
+                problems = [p for p in parse_problem_response(response.text) if validate_problem(p)]
+                if not problems:
+                    raise ValueError("유효한 문제가 생성되지 않았습니다.")
+                return problems[:job['count']]
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                self._count('retries')
+                self.sleep(self._backoff(attempt))
+
+    def generate(self, jobs: List[Dict]) -> Iterator[Dict]:
+        """호출 단위 작업을 동시에 실행하며, 끝나는 순서대로 결과를 생성합니다.
+
+        각 결과는 {'job': 작업, 'problems': 검증된 문제 목록, 'error': 오류 메시지 또는 None}입니다.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    problems = future.result()
+                except Exception as e:
+                    self._count('failed_jobs')
+                    yield {'job': job, 'problems': [], 'error': str(e)}
+                    continue
+                self._count('generated', len(problems))
+                yield {'job': job, 'problems': problems, 'error': None}
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+import numpy as np
+
+
+class DifficultyCalibrator:
+    """채점된 과제 기록으로 Rasch 모형(학생 능력치, 문제 난이도)을 추정합니다.
+
+    응답은 점수/100 (0~1) 값을 그대로 사용하며, P(정답) = sigmoid(능력치 - 난이도) 입니다.
+    능력치와 난이도를 번갈아 Newton 단계로 갱신하고, 이전 추정값을 초기값으로
+    사용(warm start)하여 전체 기록 재추정도 몇 번의 반복으로 수렴합니다.
+    """
+
+    def __init__(self, data_dir: str = "data", min_responses: int = 5,
+                 max_iter: int = 100, tol: float = 1e-4, prior_variance: float = 4.0):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.calibration_file = self.data_dir / "calibration.json"
+        self.min_responses = min_responses
+        self.max_iter = max_iter
+        self.tol = tol
+        # 만점/0점만 있는 학생·문제가 발산하지 않도록 하고 척도를 고정하기 위해
+        # 능력치와 난이도 모두에 약한 정규 사전분포(평균 0)를 둡니다.
+        self.prior_precision = 1.0 / prior_variance
+        self._load_calibration()
+
+    def _load_calibration(self):
+        """이전 추정 결과를 로드합니다."""
+        if self.calibration_file.exists():
+            with open(self.calibration_file, 'r', encoding='utf-8') as f:
+                self.calibration = json.load(f)
+        else:
+            self.calibration = {'abilities': {}, 'difficulties': {}, 'counts': {}}
+
+    def _save_calibration(self):
+        """추정 결과를 저장합니다."""
+        with open(self.calibration_file, 'w', encoding='utf-8') as f:
+            json.dump(self.calibration, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def build_responses(assignments: List[Dict]):
+        """채점된 과제 목록을 (학생 인덱스, 문제 인덱스, 응답) 배열로 변환합니다."""
+        graded = [a for a in assignments if a.get('completed') and a.get('score') is not None]
+        student_ids = sorted({a['student_id'] for a in graded})
+        problem_ids = sorted({a['problem_id'] for a in graded})
+        student_index = {sid: i for i, sid in enumerate(student_ids)}
+        problem_index = {pid: j for j, pid in enumerate(problem_ids)}
+
+        rows = np.fromiter((student_index[a['student_id']] for a in graded), dtype=np.int64, count=len(graded))
+        cols = np.fromiter((problem_index[a['problem_id']] for a in graded), dtype=np.int64, count=len(graded))
+        responses = np.fromiter((float(a['score']) for a in graded), dtype=np.float64, count=len(graded))
+        responses = np.clip(responses / 100.0, 0.0, 1.0)
+        return student_ids, problem_ids, rows, cols, responses
+
+    def fit(self, student_ids: List[str], problem_ids: List[str],
+            rows: np.ndarray, cols: np.ndarray, responses: np.ndarray) -> Dict:
+        """Rasch 모형을 추정합니다."""
+        n_students, n_problems = len(student_ids), len(problem_ids)
+        abilities = self.calibration.get('abilities', {})
+        difficulties = self.calibration.get('difficulties', {})
+        theta = np.array([abilities.get(sid, 0.0) for sid in student_ids], dtype=np.float64)
+        beta = np.array([difficulties.get(pid, 0.0) for pid in problem_ids], dtype=np.float64)
+
+        iterations = 0
+        for iterations in range(1, self.max_iter + 1):
+            # 학생 능력치 갱신
+            p = 1.0 / (1.0 + np.exp(beta[cols] - theta[rows]))
+            info = p * (1.0 - p)
+            grad = np.bincount(rows, weights=responses - p, minlength=n_students) - self.prior_precision * theta
+            hess = np.bincount(rows, weights=info, minlength=n_students) + self.prior_precision
+            theta_step = grad / hess
+            theta += theta_step
+
+            # 문제 난이도 갱신
+            p = 1.0 / (1.0 + np.exp(beta[cols] - theta[rows]))
+            info = p * (1.0 - p)
+            grad = np.bincount(cols, weights=p - responses, minlength=n_problems) - self.prior_precision * beta
+            hess = np.bincount(cols, weights=info, minlength=n_problems) + self.prior_precision
+            beta_step = grad / hess
+            beta += beta_step
+
+            if max(np.abs(theta_step).max(initial=0.0), np.abs(beta_step).max(initial=0.0)) < self.tol:
+                break
+
+        counts = np.bincount(cols, minlength=n_problems)
+        return {
+            'abilities': dict(zip(student_ids, theta.round(4).tolist())),
+            'difficulties': dict(zip(problem_ids, beta.round(4).tolist())),
+            'counts': dict(zip(problem_ids, counts.tolist())),
+            'iterations': iterations
+        }
+
+    def calibrate(self, assignments: List[Dict]) -> Dict:
+        """전체 과제 기록으로 재추정하고 결과를 저장합니다."""
+        student_ids, problem_ids, rows, cols, responses = self.build_responses(assignments)
+        if len(responses) == 0:
+            return self.calibration
+
+        result = self.fit(student_ids, problem_ids, rows, cols, responses)
+        result['calibrated_at'] = datetime.now().isoformat()
+        self.calibration = result
+        self._save_calibration()
+        return result
+
+    def calibrate_matrix(self, matrix) -> Dict:
+        """응답 행렬(ResponseMatrix)로 재추정하고 결과를 저장합니다."""
+        rows, cols, scores, _ = matrix.to_coo()
+        if len(scores) == 0:
+            return self.calibration
+
+        responses = np.clip(scores.astype(np.float64) / 100.0, 0.0, 1.0)
+        result = self.fit(matrix.student_ids, matrix.problem_ids, rows, cols.astype(np.int64), responses)
+        result['calibrated_at'] = datetime.now().isoformat()
+        self.calibration = result
+        self._save_calibration()
+        return result
+
+    def get_difficulty(self, problem_id: str) -> Optional[float]:
+        """보정된 문제 난이도를 반환합니다. 응답 수가 부족하면 None을 반환합니다."""
+        if self.calibration.get('counts', {}).get(problem_id, 0) < self.min_responses:
+            return None
+        return self.calibration.get('difficulties', {}).get(problem_id)
+
+    def get_ability(self, student_id: str) -> Optional[float]:
+        """추정된 학생 능력치를 반환합니다."""
+        return self.calibration.get('abilities', {}).get(student_id)
+
+    def apply_to_problems(self, problem_manager) -> int:
+        """보정된 난이도를 문제의 `calibrated_difficulty` 필드에 기록합니다."""
+        updated = 0
+        for problem in problem_manager.get_all_problems():
+            difficulty = self.get_difficulty(problem['id'])
+            if difficulty is None:
+                continue
+            problem['calibrated_difficulty'] = difficulty
+            problem['calibration_count'] = self.calibration['counts'][problem['id']]
+            updated += 1
+        if updated:
+            problem_manager._save_problems()
+        return updated
+
+
+def run_calibration(data_dir: str = "data") -> Dict:
+    """과제 기록 전체로 난이도를 재추정하고 문제 데이터에 반영합니다."""
+    from utils.student_manager import StudentManager
+    from utils.problem_manager import ProblemManager
+
+    student_manager = StudentManager()
+    problem_manager = ProblemManager(data_dir)
+    calibrator = DifficultyCalibrator(data_dir)
+    result = calibrator.calibrate_matrix(student_manager.get_response_matrix())
+    updated = calibrator.apply_to_problems(problem_manager)
+    return {'iterations': result.get('iterations', 0), 'updated_problems': updated}
+
+
+if __name__ == "__main__":
+    print(run_calibration())
@@ -0,0 +1,228 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.keyword_matcher import LEMMAS
+from utils.student_manager import StudentManager, get_student_class
+
+# 피드백 항목 종류 (저장된 피드백의 키 → 표시 이름)
+ERROR_KINDS = {
+    'grammar_feedback': "문법",
+    'vocabulary_feedback': "어휘",
+    'content_feedback': "내용",
+}
+# 다시 계산할 과제가 이보다 적으면 프로세스를 띄우지 않고 바로 계산합니다.
+MIN_PARALLEL_RECORDS = 2000
+# 순위를 묶는 기준: 오류 유형만 / 유형 + 원형 / 유형 + 문맥 n-gram + 원형
+GROUP_BY = {
+    'category': "오류 유형",
+    'lemma': "오류 유형 + 원형",
+    'context': "오류 유형 + 문맥",
+}
+
+
+def simple_lemma(word: str) -> str:
+    """NLP 분석 없이 불규칙 변화형 표와 간단한 접미사 규칙으로 원형을 추정합니다."""
+    word = word.lower().strip(".,!?;:'\"")
+    if word in LEMMAS:
+        return LEMMAS[word]
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('ches', 'shes', 'sses', 'xes', 'zes')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def extract_errors(feedback: Dict) -> List[Tuple[str, str, str, str]]:
+    """저장된 피드백에서 (종류, 오류 유형, 문맥 n-gram, 원형) 목록을 뽑습니다.
+
+    문법 오류는 검사기가 기록한 문맥(예: "he go")을 소문자 n-gram으로, 마지막 단어의 원형을 lemma로 씁니다.
+    어휘/내용 의견은 문맥 없이 의견 항목만 셉니다.
+    """
+    errors = []
+    for key, kind in ERROR_KINDS.items():
+        for item in feedback.get(key) or []:
+            if not isinstance(item, dict):
+                continue
+            category = item.get('error') or item.get('point')
+            if not category:
+                continue
+            context = item.get('context') if isinstance(item.get('context'), str) else ''
+            words = context.lower().split()
+            errors.append((kind, category, ' '.join(words), simple_lemma(words[-1]) if words else ''))
+    return errors
+
+
+def _map_day(records: List[Dict]) -> Dict[str, Dict[str, list]]:
+    """하루치 과제 기록을 반별 {오류 키: [횟수, 학생 ID 목록]}으로 집계합니다."""
+    counts = {}
+    for record in records:
+        class_counts = counts.setdefault(record['class'] or '', {})
+        for error in extract_errors(record['feedback']):
+            key = '\t'.join(error)
+            entry = class_counts.setdefault(key, [0, []])
+            entry[0] += 1
+            if record['student_id'] not in entry[1]:
+                entry[1].append(record['student_id'])
+    return counts
+
+
+def _map_days(days: List[Tuple[str, List[Dict]]]) -> List[Tuple[str, Dict]]:
+    return [(day, _map_day(records)) for day, records in days]
+
+
+def _fingerprint(records: List[Dict]) -> str:
+    digest = hashlib.sha1()
+    for record in sorted(records, key=lambda r: r['id']):
+        digest.update(f"{record['id']}|{record['class']}|{record['version']}|{record['score']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ErrorMiner:
+    """제출된 과제의 저장된 피드백에서 반별로 자주 나오는 오류를 집계합니다.
+
+    과제를 제출일별로 나눠 날짜별 부분 결과(`data/error_mining/YYYY-MM-DD.json`)를 만들고(map),
+    조회 시 기간과 반에 맞는 부분 결과만 합칩니다(reduce). 날짜별 과제 구성(과제 ID, 반, 분석기 버전, 점수)의
+    지문이 같으면 이전 부분 결과를 그대로 쓰므로, 새로 제출되거나 재채점된 날짜만 다시 계산합니다.
+    NLP 분석은 다시 하지 않고 피드백에 기록된 오류만 사용합니다.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        self.partials_dir = Path(data_dir) / "error_mining"
+        self.partials_dir.mkdir(parents=True, exist_ok=True)
+
+    def _partial_file(self, day: str) -> Path:
+        return self.partials_dir / f"{day}.json"
+
+    def _load_partial(self, day: str) -> Optional[Dict]:
+        path = self._partial_file(day)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"오류 집계 부분 결과 로드 중 오류 발생: {str(e)}")
+            return None
+
+    def _save_partial(self, day: str, fingerprint: str, counts: Dict):
+        path = self._partial_file(day)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'counts': counts}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def group_by_day(assignments: Iterable[Dict], students: Iterable[Dict]) -> Dict[str, List[Dict]]:
+        """피드백이 있는 제출 과제를 제출일별 집계용 기록으로 나눕니다."""
+        classes = {s['id']: get_student_class(s) for s in students}
+        days = {}
+        for assignment in assignments:
+            feedback = assignment.get('feedback')
+            if not (assignment.get('completed') and feedback and assignment.get('submitted_at')):
+                continue
+            if assignment.get('student_id') not in classes:
+                continue
+            days.setdefault(assignment['submitted_at'][:10], []).append({
+                'id': assignment['id'],
+                'student_id': assignment['student_id'],
+                'class': classes[assignment['student_id']],
+                'version': assignment.get('analyzer_version'),
+                'score': assignment.get('score'),
+                'feedback': feedback
+            })
+        return days
+
+    def update(self, assignments: Iterable[Dict], students: Iterable[Dict], workers: int = 1) -> Dict:
+        """바뀐 날짜의 부분 결과만 다시 계산하고 전체 날짜 수와 다시 계산한 날짜 수를 반환합니다."""
+        days = self.group_by_day(assignments, students)
+        stale = []
+        for day, records in days.items():
+            fingerprint = _fingerprint(records)
+            partial = self._load_partial(day)
+            if partial is None or partial.get('fingerprint') != fingerprint:
+                stale.append((day, fingerprint, records))
+
+        # 제출이 없어진 날짜의 부분 결과는 삭제합니다.
+        for path in self.partials_dir.glob("*.json"):
+            if path.stem not in days:
+                path.unlink()
+
+        jobs = [(day, records) for day, _, records in stale]
+        fingerprints = {day: fingerprint for day, fingerprint, _ in stale}
+        n_records = sum(len(records) for _, records in jobs)
+        if workers > 1 and len(jobs) > 1 and n_records >= MIN_PARALLEL_RECORDS:
+            # 날짜들을 작업 프로세스 수만큼 묶어 나눠 계산합니다.
+            batches = [jobs[i::workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = [result for batch in executor.map(_map_days, batches) for result in batch]
+        else:
+            results = _map_days(jobs)
+        for day, counts in results:
+            self._save_partial(day, fingerprints[day], counts)
+        return {'days': len(days), 'updated': len(results)}
+
+    def top_errors(self, class_name: Optional[str] = None, start: Optional[date] = None,
+                   end: Optional[date] = None, kind: Optional[str] = None, group_by: str = 'context',
+                   limit: int = 5) -> List[Dict]:
+        """기간과 반에 맞는 부분 결과를 합쳐 자주 나온 오류를 횟수 순서로 반환합니다.
+
+        group_by가 'category'이면 문맥/원형을 무시하고, 'lemma'이면 문맥만 무시하고 합칩니다.
+        """
+        counts = Counter()
+        students = {}
+        for path in self.partials_dir.glob("*.json"):
+            day = date.fromisoformat(path.stem)
+            if (start and day < start) or (end and day > end):
+                continue
+            partial = self._load_partial(path.stem) or {}
+            for class_key, class_counts in partial.get('counts', {}).items():
+                if class_name is not None and class_key != class_name:
+                    continue
+                for key, (count, student_ids) in class_counts.items():
+                    if kind is not None and not key.startswith(kind + '\t'):
+                        continue
+                    error_kind, category, context, lemma = key.split('\t')
+                    if group_by == 'category':
+                        context, lemma = '', ''
+                    elif group_by == 'lemma':
+                        context = ''
+                    key = '\t'.join((error_kind, category, context, lemma))
+                    counts[key] += count
+                    students.setdefault(key, set()).update(student_ids)
+
+        ranking = []
+        for rank, (key, count) in enumerate(counts.most_common(limit), 1):
+            error_kind, category, context, lemma = key.split('\t')
+            ranking.append({
+                'rank': rank,
+                'kind': error_kind,
+                'category': category,
+                'context': context,
+                'lemma': lemma,
+                'count': count,
+                'students': len(students[key])
+            })
+        return ranking
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜별 오류 집계를 갱신합니다.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="작업 프로세스 수")
+    args = parser.parse_args()
+
+    students = StudentManager()
+    stats = ErrorMiner().update(students.assignments, students.get_all_students(), workers=args.workers)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
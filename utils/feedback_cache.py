@@ -0,0 +1,133 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.model_answer_store import get_model_answer_text
+
+# 첨삭 결과에 영향을 주는 분석기 모듈과 어휘 자료 (내용이 바뀌면 캐시된 첨삭을 다시 사용하지 않습니다)
+ANALYZER_MODULES = [
+    'feedback_generator.py', 'feedback_pipeline.py', 'keyword_matcher.py', 'similarity.py',
+    'token_features.py', 'nlp_loader.py', 'objective_matcher.py',
+    'fuzzy_matcher.py', 'lexicon.py', 'resources/cefr_lexicon.tsv'
+]
+
+
+@lru_cache(maxsize=1)
+def get_analyzer_version() -> str:
+    """분석기 소스 코드의 해시로 만든 분석기 버전을 반환합니다."""
+    digest = hashlib.sha1()
+    utils_dir = Path(__file__).parent
+    for name in ANALYZER_MODULES:
+        path = utils_dir / name
+        if path.exists():
+            digest.update(name.encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def normalize_answer(text: str) -> str:
+    """공백 차이만 있는 답안이 같은 키를 갖도록 정규화합니다."""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class FeedbackCache:
+    """첨삭 결과를 (문제, 정규화한 답안 해시, 분석기 버전) 키로 저장하는 디스크 캐시입니다.
+
+    같은 답안을 다시 제출하거나 재채점할 때 NLP 분석을 다시 하지 않습니다.
+    항목 수가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제하며,
+    분석기 코드가 바뀌면 버전이 달라져 이전 결과는 사용되지 않고 정리됩니다.
+    """
+
+    def __init__(self, data_dir: str = "data", max_entries: int = 5000):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.db_file = self.data_dir / "feedback_cache.db"
+        self.max_entries = max_entries
+        self.version = get_analyzer_version()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS feedback_cache (
+                    key TEXT PRIMARY KEY,
+                    problem_id TEXT,
+                    version TEXT NOT NULL,
+                    feedback TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_feedback_cache_used ON feedback_cache (last_used)")
+            # 이전 분석기 버전의 결과는 다시 쓰이지 않으므로 삭제합니다.
+            connection.execute("DELETE FROM feedback_cache WHERE version != ?", (self.version,))
+
+    def make_key(self, problem: Dict, student_answer: str, model_answer: str, problem_type: str,
+                 stages: Optional[List[str]] = None) -> str:
+        """캐시 키를 만듭니다. 모범 답안, 핵심 단어, 사용하는 분석 단계가 바뀌면 다른 키를 갖습니다."""
+        problem_part = json.dumps(
+            [problem.get('id'), model_answer or get_model_answer_text(problem), problem.get('keywords') or [],
+             problem_type, stages or []],
+            ensure_ascii=False
+        )
+        answer_hash = hashlib.sha1(normalize_answer(student_answer).encode('utf-8')).hexdigest()
+        return hashlib.sha1(f"{problem_part}|{answer_hash}|{self.version}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시된 첨삭 결과를 반환합니다. 없으면 None을 반환합니다."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT feedback FROM feedback_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE feedback_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, feedback: Dict, problem_id: Optional[str] = None):
+        """첨삭 결과를 저장하고, 최대 항목 수를 넘으면 오래 사용되지 않은 항목을 삭제합니다."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO feedback_cache (key, problem_id, version, feedback, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, problem_id, self.version, json.dumps(feedback, ensure_ascii=False), time.time())
+            )
+            count = connection.execute("SELECT COUNT(*) FROM feedback_cache").fetchone()[0]
+            if count > self.max_entries:
+                connection.execute(
+                    "DELETE FROM feedback_cache WHERE key IN "
+                    "(SELECT key FROM feedback_cache ORDER BY last_used LIMIT ?)", (count - self.max_entries,)
+                )
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM feedback_cache")
+
+    def get_stats(self) -> Dict:
+        """캐시 크기와 적중률을 반환합니다."""
+        with self._connect() as connection:
+            size = connection.execute("SELECT COUNT(*) FROM feedback_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'size': size,
+            'max_entries': self.max_entries,
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
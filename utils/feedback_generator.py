@@ -1,34 +1,184 @@
-import spacy
 from textblob import TextBlob
 import re
+import time
+import numpy as np
+from utils.nlp_cache import DocCache
+from utils.nlp_loader import get_nlp
+from utils.similarity import get_similarity_service
+from utils.feedback_cache import FeedbackCache
+from utils.feedback_pipeline import (
+    PARSE_STAGE, STAGE_REGISTRY, FeedbackSettings, StageContext, get_pipeline, get_stage_metrics
+)
+from utils.token_features import get_token_features
+from utils.objective_matcher import get_objective_matcher
+from utils.fuzzy_matcher import FUZZY_TYPES, get_fuzzy_matcher
+from utils.lexicon import get_lexicon
 
 class FeedbackGenerator:
     def __init__(self):
         """첨삭 생성기 초기화"""
-        # 영어 언어 모델 로드
-        self.nlp = spacy.load("en_core_web_sm")
-        
-    def generate_detailed_feedback(self, student_answer, model_answer, problem_type):
+        # 영어 언어 모델은 첫 첨삭 요청 시 로드됩니다 (프로세스당 하나를 공유).
+        # 한 요청 안에서 같은 텍스트는 한 번만 파싱되도록 Doc을 캐시합니다.
+        self.doc_cache = DocCache(lambda text: self.nlp(text))
+        # 모범 답안 유사도는 미리 계산해 둔 TF-IDF 벡터로 비교합니다.
+        self.similarity = get_similarity_service()
+        # 일괄 첨삭 시 한 번에 계산해 둔 (학생 답안, 모범 답안) 유사도
+        self._batch_similarity = {}
+        # 같은 문제의 같은 답안은 저장된 첨삭 결과를 재사용합니다 (분석기 코드가 바뀌면 무효화).
+        self.feedback_cache = FeedbackCache()
+        # 문제 유형별로 끈 분석 단계 설정과 단계별 실행 시간 기록
+        self.settings = FeedbackSettings()
+        self.stage_metrics = get_stage_metrics()
+        # 단어별 CEFR 수준 사전 (정렬된 해시 배열을 mmap으로 엽니다)
+        self.lexicon = get_lexicon()
+        
+    @property
+    def nlp(self):
+        """공유 spaCy 모델"""
+        return get_nlp()
+
+    def generate_detailed_feedback(self, student_answer, model_answer, problem_type, problem=None):
         """학생 답안에 대한 상세 피드백 생성"""
+        for _, feedback in self.iter_feedback(student_answer, model_answer, problem_type, problem):
+            pass
+        return feedback
+
+    def iter_feedback(self, student_answer, model_answer, problem_type, problem=None, time_budget=None):
+        """분석 단계가 끝날 때마다 (단계 이름, 현재까지의 피드백)을 생성합니다.
+
+        단계는 문제 유형별 파이프라인(`utils.feedback_pipeline.PIPELINES`)의 우선순위 순서대로 실행되며,
+        마지막으로 점수와 요약이 채워진 결과가 "summary" 단계로 생성됩니다.
+        문제 정보가 있고 같은 답안의 첨삭 결과가 캐시되어 있으면 "summary" 단계만 바로 생성됩니다.
+
+        시간 예산(time_budget, 초)을 다 쓰면 남은 단계는 건너뛰고 결과에 `partial`과
+        `pending_stages`를 표시합니다. 건너뛴 단계는 `complete_feedback`으로 마저 실행할 수 있습니다.
+        None이면 관리자 설정의 예산을 사용하고, 0이면 제한하지 않습니다.
+
+        정답이 짧은 객관식/빈칸/단어 문제는 NLP 분석 없이 정답 비교 결과만 바로 생성합니다.
+        """
+        feedback = self._objective_feedback(student_answer, model_answer, problem_type, problem)
+        if feedback is not None:
+            yield "summary", feedback
+            return
+        
+        cache_key = self._feedback_cache_key(student_answer, model_answer, problem_type, problem)
+        if cache_key is not None:
+            cached = self.feedback_cache.get(cache_key)
+            if cached is not None:
+                yield "summary", cached
+                return
+        
+        if time_budget is None:
+            time_budget = self.settings.get_time_budget()
+        for stage, feedback in self._iter_analysis(student_answer, model_answer, problem_type, problem,
+                                                   time_budget=time_budget):
+            yield stage, feedback
+        
+        if cache_key is not None and not feedback.get("partial"):
+            self.feedback_cache.put(cache_key, feedback, problem.get('id'))
+
+    def complete_feedback(self, feedback, student_answer, model_answer, problem_type, problem=None):
+        """시간 예산 때문에 건너뛴 분석 단계를 마저 실행해 완성된 피드백을 반환합니다."""
+        feedback = dict(feedback)
+        stage_names = feedback.pop("pending_stages", [])
+        feedback.pop("partial", None)
+        feedback.pop("completion_job_id", None)
+        for _, feedback in self._iter_analysis(student_answer, model_answer, problem_type, problem,
+                                               feedback=feedback, stage_names=stage_names):
+            pass
+        
+        cache_key = self._feedback_cache_key(student_answer, model_answer, problem_type, problem)
+        if cache_key is not None:
+            self.feedback_cache.put(cache_key, feedback, problem.get('id'))
+        return feedback
+
+    def _objective_feedback(self, student_answer, model_answer, problem_type, problem=None):
+        """객관식 채점 대상이면 정답 비교만으로 만든 피드백을 반환합니다. 아니면 None을 반환합니다.
+
+        단어 문제는 정답과 편집 거리가 가까운 오타를 설정된 거리별 점수로 부분 인정합니다.
+        """
+        matcher = get_objective_matcher(problem_type, model_answer, problem)
+        if matcher is None:
+            return None
+        result = matcher.score(student_answer)
+        score = 100 if result["correct"] else 0
+        if not result["correct"] and problem_type in FUZZY_TYPES:
+            credit = self.settings.get_fuzzy_credit()
+            fuzzy = get_fuzzy_matcher(matcher.answers, len(credit) - 1).score(student_answer, credit)
+            if fuzzy["matched"] is not None:
+                result.update(matched=fuzzy["matched"], distance=fuzzy["distance"])
+                score = fuzzy["credit"]
         feedback = {
-            "overall_score": 0,
+            "overall_score": score,
             "grammar_feedback": [],
             "content_feedback": [],
             "vocabulary_feedback": [],
             "suggestions": [],
             "positive_points": [],
+            "objective_match": result,
             "korean_summary": ""
         }
-        
-        # 문제 유형별 분석
-        if problem_type == "영작문":
-            feedback = self._analyze_writing(student_answer, model_answer, feedback)
-        elif problem_type == "문법":
-            feedback = self._analyze_grammar(student_answer, model_answer, feedback)
-        elif problem_type == "어휘":
-            feedback = self._analyze_vocabulary(student_answer, model_answer, feedback)
+        if result["correct"]:
+            feedback["positive_points"].append("정답입니다.")
+        elif result["matched"] is not None:
+            feedback["vocabulary_feedback"].append({
+                "point": f"철자가 정답과 {result['distance']}글자 다릅니다.",
+                "suggestion": f"정답 철자: {result['matched']}"
+            })
         else:
-            feedback = self._analyze_general(student_answer, model_answer, feedback)
+            feedback["suggestions"].append(f"정답: {' / '.join(result['answers'])}")
+        feedback["korean_summary"] = self._generate_korean_summary(feedback)
+        return feedback
+
+    def _feedback_cache_key(self, student_answer, model_answer, problem_type, problem):
+        """첨삭 결과 캐시 키를 반환합니다. 문제 정보가 없으면 캐시하지 않습니다."""
+        if problem is None:
+            return None
+        stages = [stage.name for stage in self._get_pipeline(problem_type)]
+        return self.feedback_cache.make_key(problem, student_answer, model_answer, problem_type, stages)
+
+    def _get_pipeline(self, problem_type):
+        """문제 유형의 분석 단계 중 켜져 있는 단계를 반환합니다."""
+        return get_pipeline(problem_type, self.settings.get_disabled_stages(problem_type))
+
+    def _iter_analysis(self, student_answer, model_answer, problem_type, problem=None, time_budget=0,
+                       feedback=None, stage_names=None):
+        """분석기를 차례로 실행하며 단계별 피드백을 생성합니다.
+
+        feedback과 stage_names가 주어지면 기존 피드백에 해당 단계만 이어서 실행합니다.
+        """
+        if feedback is None:
+            feedback = {
+                "overall_score": 0,
+                "grammar_feedback": [],
+                "content_feedback": [],
+                "vocabulary_feedback": [],
+                "suggestions": [],
+                "positive_points": [],
+                "korean_summary": ""
+            }
+        stages = self._get_pipeline(problem_type)
+        if stage_names is not None:
+            stages = [stage for stage in stages if stage.name in stage_names]
+        deadline = time.perf_counter() + time_budget if time_budget else None
+        
+        # 문제 유형별 분석 단계를 차례로 실행하고 단계별 실행 시간을 기록합니다.
+        # 답안 파싱은 처음 토큰 정보가 필요한 단계에서 일어나므로 따로 기록합니다.
+        context = StageContext(self, student_answer, model_answer, problem_type, problem, feedback)
+        for i, stage in enumerate(stages):
+            # 예산을 다 쓰면 남은(우선순위가 낮은) 단계는 나중에 처리합니다. 첫 단계는 항상 실행합니다.
+            if deadline is not None and i > 0 and time.perf_counter() >= deadline:
+                feedback["partial"] = True
+                feedback["pending_stages"] = [pending.name for pending in stages[i:]]
+                break
+            start = time.perf_counter()
+            parse_time = context.parse_time
+            stage(self, context)
+            parse_time = context.parse_time - parse_time
+            if parse_time:
+                self.stage_metrics.record(PARSE_STAGE, parse_time)
+            self.stage_metrics.record(stage.name, time.perf_counter() - start - parse_time)
+            yield stage.name, feedback
             
         # 종합 점수 계산
         feedback["overall_score"] = self._calculate_overall_score(feedback)
@@ -36,111 +186,135 @@ class FeedbackGenerator:
         # 한글 요약 생성
         feedback["korean_summary"] = self._generate_korean_summary(feedback)
         
-        return feedback
+        yield "summary", feedback
 
-    def _check_basic_grammar(self, doc):
-        """기본 문법 규칙 검사"""
-        errors = []
-        
-        # 주어-동사 일치 검사
-        for sent in doc.sents:
-            subject = None
-            main_verb = None
-            
-            for token in sent:
-                # 주어 찾기
-                if token.dep_ == "nsubj":
-                    subject = token
-                # 주동사 찾기
-                if token.pos_ == "VERB" and token.dep_ in ["ROOT", "VERB"]:
-                    main_verb = token
-                    
-            if subject and main_verb:
-                # 3인칭 단수 현재형 검사
-                if subject.text.lower() in ["he", "she", "it"] and \
-                   main_verb.tag_ == "VBP":  # base form instead of 3rd person
-                    errors.append({
-                        "error": "주어-동사 불일치",
-                        "context": f"{subject.text} {main_verb.text}",
-                        "suggestion": f"{subject.text} {main_verb.text}s",
-                        "explanation": "3인칭 단수 주어는 동사에 -s를 붙여야 합니다."
-                    })
-        
-        # 관사 사용 검사
-        for token in doc:
-            if token.pos_ == "NOUN" and token.dep_ not in ["compound"]:
-                has_det = any(child.pos_ == "DET" for child in token.children)
-                if not has_det and not token.tag_ == "NNS":  # 복수형이 아닌 경우
-                    errors.append({
-                        "error": "관사 누락",
-                        "context": token.text,
-                        "suggestion": f"a/the {token.text}",
-                        "explanation": "가산명사 단수형 앞에는 관사가 필요합니다."
-                    })
-        
-        return errors
+    def generate_feedback_batch(self, items, batch_size=32, n_process=1):
+        """여러 답안의 피드백을 spaCy `nlp.pipe`로 일괄 생성합니다.
 
-    def _analyze_writing(self, student_answer, model_answer, feedback):
-        """영작문 분석"""
-        student_doc = self.nlp(student_answer)
-        
-        # 기본 문법 오류 검사
-        grammar_errors = self._check_basic_grammar(student_doc)
-        feedback["grammar_feedback"].extend(grammar_errors)
-        
-        # 문장 구조 분석
-        feedback["content_feedback"].extend(self._analyze_sentence_structure(student_doc))
-        
-        # 어휘 다양성 분석
-        feedback["vocabulary_feedback"].extend(self._analyze_vocabulary_diversity(student_doc))
-        
-        # 긍정적인 부분 찾기
-        feedback["positive_points"].extend(self._find_positive_points(student_answer, model_answer))
-        
-        return feedback
+        items는 (학생 답안, 모범 답안, 문제 유형[, 문제]) 튜플 목록이며, 피드백은 입력 순서대로
+        하나씩 생성(yield)됩니다. 진행 상황과 처리량(건/초)은 `batch_stats`에 기록됩니다.
+        """
+        items = list(items)
+        start = time.perf_counter()
+        self.batch_stats = {'total': len(items), 'processed': 0, 'elapsed': 0.0, 'answers_per_sec': 0.0}
 
-    def _analyze_grammar(self, student_answer, model_answer, feedback):
-        """문법 문제 분석"""
-        student_doc = self.nlp(student_answer)
+        # 객관식 답안과 캐시된 첨삭 결과가 있는 답안은 파싱하지 않습니다.
+        problems = [item[3] if len(item) > 3 else None for item in items]
+        cached = [self._objective_feedback(*item[:3], problem) for item, problem in zip(items, problems)]
+        cache_keys = [None if feedback is not None else self._feedback_cache_key(*item[:3], problem)
+                      for item, problem, feedback in zip(items, problems, cached)]
+        cached = [feedback if feedback is not None or key is None else self.feedback_cache.get(key)
+                  for key, feedback in zip(cache_keys, cached)]
+        pending = [item for item, hit in zip(items, cached) if hit is None]
+        
+        # 같은 모범 답안에 대한 답안들의 유사도는 모범 답안별로 한 번에 계산합니다.
+        by_model = {}
+        for item in pending:
+            by_model.setdefault(item[1], []).append(item[0])
+        self._batch_similarity = {}
+        for model_answer, answers in by_model.items():
+            scores = self.similarity.score_batch(answers, model_answer)
+            for answer, score in zip(answers, scores):
+                self._batch_similarity[(answer, model_answer)] = float(score)
+
+        student_docs = iter(self.nlp.pipe((item[0] for item in pending), batch_size=batch_size, n_process=n_process))
+        for item, problem, cache_key, feedback in zip(items, problems, cache_keys, cached):
+            if feedback is None:
+                student_answer, model_answer, problem_type = item[:3]
+                self.doc_cache.put(student_answer, next(student_docs))
+                for _, feedback in self._iter_analysis(student_answer, model_answer, problem_type, problem):
+                    pass
+                if cache_key is not None:
+                    self.feedback_cache.put(cache_key, feedback, problem.get('id'))
+            yield feedback
+
+            elapsed = time.perf_counter() - start
+            self.batch_stats['processed'] += 1
+            self.batch_stats['elapsed'] = round(elapsed, 3)
+            self.batch_stats['answers_per_sec'] = round(self.batch_stats['processed'] / elapsed, 2) if elapsed else 0.0
+        self._batch_similarity = {}
+        self.stage_metrics.save()
+
+    def _answer_similarity(self, student_answer, model_answer):
+        """학생 답안과 모범 답안의 TF-IDF 코사인 유사도를 반환합니다."""
+        score = self._batch_similarity.get((student_answer, model_answer))
+        if score is None:
+            score = self.similarity.similarity(student_answer, model_answer)
+        return score
+
+    def _parse(self, text):
+        """텍스트를 파싱합니다. 이미 파싱한 텍스트는 캐시된 Doc을 반환합니다."""
+        return self.doc_cache.get(text)
+
+    def _features(self, text):
+        """텍스트를 파싱하고 분석기들이 공유하는 토큰 속성 배열을 반환합니다."""
+        return get_token_features(self._parse(text))
+
+    def get_cache_stats(self):
+        """Doc 캐시 통계를 반환합니다."""
+        return self.doc_cache.get_stats()
+
+    def _check_basic_grammar(self, features):
+        """기본 문법 규칙 검사"""
+        errors = []
         
-        # 기본 문법 오류 검사
-        grammar_errors = self._check_basic_grammar(student_doc)
-        feedback["grammar_feedback"].extend(grammar_errors)
+        # 주어-동사 일치 검사 (문장별 마지막 주어와 주동사)
+        subjects = features.last_per_sentence(features.is_in(features.dep, "nsubj"))
+        main_verbs = features.last_per_sentence(
+            features.is_in(features.pos, "VERB") & features.is_in(features.dep, "ROOT", "VERB")
+        )
+        found = (subjects >= 0) & (main_verbs >= 0)
+        subjects, main_verbs = subjects[found], main_verbs[found]
+        # 3인칭 단수 주어에 원형 동사(VBP)를 쓴 경우
+        mismatch = features.is_in(features.lower[subjects], "he", "she", "it") & \
+            features.is_in(features.tag[main_verbs], "VBP")
+        for subject, main_verb in zip(features.texts(subjects[mismatch]), features.texts(main_verbs[mismatch])):
+            errors.append({
+                "error": "주어-동사 불일치",
+                "context": f"{subject} {main_verb}",
+                "suggestion": f"{subject} {main_verb}s",
+                "explanation": "3인칭 단수 주어는 동사에 -s를 붙여야 합니다."
+            })
         
-        # 특정 문법 요소 분석
-        feedback["grammar_feedback"].extend(self._analyze_specific_grammar(student_doc))
+        # 관사 사용 검사 (한정사가 없는 단수 명사)
+        missing_det = features.is_in(features.pos, "NOUN") & ~features.is_in(features.dep, "compound") & \
+            ~features.has_child(features.is_in(features.pos, "DET")) & ~features.is_in(features.tag, "NNS")
+        for text in features.texts(np.flatnonzero(missing_det)):
+            errors.append({
+                "error": "관사 누락",
+                "context": text,
+                "suggestion": f"a/the {text}",
+                "explanation": "가산명사 단수형 앞에는 관사가 필요합니다."
+            })
         
-        return feedback
+        return errors
 
-    def _analyze_vocabulary(self, student_answer, model_answer, feedback):
-        """어휘 문제 분석"""
+    def _analyze_missing_words(self, student_answer, model_answer):
+        """모범 답안에 있으나 학생 답안에 없는 어휘 분석"""
+        feedback = []
         student_words = set(word.lower() for word in student_answer.split())
         model_words = set(word.lower() for word in model_answer.split())
         
         # 누락된 주요 어휘 확인
         missing_words = model_words - student_words
         if missing_words:
-            feedback["vocabulary_feedback"].append({
+            feedback.append({
                 "point": "누락된 주요 어휘",
                 "details": list(missing_words),
                 "suggestion": "다음 단어들을 포함하면 좋았을 것 같습니다."
             })
         
-        # 부적절한 단어 사용 확인
-        student_doc = self.nlp(student_answer)
-        feedback["vocabulary_feedback"].extend(self._analyze_word_choice(student_doc))
-        
         return feedback
 
-    def _analyze_general(self, student_answer, model_answer, feedback):
-        """일반적인 문제 분석"""
-        # 기본적인 비교 분석
+    def _analyze_tone(self, student_answer, model_answer):
+        """글의 어조와 문장 수 비교 (등록된 파이프라인이 없는 문제 유형용)"""
+        feedback = []
         student_blob = TextBlob(student_answer)
         model_blob = TextBlob(model_answer)
         
         # 감정 분석
         if student_blob.sentiment.polarity != model_blob.sentiment.polarity:
-            feedback["content_feedback"].append({
+            feedback.append({
                 "point": "글의 어조",
                 "details": "답안의 전반적인 어조가 모범 답안과 다릅니다.",
                 "suggestion": "글의 목적에 맞는 어조를 사용하세요."
@@ -148,7 +322,7 @@ class FeedbackGenerator:
         
         # 문장 길이 분석
         if len(student_blob.sentences) != len(model_blob.sentences):
-            feedback["content_feedback"].append({
+            feedback.append({
                 "point": "문장 구성",
                 "details": f"모범 답안은 {len(model_blob.sentences)}개의 문장으로 구성되어 있습니다.",
                 "suggestion": "적절한 문장 분할을 고려해보세요."
@@ -156,13 +330,13 @@ class FeedbackGenerator:
         
         return feedback
 
-    def _analyze_sentence_structure(self, doc):
+    def _analyze_sentence_structure(self, features):
         """문장 구조 분석"""
         feedback = []
         
         # 문장 길이 분석
-        sent_lengths = [len(sent) for sent in doc.sents]
-        avg_length = sum(sent_lengths) / len(sent_lengths) if sent_lengths else 0
+        sent_lengths = features.sentence_lengths()
+        avg_length = sent_lengths.mean() if len(sent_lengths) else 0
         
         if avg_length > 30:
             feedback.append({
@@ -171,13 +345,10 @@ class FeedbackGenerator:
                 "suggestion": "긴 문장을 여러 개의 짧은 문장으로 나누어 보세요."
             })
         
-        # 구조 다양성 분석
-        sentence_starts = []
-        for sent in doc.sents:
-            first_token = next(sent.iter_tokens())
-            sentence_starts.append(first_token.pos_)
+        # 구조 다양성 분석 (문장 첫 단어의 품사 종류)
+        sentence_starts = features.pos[features.sent_starts]
         
-        if len(set(sentence_starts)) < 2:
+        if len(np.unique(sentence_starts)) < 2:
             feedback.append({
                 "point": "문장 구조 다양성",
                 "details": "비슷한 구조의 문장이 반복됩니다.",
@@ -186,16 +357,15 @@ class FeedbackGenerator:
         
         return feedback
 
-    def _analyze_vocabulary_diversity(self, doc):
+    def _analyze_vocabulary_diversity(self, features):
         """어휘 다양성 분석"""
         feedback = []
         
         # 어휘 다양성 계산
-        words = [token.text.lower() for token in doc if token.is_alpha]
-        unique_words = set(words)
+        words = features.lower[features.is_alpha]
         
         if len(words) > 0:
-            diversity_ratio = len(unique_words) / len(words)
+            diversity_ratio = len(np.unique(words)) / len(words)
             
             if diversity_ratio < 0.4:  # 40% 미만의 어휘 다양성
                 feedback.append({
@@ -204,11 +374,8 @@ class FeedbackGenerator:
                     "suggestion": "유의어를 활용하여 더 다양한 표현을 시도해보세요."
                 })
         
-        # 고급 어휘 사용 분석
-        advanced_words = 0
-        for token in doc:
-            if token.is_alpha and len(token.text) > 8:  # 8글자 이상의 단어를 고급 어휘로 간주
-                advanced_words += 1
+        # 고급 어휘 사용 분석 (B2 이상, 사전에 없는 단어는 8글자 초과를 고급 어휘로 간주)
+        advanced_words = np.count_nonzero(self.lexicon.advanced_mask(features))
         
         if len(words) > 0 and advanced_words / len(words) < 0.1:  # 고급 어휘 비율 10% 미만
             feedback.append({
@@ -219,22 +386,20 @@ class FeedbackGenerator:
         
         return feedback
 
-    def _analyze_word_choice(self, doc):
+    def _analyze_word_choice(self, features):
         """단어 선택 분석"""
         feedback = []
         
         # 자주 사용되는 기초 동사 목록
-        basic_verbs = {"be", "have", "do", "make", "get", "go", "take", "come", "see", "know"}
+        basic_verbs = ["be", "have", "do", "make", "get", "go", "take", "come", "see", "know"]
         
         # 기초 동사 사용 빈도 분석
-        basic_verb_count = 0
-        total_verbs = 0
-        
-        for token in doc:
-            if token.pos_ == "VERB":
-                total_verbs += 1
-                if token.lemma_.lower() in basic_verbs:
-                    basic_verb_count += 1
+        verbs = features.is_in(features.pos, "VERB")
+        total_verbs = np.count_nonzero(verbs)
+        lemmas = features.lemma[verbs]
+        basic_verb_count = np.count_nonzero(
+            features.is_in(lemmas, *basic_verbs, *(verb.capitalize() for verb in basic_verbs))
+        )
         
         if total_verbs > 0 and basic_verb_count / total_verbs > 0.6:  # 기초 동사 비율 60% 초과
             feedback.append({
@@ -243,31 +408,26 @@ class FeedbackGenerator:
                 "suggestion": "더 구체적이고 상황에 맞는 동사를 사용해보세요."
             })
         
-        # 부적절한 단어 조합 분석
-        for i in range(len(doc) - 1):
-            token = doc[i]
-            next_token = doc[i + 1]
-            
-            if token.pos_ == "ADJ" and next_token.pos_ == "ADJ":
-                feedback.append({
-                    "point": "형용사 중복",
-                    "details": f"'{token.text} {next_token.text}'와 같이 형용사가 연속으로 사용되었습니다.",
-                    "suggestion": "더 자연스러운 표현으로 수정해보세요."
-                })
+        # 부적절한 단어 조합 분석 (연속된 형용사)
+        adjectives = features.is_in(features.pos, "ADJ")
+        for i in np.flatnonzero(adjectives[:-1] & adjectives[1:]):
+            first, second = features.texts([i, i + 1])
+            feedback.append({
+                "point": "형용사 중복",
+                "details": f"'{first} {second}'와 같이 형용사가 연속으로 사용되었습니다.",
+                "suggestion": "더 자연스러운 표현으로 수정해보세요."
+            })
         
         return feedback
 
-    def _analyze_specific_grammar(self, doc):
+    def _analyze_specific_grammar(self, features):
         """특정 문법 요소 분석"""
         feedback = []
         
         # 시제 일관성 검사
-        tenses = []
-        for token in doc:
-            if token.pos_ == "VERB" and token.morph.get("Tense"):
-                tenses.extend(token.morph.get("Tense"))
+        tenses = features.morph_values(features.is_in(features.pos, "VERB"), "Tense")
         
-        if len(set(tenses)) > 1:
+        if len(tenses) > 1:
             feedback.append({
                 "point": "시제 일관성",
                 "details": "문장 내에서 시제가 일관되지 않습니다.",
@@ -276,34 +436,35 @@ class FeedbackGenerator:
         
         return feedback
 
-    def _find_positive_points(self, student_answer, model_answer):
+    def _find_positive_points(self, student_features, model_answer, grammar_errors=None):
         """긍정적인 부분 찾기"""
         positive_points = []
         
         # 문장 길이의 적절성 평가
-        student_sents = [sent.string.strip() for sent in self.nlp(student_answer).sents]
-        if all(10 <= len(sent.split()) <= 25 for sent in student_sents):
+        word_counts = student_features.sentence_word_counts()
+        if np.all((word_counts >= 10) & (word_counts <= 25)):
             positive_points.append("문장의 길이가 적절하여 읽기 쉽습니다.")
         
         # 고급 어휘 사용 평가
-        student_doc = self.nlp(student_answer)
-        advanced_words = [token.text for token in student_doc if token.is_alpha and len(token.text) > 8]
+        advanced_words = student_features.texts(
+            np.flatnonzero(self.lexicon.advanced_mask(student_features))[:3]
+        )
         if advanced_words:
             positive_points.append(f"'{', '.join(advanced_words[:3])}' 등의 고급 어휘를 적절히 사용했습니다.")
         
         # 문법적 정확성 평가
-        grammar_errors = self._check_basic_grammar(self.nlp(student_answer))
+        if grammar_errors is None:
+            grammar_errors = self._check_basic_grammar(student_features)
         if len(grammar_errors) <= 2:
             positive_points.append("전반적으로 문법이 정확합니다.")
         
         # 모범 답안과의 유사도 평가
-        student_doc = self.nlp(student_answer)
-        model_doc = self.nlp(model_answer)
-        similarity = student_doc.similarity(model_doc)
+        # (n-gram TF-IDF 코사인 유사도는 단어 벡터 유사도보다 낮게 나오므로 기준을 낮춰 적용합니다)
+        similarity = self._answer_similarity(student_features.doc.text, model_answer)
         
-        if similarity > 0.8:
+        if similarity > 0.6:
             positive_points.append("모범 답안의 핵심 내용을 잘 반영했습니다.")
-        elif similarity > 0.6:
+        elif similarity > 0.35:
             positive_points.append("주요 내용을 적절히 포함하고 있습니다.")
         
         return positive_points
@@ -325,6 +486,10 @@ class FeedbackGenerator:
         content_deduction = len(feedback["content_feedback"]) * 5
         score -= min(content_deduction, 30)  # 최대 30점 감점
         
+        # 핵심 단어 누락 비율만큼 감점
+        if "keyword_matches" in feedback:
+            score -= round((1 - feedback["keyword_matches"]["coverage"]) * 20)  # 최대 20점 감점
+        
         # 긍정적인 부분당 가점
         positive_points = len(feedback["positive_points"]) * 2
         score += min(positive_points, 10)  # 최대 10점 가점
@@ -333,45 +498,75 @@ class FeedbackGenerator:
 
     def _generate_korean_summary(self, feedback):
         """한글 요약 생성"""
-        summary = []
-        
-        # 전체 평가 요약
+        return format_feedback_summary(feedback)
+
+
+def format_feedback_summary(feedback, include_score=True):
+    """피드백을 한글 요약 문자열로 만듭니다.
+
+    분석이 진행 중인 부분 피드백은 종합 점수가 아직 계산되지 않았으므로
+    `include_score=False`로 점수 없이 완료된 항목만 요약합니다.
+    """
+    summary = []
+    
+    # 전체 평가 요약
+    if include_score:
         summary.append(f"📊 종합 점수: {feedback['overall_score']}점")
-        
-        # 긍정적인 부분
-        if feedback["positive_points"]:
-            summary.append("\n💪 잘한 점:")
-            for point in feedback["positive_points"]:
-                summary.append(f"- {point}")
-        
-        # 문법 피드백
-        if feedback["grammar_feedback"]:
-            summary.append("\n📝 문법 관련 의견:")
-            for error in feedback["grammar_feedback"][:3]:  # 주요 오류 3개만
-                summary.append(f"- {error['error']}")
-                if 'suggestion' in error:
-                    summary.append(f"  → 제안: {error['suggestion']}")
-        
-        # 어휘 피드백
-        if feedback["vocabulary_feedback"]:
-            summary.append("\n📚 어휘 관련 의견:")
-            for feedback_item in feedback["vocabulary_feedback"]:
-                summary.append(f"- {feedback_item['point']}")
-                if 'suggestion' in feedback_item:
-                    summary.append(f"  → 제안: {feedback_item['suggestion']}")
-        
-        # 내용 피드백
-        if feedback["content_feedback"]:
-            summary.append("\n💡 내용 관련 의견:")
-            for feedback_item in feedback["content_feedback"]:
-                summary.append(f"- {feedback_item['point']}")
-                if 'suggestion' in feedback_item:
-                    summary.append(f"  → 제안: {feedback_item['suggestion']}")
-        
-        # 전체적인 제안
-        if feedback["suggestions"]:
-            summary.append("\n✨ 향상을 위한 제안:")
-            for suggestion in feedback["suggestions"]:
-                summary.append(f"- {suggestion}")
-        
-        return "\n".join(summary) 
\ No newline at end of file
+    
+    # 시간 예산 때문에 미뤄진 분석
+    if feedback.get("partial"):
+        labels = [STAGE_REGISTRY[name].label if name in STAGE_REGISTRY else name
+                  for name in feedback.get("pending_stages", [])]
+        summary.append(f"\n⏳ 일부 분석({', '.join(labels)})은 아직 진행 중이며, 완료되면 결과가 갱신됩니다.")
+    
+    # 핵심 단어
+    if feedback.get("keyword_matches"):
+        matches = feedback["keyword_matches"]
+        summary.append(f"\n🔑 핵심 단어: {len(matches['matched'])}/{len(matches['matched']) + len(matches['missing'])}개 포함")
+        if matches["matched"]:
+            summary.append(f"- 포함: {', '.join(matches['matched'])}")
+        if matches["missing"]:
+            summary.append(f"- 누락: {', '.join(matches['missing'])}")
+    
+    # 어휘 수준 분포
+    if feedback.get("vocabulary_levels"):
+        levels = " · ".join(f"{level} {ratio:.0%}" for level, ratio in feedback["vocabulary_levels"].items())
+        summary.append(f"\n📈 어휘 수준 분포: {levels}")
+    
+    # 긍정적인 부분
+    if feedback["positive_points"]:
+        summary.append("\n💪 잘한 점:")
+        for point in feedback["positive_points"]:
+            summary.append(f"- {point}")
+    
+    # 문법 피드백
+    if feedback["grammar_feedback"]:
+        summary.append("\n📝 문법 관련 의견:")
+        for error in feedback["grammar_feedback"][:3]:  # 주요 오류 3개만
+            summary.append(f"- {error['error']}")
+            if 'suggestion' in error:
+                summary.append(f"  → 제안: {error['suggestion']}")
+    
+    # 어휘 피드백
+    if feedback["vocabulary_feedback"]:
+        summary.append("\n📚 어휘 관련 의견:")
+        for feedback_item in feedback["vocabulary_feedback"]:
+            summary.append(f"- {feedback_item['point']}")
+            if 'suggestion' in feedback_item:
+                summary.append(f"  → 제안: {feedback_item['suggestion']}")
+    
+    # 내용 피드백
+    if feedback["content_feedback"]:
+        summary.append("\n💡 내용 관련 의견:")
+        for feedback_item in feedback["content_feedback"]:
+            summary.append(f"- {feedback_item['point']}")
+            if 'suggestion' in feedback_item:
+                summary.append(f"  → 제안: {feedback_item['suggestion']}")
+    
+    # 전체적인 제안
+    if feedback["suggestions"]:
+        summary.append("\n✨ 향상을 위한 제안:")
+        for suggestion in feedback["suggestions"]:
+            summary.append(f"- {suggestion}")
+    
+    return "\n".join(summary) 
\ No newline at end of file
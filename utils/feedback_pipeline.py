@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.fuzzy_matcher import DEFAULT_FUZZY_CREDIT
+from utils.keyword_matcher import get_keyword_matcher
+
+
+class Stage:
+    """첨삭 분석 단계 하나 (이름, 화면 표시 이름, 우선순위, 실행 함수)
+
+    우선순위 값이 작은 단계부터 실행되므로, 시간 예산이 부족하면 우선순위가 낮은 단계가 미뤄집니다.
+    """
+
+    def __init__(self, name: str, label: str, func: Callable, priority: int = 50):
+        self.name = name
+        self.label = label
+        self.func = func
+        self.priority = priority
+
+    def __call__(self, generator, context):
+        return self.func(generator, context)
+
+
+STAGE_REGISTRY: Dict[str, Stage] = {}
+# 단계 실행 시간과 별도로 기록하는 spaCy 파싱 시간
+PARSE_STAGE = "parse"
+
+
+def register_stage(name: str, label: str, priority: int = 50):
+    """분석 단계를 등록하는 데코레이터입니다. 함수는 (첨삭 생성기, 단계 문맥)을 인자로 받습니다."""
+    def decorator(func):
+        STAGE_REGISTRY[name] = Stage(name, label, func, priority)
+        return func
+    return decorator
+
+
+class StageContext:
+    """한 답안을 분석하는 동안 단계들이 공유하는 입력과 중간 결과입니다."""
+
+    def __init__(self, generator, student_answer: str, model_answer: str, problem_type: str,
+                 problem: Optional[Dict], feedback: Dict):
+        self.generator = generator
+        self.student_answer = student_answer
+        self.model_answer = model_answer
+        self.problem_type = problem_type
+        self.problem = problem
+        self.feedback = feedback
+        self.grammar_errors = None
+        self.parse_time = 0.0
+        self._features = None
+
+    @property
+    def features(self):
+        """학생 답안의 토큰 속성 배열 (처음 필요한 단계에서 파싱합니다)"""
+        if self._features is None:
+            start = time.perf_counter()
+            self._features = self.generator._features(self.student_answer)
+            self.parse_time = time.perf_counter() - start
+        return self._features
+
+
+@register_stage("keywords", "핵심 단어", priority=0)
+def keyword_stage(generator, context):
+    keyword_matcher = get_keyword_matcher(context.problem)
+    if keyword_matcher is None:
+        return
+    matches = keyword_matcher.score(context.student_answer)
+    context.feedback["keyword_matches"] = matches
+    if matches["missing"]:
+        context.feedback["suggestions"].append(f"다음 핵심 단어를 답안에 포함해보세요: {', '.join(matches['missing'])}")
+
+
+@register_stage("grammar", "기본 문법", priority=10)
+def grammar_stage(generator, context):
+    context.grammar_errors = generator._check_basic_grammar(context.features)
+    context.feedback["grammar_feedback"].extend(context.grammar_errors)
+
+
+@register_stage("specific_grammar", "시제 일관성", priority=20)
+def specific_grammar_stage(generator, context):
+    context.feedback["grammar_feedback"].extend(generator._analyze_specific_grammar(context.features))
+
+
+@register_stage("vocabulary_diversity", "어휘 다양성", priority=20)
+def vocabulary_diversity_stage(generator, context):
+    context.feedback["vocabulary_feedback"].extend(generator._analyze_vocabulary_diversity(context.features))
+    context.feedback["vocabulary_levels"] = generator.lexicon.level_distribution(context.features)
+
+
+@register_stage("missing_words", "누락 어휘", priority=10)
+def missing_words_stage(generator, context):
+    context.feedback["vocabulary_feedback"].extend(
+        generator._analyze_missing_words(context.student_answer, context.model_answer)
+    )
+
+
+@register_stage("word_choice", "단어 선택", priority=20)
+def word_choice_stage(generator, context):
+    context.feedback["vocabulary_feedback"].extend(generator._analyze_word_choice(context.features))
+
+
+@register_stage("sentence_structure", "문장 구조", priority=30)
+def sentence_structure_stage(generator, context):
+    context.feedback["content_feedback"].extend(generator._analyze_sentence_structure(context.features))
+
+
+@register_stage("tone", "어조/문장 수", priority=30)
+def tone_stage(generator, context):
+    context.feedback["content_feedback"].extend(generator._analyze_tone(context.student_answer, context.model_answer))
+
+
+@register_stage("positives", "잘한 점/유사도", priority=40)
+def positives_stage(generator, context):
+    context.feedback["positive_points"].extend(
+        generator._find_positive_points(context.features, context.model_answer, context.grammar_errors)
+    )
+
+
+# 문제 유형별 분석 단계 (실행 순서는 단계 우선순위를 따릅니다)
+WRITING_PIPELINE = ["keywords", "grammar", "vocabulary_diversity", "sentence_structure", "positives"]
+VOCABULARY_PIPELINE = ["keywords", "missing_words", "word_choice"]
+PIPELINES = {
+    "영작문": WRITING_PIPELINE,
+    "작문": WRITING_PIPELINE,
+    "문법": ["keywords", "grammar", "specific_grammar"],
+    "어휘": VOCABULARY_PIPELINE,
+    "단어": VOCABULARY_PIPELINE,
+    "독해": ["keywords", "missing_words", "positives"],
+    "회화": ["keywords", "grammar", "word_choice", "positives"],
+}
+DEFAULT_PIPELINE = ["keywords", "tone"]
+# 끌 수 없는 분석 단계 (모든 단계를 끄면 감점이 없어 모든 답안이 100점이 됩니다)
+REQUIRED_STAGES = ("keywords",)
+
+
+def get_pipeline_stage_names(problem_type: str) -> List[str]:
+    """문제 유형에 등록된 분석 단계 이름 목록을 반환합니다."""
+    return list(PIPELINES.get(problem_type, DEFAULT_PIPELINE))
+
+
+def get_pipeline(problem_type: str, disabled: Optional[List[str]] = None) -> List[Stage]:
+    """문제 유형의 분석 단계 중 사용하도록 설정된 단계를 우선순위 순서로 반환합니다. 필수 단계는 항상 포함합니다."""
+    disabled = set(disabled or []) - set(REQUIRED_STAGES)
+    stages = [STAGE_REGISTRY[name] for name in get_pipeline_stage_names(problem_type) if name not in disabled]
+    return sorted(stages, key=lambda stage: stage.priority)
+
+
+# 첨삭 한 건에 쓰는 기본 시간 예산(초). 0이면 제한하지 않습니다.
+DEFAULT_TIME_BUDGET = 3.0
+
+
+class FeedbackSettings:
+    """첨삭 파이프라인 설정(`data/feedback_settings.json`)을 관리합니다.
+
+    문제 유형별로 끈 분석 단계(disabled_stages), 첨삭 한 건의 시간 예산(time_budget, 초),
+    단어 문제 오타의 편집 거리별 점수(fuzzy_credit)를 저장하며,
+    파일이 다른 프로세스(관리자 페이지)에서 바뀌면 다음 조회 시 다시 읽습니다.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.settings_file = self.data_dir / "feedback_settings.json"
+        self._settings = None
+        self._loaded_mtime = None
+
+    def get(self) -> Dict:
+        mtime = self.settings_file.stat().st_mtime_ns if self.settings_file.exists() else None
+        if self._settings is None or mtime != self._loaded_mtime:
+            self._settings = {
+                'disabled_stages': {},
+                'time_budget': DEFAULT_TIME_BUDGET,
+                'fuzzy_credit': list(DEFAULT_FUZZY_CREDIT)
+            }
+            if mtime is not None:
+                try:
+                    with open(self.settings_file, 'r', encoding='utf-8') as f:
+                        self._settings.update(json.load(f))
+                except Exception as e:
+                    print(f"첨삭 설정 로드 중 오류 발생: {str(e)}")
+            self._loaded_mtime = mtime
+        return self._settings
+
+    def get_disabled_stages(self, problem_type: str) -> List[str]:
+        """문제 유형에서 끈 분석 단계 목록을 반환합니다."""
+        return self.get()['disabled_stages'].get(problem_type, [])
+
+    def get_time_budget(self) -> float:
+        """첨삭 한 건의 시간 예산(초)을 반환합니다. 0이면 제한하지 않습니다."""
+        return float(self.get().get('time_budget') or 0)
+
+    def get_fuzzy_credit(self) -> List[int]:
+        """편집 거리(0, 1, 2, …)별 점수 목록을 반환합니다. 목록 길이 - 1이 허용하는 최대 편집 거리입니다."""
+        return [int(credit) for credit in self.get().get('fuzzy_credit') or [100]]
+
+    def update(self, **changes) -> bool:
+        """설정을 변경해 저장합니다."""
+        try:
+            settings = dict(self.get(), **changes)
+            with open(self.settings_file, 'w', encoding='utf-8') as f:
+                json.dump(settings, f, ensure_ascii=False, indent=2)
+            self._settings = settings
+            self._loaded_mtime = self.settings_file.stat().st_mtime_ns
+            return True
+        except Exception as e:
+            print(f"첨삭 설정 저장 중 오류 발생: {str(e)}")
+            return False
+
+
+class StageMetrics:
+    """분석 단계별 최근 실행 시간을 모아 p50/p95를 계산합니다.
+
+    작업자 스레드들이 함께 기록하므로 잠금으로 보호하며, `save()` 시
+    `data/stage_timings.json`에 저장해 재시작 후에도 최근 기록을 유지합니다.
+    """
+
+    def __init__(self, data_dir: str = "data", window: int = 500):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.timings_file = self.data_dir / "stage_timings.json"
+        self.window = window
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.timings_file.exists():
+            try:
+                with open(self.timings_file, 'r', encoding='utf-8') as f:
+                    for stage, values in json.load(f).items():
+                        self._timings[stage] = deque(values, maxlen=self.window)
+            except Exception as e:
+                print(f"단계별 실행 시간 로드 중 오류 발생: {str(e)}")
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._timings.setdefault(stage, deque(maxlen=self.window)).append(round(seconds, 6))
+
+    def save(self):
+        with self._lock:
+            timings = {stage: list(values) for stage, values in self._timings.items()}
+            with open(self.timings_file, 'w', encoding='utf-8') as f:
+                json.dump(timings, f)
+
+    def get_summary(self) -> List[Dict]:
+        """단계별 실행 횟수와 평균/p50/p95 시간(밀리초)을 반환합니다. 평균이 긴 단계부터 정렬됩니다."""
+        with self._lock:
+            timings = {stage: np.array(values) for stage, values in self._timings.items() if values}
+        summary = []
+        for stage, values in timings.items():
+            values = values * 1000
+            summary.append({
+                'stage': stage,
+                'label': STAGE_REGISTRY[stage].label if stage in STAGE_REGISTRY else "파싱" if stage == PARSE_STAGE else stage,
+                'count': len(values),
+                'mean_ms': round(float(values.mean()), 2),
+                'p50_ms': round(float(np.percentile(values, 50)), 2),
+                'p95_ms': round(float(np.percentile(values, 95)), 2)
+            })
+        return sorted(summary, key=lambda row: row['mean_ms'], reverse=True)
+
+
+_stage_metrics = None
+_stage_metrics_lock = threading.Lock()
+
+
+def get_stage_metrics(data_dir: str = "data") -> StageMetrics:
+    """프로세스에서 공유하는 단계별 실행 시간 기록을 반환합니다."""
+    global _stage_metrics
+    if _stage_metrics is None:
+        with _stage_metrics_lock:
+            if _stage_metrics is None:
+                _stage_metrics = StageMetrics(data_dir)
+    return _stage_metrics
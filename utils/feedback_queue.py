@@ -0,0 +1,316 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+_queue = None
+_queue_lock = threading.Lock()
+
+# 처리 중인 작업의 생존 신호를 갱신하는 간격과, 신호가 이 시간 동안 없으면 다시 대기 상태로 돌리는 기준(초)
+HEARTBEAT_INTERVAL = 5
+STALE_JOB_SECONDS = 60
+
+
+def _process_alive(pid: int) -> bool:
+    """같은 호스트의 프로세스가 살아 있는지 확인합니다. 확인할 수 없으면 살아 있다고 봅니다."""
+    if os.name == 'nt':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class FeedbackJobQueue:
+    """첨삭 생성 작업을 SQLite에 저장하고 백그라운드 작업자가 처리하는 큐입니다.
+
+    제출 시에는 작업만 등록하고 바로 반환하며, 작업자 스레드가 피드백을 생성해
+    과제 기록(점수, 피드백)에 반영합니다. 작업은 파일에 저장되며, 처리 중인 작업에는 맡은 프로세스
+    (호스트:pid)와 생존 신호 시각을 기록합니다. 맡은 프로세스가 종료되었거나 생존 신호가 끊긴 작업만
+    다시 대기 상태로 돌아가므로, 여러 서버 프로세스가 같은 큐를 써도 작업이 두 번 처리되지 않습니다.
+    """
+
+    def __init__(self, data_dir: str = "data", workers: int = 2, poll_interval: float = 0.5):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.db_file = self.data_dir / "feedback_jobs.db"
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads = []
+        self._heartbeat_thread = None
+        self._stop = threading.Event()
+        # 작업자 스레드마다 첨삭 생성기(Doc 캐시)를 따로 둡니다. spaCy 모델은 공유됩니다.
+        self._local = threading.local()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        """작업 테이블을 생성합니다."""
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    assignment_id TEXT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    partial TEXT,
+                    stage TEXT,
+                    error TEXT,
+                    enqueued_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner TEXT,
+                    heartbeat REAL
+                )
+            """)
+            # 단계별 중간 결과, 처리 프로세스 열이 없던 이전 데이터베이스에 열을 추가합니다.
+            columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (('partial', 'TEXT'), ('stage', 'TEXT'), ('owner', 'TEXT'), ('heartbeat', 'REAL')):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, enqueued_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_assignment ON jobs (assignment_id)")
+
+    def enqueue(self, assignment_id: Optional[str], student_answer: str, model_answer: str,
+                problem_type: str, problem: Optional[Dict] = None, partial_feedback: Optional[Dict] = None) -> str:
+        """첨삭 작업을 등록하고 작업 ID를 반환합니다.
+
+        partial_feedback이 주어지면 시간 예산 때문에 미뤄진 분석 단계를 마저 실행하는 작업이 됩니다.
+        """
+        job_id = str(uuid.uuid4())
+        payload = {
+            'student_answer': student_answer,
+            'model_answer': model_answer,
+            'problem_type': problem_type,
+            'problem': problem,
+            'partial_feedback': partial_feedback
+        }
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, assignment_id, payload, status, enqueued_at) VALUES (?, ?, ?, 'pending', ?)",
+                (job_id, assignment_id, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """작업 상태와 결과를 반환합니다. 처리 중이면 지금까지 완료된 단계의 결과(partial)도 포함합니다."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['partial'] = json.loads(job['partial']) if job['partial'] else None
+        if job['status'] == 'pending':
+            job['position'] = self._position(job['enqueued_at'])
+        return job
+
+    def _position(self, enqueued_at: float) -> int:
+        """대기 중인 작업의 순번(앞에 있는 작업 수 + 1)을 반환합니다."""
+        with self._connect() as connection:
+            ahead = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'pending' AND enqueued_at < ?", (enqueued_at,)
+            ).fetchone()[0]
+        return ahead + 1
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """가장 오래된 대기 작업 하나를 처리 중 상태로 바꾸고 반환합니다."""
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY enqueued_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, owner = ?, heartbeat = ? WHERE id = ?",
+                    (now, self.owner, now, row['id'])
+                )
+            connection.execute("COMMIT")
+        return row
+
+    def _finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                ('failed' if error else 'done',
+                 json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+
+    def _update_partial(self, job_id: str, stage: str, feedback: Dict):
+        """분석 단계가 끝날 때마다 중간 결과를 기록합니다."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET partial = ?, stage = ?, heartbeat = ? WHERE id = ?",
+                (json.dumps(feedback, ensure_ascii=False), stage, time.time(), job_id)
+            )
+
+    def _get_feedback_generator(self):
+        if not hasattr(self._local, 'feedback_generator'):
+            from utils.feedback_generator import FeedbackGenerator
+            self._local.feedback_generator = FeedbackGenerator()
+        return self._local.feedback_generator
+
+    def process_job(self, row) -> Dict:
+        """작업 하나를 처리하고 결과를 과제 기록에 반영합니다."""
+        payload = json.loads(row['payload'])
+        feedback_generator = self._get_feedback_generator()
+        args = (payload['student_answer'], payload['model_answer'], payload['problem_type'])
+        if payload.get('partial_feedback') is not None:
+            feedback = feedback_generator.complete_feedback(
+                payload['partial_feedback'], *args, problem=payload.get('problem')
+            )
+        else:
+            for stage, feedback in feedback_generator.iter_feedback(*args, problem=payload.get('problem')):
+                if stage != 'summary':
+                    self._update_partial(row['id'], stage, feedback)
+            # 시간 예산을 넘겨 미뤄진 단계는 별도 작업으로 이어서 처리합니다.
+            if feedback.get('partial'):
+                feedback['completion_job_id'] = self.enqueue(
+                    row['assignment_id'], *args, problem=payload.get('problem'), partial_feedback=feedback
+                )
+        feedback_generator.stage_metrics.save()
+        if row['assignment_id']:
+            from utils.student_manager import StudentManager
+            # StudentManager가 파일 잠금 안에서 최신 과제 기록에 결과를 반영하므로
+            # 페이지가 가진 다른 인스턴스와 동시에 저장해도 결과가 사라지지 않습니다.
+            StudentManager().grade_assignment(row['assignment_id'], feedback['overall_score'], feedback)
+        return feedback
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.OperationalError:
+                row = None
+            if row is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            try:
+                self._finish(row['id'], result=self.process_job(row))
+            except Exception as e:
+                print(f"첨삭 작업 처리 중 오류 발생: {str(e)}")
+                self._finish(row['id'], error=str(e))
+
+    def _is_abandoned(self, owner: Optional[str], heartbeat: Optional[float], now: float,
+                      restarting: bool = False) -> bool:
+        """처리 중인 작업을 맡은 프로세스가 종료되었거나 생존 신호가 끊겼는지 확인합니다."""
+        if not owner or heartbeat is None or now - heartbeat > STALE_JOB_SECONDS:
+            return True
+        if owner == self.owner:
+            # 작업자를 시작하기 전에 이 프로세스 이름으로 남은 작업은 이전 실행(같은 pid)의 것입니다.
+            return restarting
+        host, _, pid = owner.rpartition(':')
+        return host == socket.gethostname() and pid.isdigit() and not _process_alive(int(pid))
+
+    def requeue_abandoned(self, restarting: bool = False) -> int:
+        """맡은 프로세스가 없어진 처리 중 작업을 다시 대기 상태로 돌리고 그 수를 반환합니다."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute("SELECT id, owner, heartbeat FROM jobs WHERE status = 'running'").fetchall()
+            abandoned = [(row['id'],) for row in rows
+                         if self._is_abandoned(row['owner'], row['heartbeat'], now, restarting)]
+            connection.executemany(
+                "UPDATE jobs SET status = 'pending', started_at = NULL, partial = NULL, stage = NULL, "
+                "owner = NULL, heartbeat = NULL WHERE id = ? AND status = 'running'", abandoned
+            )
+            connection.execute("COMMIT")
+        return len(abandoned)
+
+    def _heartbeat_loop(self):
+        """이 프로세스가 처리 중인 작업의 생존 신호를 갱신하고, 버려진 작업을 다시 대기 상태로 돌립니다."""
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                with self._connect() as connection:
+                    connection.execute(
+                        "UPDATE jobs SET heartbeat = ? WHERE status = 'running' AND owner = ?",
+                        (time.time(), self.owner)
+                    )
+                self.requeue_abandoned()
+            except sqlite3.OperationalError as e:
+                print(f"첨삭 작업 생존 신호 갱신 중 오류 발생: {str(e)}")
+
+    def start(self):
+        """작업자 스레드를 시작합니다. 종료된 프로세스가 처리하던 작업은 다시 대기 상태로 돌립니다."""
+        if self._heartbeat_thread is not None:
+            return
+        self.requeue_abandoned(restarting=True)
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="feedback-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"feedback-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """작업자 스레드를 멈춥니다."""
+        self._stop.set()
+        for thread in self._threads + [self._heartbeat_thread]:
+            if thread is not None:
+                thread.join()
+        self._threads = []
+        self._heartbeat_thread = None
+        self._stop.clear()
+
+    def get_metrics(self, window: int = 200) -> Dict:
+        """대기 작업 수와 최근 작업의 지연 시간 통계를 반환합니다."""
+        with self._connect() as connection:
+            counts = dict(connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            recent = connection.execute(
+                "SELECT enqueued_at, started_at, finished_at FROM jobs "
+                "WHERE status = 'done' ORDER BY finished_at DESC LIMIT ?", (window,)
+            ).fetchall()
+
+        metrics = {
+            'queue_depth': counts.get('pending', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'workers': len(self._threads)
+        }
+        if recent:
+            times = np.array([[r['enqueued_at'], r['started_at'], r['finished_at']] for r in recent], dtype=np.float64)
+            latency = times[:, 2] - times[:, 0]
+            wait = times[:, 1] - times[:, 0]
+            metrics.update({
+                'latency_avg': round(float(latency.mean()), 3),
+                'latency_p50': round(float(np.percentile(latency, 50)), 3),
+                'latency_p95': round(float(np.percentile(latency, 95)), 3),
+                'wait_avg': round(float(wait.mean()), 3)
+            })
+        return metrics
+
+
+def get_feedback_queue(data_dir: str = "data", workers: int = 2) -> FeedbackJobQueue:
+    """프로세스에서 공유하는 첨삭 작업 큐를 반환합니다. 처음 호출 시 작업자를 시작합니다."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = FeedbackJobQueue(data_dir, workers)
+                _queue.start()
+    return _queue
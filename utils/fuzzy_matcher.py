@@ -0,0 +1,124 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.objective_matcher import normalize_objective_answer
+
+# 오타를 부분 점수로 인정하는 문제 유형 (문법 문제는 틀린 형태 자체가 오답이므로 제외합니다)
+FUZZY_TYPES = {"어휘", "단어", "빈칸"}
+# 편집 거리별 기본 점수 (0은 정답, 목록 길이 - 1이 허용하는 최대 편집 거리)
+DEFAULT_FUZZY_CREDIT = [100, 70, 40]
+# 정답 길이 몇 글자당 편집 거리 1을 허용할지 (짧은 단어는 오타 한 글자로도 다른 단어가 됩니다)
+CHARS_PER_EDIT = 4
+
+
+def bounded_levenshtein(a: str, b: str, bound: int) -> int:
+    """두 문자열의 편집 거리를 반환합니다. 거리가 bound를 넘으면 계산을 멈추고 bound + 1을 반환합니다."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+
+def allowed_distance(answer: str, max_distance: int) -> int:
+    """정답 길이에 따라 허용하는 최대 편집 거리를 반환합니다."""
+    return min(max_distance, len(answer) // CHARS_PER_EDIT)
+
+
+class _Node:
+    __slots__ = ('word', 'children')
+
+    def __init__(self, word: str):
+        self.word = word
+        self.children = {}
+
+
+class FuzzyMatcher:
+    """문제의 허용 답안을 BK-tree로 컴파일해 오타가 있는 답안에 가장 가까운 정답을 찾습니다.
+
+    BK-tree는 편집 거리의 삼각 부등식을 이용해 거리 범위 밖의 가지를 건너뛰며,
+    각 노드에서는 아래 가지를 고를 수 있을 만큼만 편집 거리를 계산합니다.
+    같은 허용 답안 목록의 트리는 `get_fuzzy_matcher`로 한 번만 만들어 반 전체 채점에서 공유합니다.
+    """
+
+    def __init__(self, answers: Iterable[str], max_distance: int = len(DEFAULT_FUZZY_CREDIT) - 1):
+        self.max_distance = max_distance
+        self._answers = {}
+        self._root = None
+        for answer in answers:
+            normalized = normalize_objective_answer(answer)
+            if normalized and normalized not in self._answers:
+                self._answers[normalized] = answer
+                self._add(normalized)
+
+    def _add(self, word: str):
+        if self._root is None:
+            self._root = _Node(word)
+            return
+        node = self._root
+        while True:
+            distance = bounded_levenshtein(word, node.word, len(word) + len(node.word))
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(word)
+                return
+            node = child
+
+    def match(self, student_answer: str) -> Optional[Tuple[str, int]]:
+        """가장 가까운 허용 답안과 편집 거리를 반환합니다. 허용 거리 안에 없으면 None을 반환합니다."""
+        query = normalize_objective_answer(student_answer)
+        if not query or self._root is None:
+            return None
+        if query in self._answers:
+            return self._answers[query], 0
+
+        best = None
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            # 자식 가지를 고르는 데 필요한 범위까지만 편집 거리를 계산합니다.
+            bound = max(node.children, default=0) + self.max_distance
+            distance = bounded_levenshtein(query, node.word, bound)
+            if distance <= allowed_distance(node.word, self.max_distance) and (best is None or distance < best[1]):
+                best = (self._answers[node.word], distance)
+            if distance > bound:
+                continue
+            stack.extend(child for key, child in node.children.items() if abs(key - distance) <= self.max_distance)
+        return best
+
+    def score(self, student_answer: str, credit: List[int] = DEFAULT_FUZZY_CREDIT) -> Dict:
+        """가장 가까운 정답, 편집 거리, 거리별 점수표에 따른 점수를 반환합니다."""
+        result = self.match(student_answer)
+        if result is None or result[1] >= len(credit):
+            return {'matched': None, 'distance': None, 'credit': 0}
+        answer, distance = result
+        return {'matched': answer, 'distance': distance, 'credit': credit[distance]}
+
+    def score_batch(self, student_answers: Iterable[str], credit: List[int] = DEFAULT_FUZZY_CREDIT) -> List[Dict]:
+        """여러 답안을 채점합니다. 정규화 결과가 같은 답안은 한 번만 탐색합니다."""
+        results = {}
+        scores = []
+        for student_answer in student_answers:
+            key = normalize_objective_answer(student_answer)
+            if key not in results:
+                results[key] = self.score(student_answer, credit)
+            scores.append(results[key])
+        return scores
+
+
+@lru_cache(maxsize=1024)
+def _compile(answers: Tuple[str, ...], max_distance: int) -> FuzzyMatcher:
+    return FuzzyMatcher(answers, max_distance)
+
+
+def get_fuzzy_matcher(answers: Iterable[str], max_distance: int) -> FuzzyMatcher:
+    """허용 답안 목록의 BK-tree 채점기를 반환합니다. 같은 목록은 한 번만 컴파일합니다."""
+    return _compile(tuple(answers), max_distance)
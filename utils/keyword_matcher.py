@@ -0,0 +1,161 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+VOWELS = set("aeiou")
+# 규칙으로 만들 수 없는 자주 쓰는 불규칙 변화형
+IRREGULAR_FORMS = {
+    'be': ['am', 'is', 'are', 'was', 'were', 'been', 'being'],
+    'have': ['has', 'had', 'having'],
+    'do': ['does', 'did', 'done', 'doing'],
+    'go': ['goes', 'went', 'gone', 'going'],
+    'make': ['makes', 'made', 'making'],
+    'take': ['takes', 'took', 'taken', 'taking'],
+    'come': ['comes', 'came', 'coming'],
+    'see': ['sees', 'saw', 'seen', 'seeing'],
+    'get': ['gets', 'got', 'gotten', 'getting'],
+    'give': ['gives', 'gave', 'given', 'giving'],
+    'know': ['knows', 'knew', 'known', 'knowing'],
+    'think': ['thinks', 'thought', 'thinking'],
+    'write': ['writes', 'wrote', 'written', 'writing'],
+    'read': ['reads', 'reading'],
+    'eat': ['eats', 'ate', 'eaten', 'eating'],
+    'buy': ['buys', 'bought', 'buying'],
+    'child': ['children'],
+    'person': ['people'],
+    'man': ['men'],
+    'woman': ['women'],
+    'good': ['better', 'best'],
+    'bad': ['worse', 'worst'],
+}
+LEMMAS = {form: lemma for lemma, forms in IRREGULAR_FORMS.items() for form in forms}
+
+
+def get_inflections(word: str) -> List[str]:
+    """단어의 원형과 규칙/불규칙 변화형(복수형, 3인칭, 과거형, 진행형)을 반환합니다."""
+    word = word.lower()
+    lemma = LEMMAS.get(word, word)
+    forms = {word, lemma, *IRREGULAR_FORMS.get(lemma, [])}
+    if not (lemma.isascii() and lemma.isalpha()) or len(lemma) < 2:
+        return sorted(forms)
+
+    # 복수형 / 3인칭 단수
+    if lemma.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.add(lemma + 'es')
+    elif lemma.endswith('y') and lemma[-2] not in VOWELS:
+        forms.add(lemma[:-1] + 'ies')
+    else:
+        forms.add(lemma + 's')
+
+    # 과거형 / 진행형
+    if lemma.endswith('e'):
+        forms.update([lemma + 'd', lemma[:-1] + 'ing'])
+    elif lemma.endswith('y') and lemma[-2] not in VOWELS:
+        forms.update([lemma[:-1] + 'ied', lemma + 'ing'])
+    else:
+        forms.update([lemma + 'ed', lemma + 'ing'])
+        # 자음-모음-자음으로 끝나는 짧은 단어는 마지막 자음을 겹칩니다 (stop → stopped)
+        if (len(lemma) <= 4 and lemma[-1] not in VOWELS | set('wxy')
+                and lemma[-2] in VOWELS and lemma[-3:-2] not in VOWELS):
+            forms.update([lemma + lemma[-1] + 'ed', lemma + lemma[-1] + 'ing'])
+    return sorted(forms)
+
+
+def expand_keyword(keyword: str) -> List[str]:
+    """핵심 단어(구)의 변화형 목록을 만듭니다.
+
+    여러 단어로 된 구는 첫 단어(pick up → picked up)와 마지막 단어(a lot of book → a lot of books)를
+    각각 변화시킵니다.
+    """
+    words = keyword.lower().split()
+    if not words:
+        return []
+    forms = {' '.join(words[:-1] + [form]) for form in get_inflections(words[-1])}
+    if len(words) > 1:
+        forms.update(' '.join([form] + words[1:]) for form in get_inflections(words[0]))
+    return sorted(forms)
+
+
+class KeywordMatcher:
+    """핵심 단어와 변화형을 하나의 Aho–Corasick 오토마톤으로 컴파일한 채점기입니다.
+
+    답안을 한 번만 훑으면서 모든 핵심 단어의 등장 여부를 찾으므로, 핵심 단어 수와
+    관계없이 답안 길이에 비례하는 시간으로 채점합니다. 단어 중간에서 일치하는
+    경우(예: 'cat' ↔ 'education')는 제외하며, 한글 핵심 단어는 조사가 붙은 경우(사과를)도 인정합니다.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = [k.strip() for k in keywords if k and k.strip()]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]  # 상태 → [(핵심 단어 번호, 패턴 길이, 단어 끝 확인 여부)]
+        for index, keyword in enumerate(self.keywords):
+            for pattern in expand_keyword(keyword):
+                self._add_pattern(pattern, index)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str, keyword_index: int):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((keyword_index, len(pattern), pattern.isascii()))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """답안에서 찾은 (핵심 단어 번호, 시작 위치, 끝 위치) 목록을 반환합니다."""
+        text = text.lower()
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword_index, length, check_end in self._output[state]:
+                start, end = position - length + 1, position + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if not check_end or end == len(text) or not text[end].isalnum():
+                    matches.append((keyword_index, start, end))
+        return matches
+
+    def score(self, text: str) -> Dict:
+        """답안에 포함된 핵심 단어와 빠진 핵심 단어, 포함 비율을 반환합니다."""
+        found = {keyword_index for keyword_index, _, _ in self.find(text or '')}
+        matched = [k for i, k in enumerate(self.keywords) if i in found]
+        missing = [k for i, k in enumerate(self.keywords) if i not in found]
+        return {
+            'matched': matched,
+            'missing': missing,
+            'coverage': round(len(matched) / len(self.keywords), 3) if self.keywords else 1.0
+        }
+
+
+@lru_cache(maxsize=512)
+def _compile(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(list(keywords))
+
+
+def get_keyword_matcher(problem: Optional[Dict]) -> Optional[KeywordMatcher]:
+    """문제의 핵심 단어 채점기를 반환합니다. 같은 핵심 단어 목록은 한 번만 컴파일합니다."""
+    keywords = tuple((problem or {}).get('keywords') or ())
+    if not keywords:
+        return None
+    return _compile(keywords)
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 0은 사전에 없는 단어입니다.
+LEVELS = ["", "A1", "A2", "B1", "B2", "C1", "C2"]
+# 이 수준 이상을 고급 어휘로 봅니다.
+ADVANCED_LEVEL = LEVELS.index("B2")
+# 사전에 없는 단어는 이 글자 수를 넘으면 고급 어휘로 간주합니다.
+UNKNOWN_ADVANCED_LENGTH = 8
+SEED_FILE = Path(__file__).parent / "resources" / "cefr_lexicon.tsv"
+
+
+def _hash_word(word: str) -> int:
+    from spacy.strings import hash_string
+    return hash_string(word)
+
+
+def _source_hash(source: Path) -> str:
+    return hashlib.sha1(Path(source).read_bytes()).hexdigest()
+
+
+def _metadata_file(target: Path) -> Path:
+    return Path(target).with_suffix(".json")
+
+
+def compile_lexicon(source: Path, target: Path) -> int:
+    """단어 목록(단어<TAB>수준[<TAB>빈도 순위])을 해시 기준으로 정렬한 배열 파일로 컴파일합니다.
+
+    배열은 (3, 단어 수) uint64 형태로 각 행이 [spaCy 문자열 해시, 수준, 빈도 순위]이며,
+    순위가 없으면 파일의 줄 순서를 순위로 사용합니다. 원본 경로와 해시는 배열 옆의 같은 이름
+    `.json` 파일에 기록합니다. 컴파일한 단어 수를 반환합니다.
+    """
+    entries = {}
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            fields = line.strip().split('\t')
+            if not fields[0] or fields[0].startswith('#') or len(fields) < 2 or fields[1] not in LEVELS[1:]:
+                continue
+            word = fields[0].lower()
+            rank = int(fields[2]) if len(fields) > 2 else len(entries) + 1
+            level = LEVELS.index(fields[1])
+            # 같은 단어가 여러 번 나오면 가장 낮은 수준과 순위를 사용합니다.
+            previous = entries.get(word)
+            if previous is not None:
+                level, rank = min(level, previous[0]), min(rank, previous[1])
+            entries[word] = (level, rank)
+
+    table = np.array(
+        [[_hash_word(word) for word in entries],
+         [level for level, _ in entries.values()],
+         [rank for _, rank in entries.values()]],
+        dtype=np.uint64
+    ).reshape(3, len(entries))
+    table = table[:, np.argsort(table[0], kind='stable')]
+    np.save(target, np.ascontiguousarray(table))
+    with open(_metadata_file(target), 'w', encoding='utf-8') as f:
+        json.dump({'source': str(Path(source).resolve()), 'sha1': _source_hash(source)}, f, ensure_ascii=False, indent=2)
+    return len(entries)
+
+
+class Lexicon:
+    """단어 → CEFR 수준/빈도 순위 사전을 정렬된 해시 배열로 보관합니다.
+
+    컴파일한 `data/cefr_lexicon.npy`를 mmap으로 열어 바로 사용하며, 배열이 이 원본 목록에서
+    컴파일되었는데 원본 내용이 바뀌었을 때만 다시 컴파일합니다. 다른 목록으로 직접 컴파일한 사전은
+    그대로 사용합니다. 토큰의 표제어(없으면 소문자형) 해시를 `np.searchsorted`로 한 번에 찾으므로
+    답안 길이와 관계없이 벡터 연산 몇 번으로 수준을 구합니다.
+    """
+
+    def __init__(self, data_dir: str = "data", source: Path = SEED_FILE):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.lexicon_file = self.data_dir / "cefr_lexicon.npy"
+        self.source = Path(source)
+        self._load()
+
+    def _needs_compile(self) -> bool:
+        """컴파일한 배열이 없거나, 이 원본 목록에서 컴파일한 배열인데 원본 내용이 바뀌었는지 확인합니다."""
+        if not self.source.exists():
+            return False
+        if not self.lexicon_file.exists():
+            return True
+        metadata_file = _metadata_file(self.lexicon_file)
+        if not metadata_file.exists():
+            return False
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        return (metadata.get('source') == str(self.source.resolve())
+                and metadata.get('sha1') != _source_hash(self.source))
+
+    def _load(self):
+        try:
+            if self._needs_compile():
+                compile_lexicon(self.source, self.lexicon_file)
+            table = np.load(self.lexicon_file, mmap_mode='r')
+        except Exception as e:
+            print(f"어휘 수준 사전 로드 중 오류 발생: {str(e)}")
+            table = np.zeros((3, 0), dtype=np.uint64)
+        self.hashes, self.levels, self.ranks = table
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def lookup(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """해시 배열의 (수준, 빈도 순위) 배열을 반환합니다. 사전에 없는 단어는 0입니다."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(self.hashes):
+            return np.zeros(len(hashes), dtype=np.int64), np.zeros(len(hashes), dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        found = self.hashes[positions] == hashes
+        levels = np.where(found, self.levels[positions], 0).astype(np.int64)
+        ranks = np.where(found, self.ranks[positions], 0).astype(np.int64)
+        return levels, ranks
+
+    def token_levels(self, features) -> np.ndarray:
+        """토큰별 CEFR 수준(0-6)을 반환합니다. 표제어로 찾지 못하면 소문자형으로 다시 찾습니다."""
+        levels, _ = self.lookup(features.lemma)
+        missing = levels == 0
+        if missing.any():
+            levels[missing] = self.lookup(features.lower[missing])[0]
+        return levels
+
+    def advanced_mask(self, features, levels: Optional[np.ndarray] = None) -> np.ndarray:
+        """고급 어휘(B2 이상, 사전에 없으면 긴 단어) 토큰 여부를 반환합니다."""
+        if levels is None:
+            levels = self.token_levels(features)
+        unknown_long = (levels == 0) & (features.length > UNKNOWN_ADVANCED_LENGTH)
+        return features.is_alpha & ((levels >= ADVANCED_LEVEL) | unknown_long)
+
+    def level_distribution(self, features, levels: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """단어(알파벳 토큰) 중 수준별 비율을 반환합니다. 사전에 없는 단어는 '미분류'로 셉니다."""
+        if levels is None:
+            levels = self.token_levels(features)
+        levels = levels[features.is_alpha]
+        if not len(levels):
+            return {}
+        counts = np.bincount(levels, minlength=len(LEVELS)) / len(levels)
+        distribution = {level: round(float(counts[i]), 3) for i, level in enumerate(LEVELS) if i and counts[i]}
+        if counts[0]:
+            distribution['미분류'] = round(float(counts[0]), 3)
+        return distribution
+
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon(data_dir: str = "data") -> Lexicon:
+    """프로세스에서 공유하는 어휘 수준 사전을 반환합니다."""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = Lexicon(data_dir)
+    return _lexicon
+
+
+if __name__ == "__main__":
+    # 더 큰 어휘 목록으로 사전을 다시 만듭니다: python -m utils.lexicon words.tsv
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else SEED_FILE
+    count = compile_lexicon(source, Path("data") / "cefr_lexicon.npy")
+    print(f"{count}개 단어를 컴파일했습니다.")
@@ -0,0 +1,6 @@
+from typing import Dict
+
+
+def get_model_answer_text(problem: Dict) -> str:
+    """문제의 모범 답안 텍스트를 반환합니다."""
+    return problem.get('model_answer') or problem.get('correct_answer') or ''
@@ -0,0 +1,69 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+
+class DocCache:
+    """텍스트 내용의 해시를 키로 spaCy `Doc`을 보관하는 LRU 캐시입니다.
+
+    같은 답안/모범 답안이 여러 분석기에서 쓰여도 한 번만 파싱되도록 합니다.
+    캐시 적중 시 해당 문서를 처음 파싱할 때 걸린 시간을 절약한 시간으로 집계합니다.
+    """
+
+    def __init__(self, parse, max_size: int = 256):
+        # parse: 텍스트를 받아 Doc을 반환하는 함수 (spaCy Language 객체도 가능)
+        self.parse = parse
+        self.max_size = max_size
+        self._docs = OrderedDict()  # 해시 → (Doc, 파싱 시간)
+        self.hits = 0
+        self.misses = 0
+        self.parse_time = 0.0
+        self.time_saved = 0.0
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get(self, text: str):
+        """텍스트의 `Doc`을 반환합니다. 캐시에 없으면 파싱 후 저장합니다."""
+        key = self.make_key(text)
+        entry = self._docs.get(key)
+        if entry is not None:
+            self._docs.move_to_end(key)
+            self.hits += 1
+            self.time_saved += entry[1]
+            return entry[0]
+
+        start = time.perf_counter()
+        doc = self.parse(text)
+        elapsed = time.perf_counter() - start
+        self.misses += 1
+        self.parse_time += elapsed
+        self.put(text, doc, elapsed)
+        return doc
+
+    def put(self, text: str, doc, parse_time: float = 0.0):
+        """이미 파싱된 `Doc`을 캐시에 저장합니다."""
+        key = self.make_key(text)
+        self._docs[key] = (doc, parse_time)
+        self._docs.move_to_end(key)
+        while len(self._docs) > self.max_size:
+            self._docs.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._docs
+
+    def clear(self):
+        self._docs.clear()
+
+    def get_stats(self) -> dict:
+        """캐시 적중률과 절약된 파싱 시간을 반환합니다."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._docs),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'parse_time': round(self.parse_time, 4),
+            'time_saved': round(self.time_saved, 4)
+        }
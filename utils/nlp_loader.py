@@ -0,0 +1,34 @@
+import threading
+import time
+
+NLP_MODEL = "en_core_web_sm"
+# 첨삭 분석기는 품사/의존 구문/표제어/형태 정보만 사용하므로 개체명 인식은 로드하지 않습니다.
+EXCLUDED_COMPONENTS = ["ner"]
+
+_nlp = None
+_load_time = None
+_lock = threading.Lock()
+
+
+def get_nlp():
+    """프로세스에서 공유하는 spaCy 모델을 반환합니다. 처음 호출될 때 한 번만 로드합니다."""
+    global _nlp, _load_time
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                import spacy
+
+                start = time.perf_counter()
+                _nlp = spacy.load(NLP_MODEL, exclude=EXCLUDED_COMPONENTS)
+                _load_time = time.perf_counter() - start
+    return _nlp
+
+
+def is_loaded() -> bool:
+    """모델이 이미 로드되었는지 확인합니다."""
+    return _nlp is not None
+
+
+def get_load_time():
+    """모델 로드에 걸린 시간(초)을 반환합니다. 아직 로드되지 않았으면 None을 반환합니다."""
+    return _load_time
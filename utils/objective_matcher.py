@@ -0,0 +1,92 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# 정답이 짧으면 NLP 분석 없이 정답 비교만으로 채점하는 문제 유형
+OBJECTIVE_TYPES = {"객관식", "빈칸", "어휘", "단어", "문법"}
+# 정답(허용 답안)이 이 단어 수 이하일 때만 객관식 채점을 사용합니다.
+MAX_OBJECTIVE_WORDS = 3
+# 한 문제에 여러 정답을 허용할 때의 구분자 (예: "color/colour")
+ALTERNATIVE_SEPARATOR = '/'
+
+_WHITESPACE = re.compile(r'\s+')
+# 축약형(don't ↔ dont)은 붙여서 비교하도록 삭제하는 아포스트로피
+_APOSTROPHES = {"'", "\u2019", "\u2018"}
+
+
+def normalize_objective_answer(text: str) -> str:
+    """대소문자, 공백, 문장 부호, 유니코드 표기 차이를 없앤 비교용 답안을 반환합니다.
+
+    NFKC 정규화로 전각 문자와 원문자(①)를 일반 문자로 바꾸고, 아포스트로피는 지우고
+    나머지 문장 부호는 공백으로 바꿉니다.
+    """
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    text = ''.join('' if char in _APOSTROPHES else ' ' if unicodedata.category(char).startswith('P') else char
+                   for char in text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def split_alternatives(answer: str) -> List[str]:
+    """'/'로 구분된 허용 답안 목록을 반환합니다."""
+    return [part.strip() for part in (answer or '').split(ALTERNATIVE_SEPARATOR) if part.strip()]
+
+
+class ObjectiveMatcher:
+    """객관식/빈칸/단어 문제의 허용 답안을 정규화해 두고 학생 답안과 바로 비교하는 채점기입니다."""
+
+    def __init__(self, answers: List[str]):
+        self.answers = []
+        self._normalized = {}
+        for answer in answers:
+            for alternative in split_alternatives(answer):
+                normalized = normalize_objective_answer(alternative)
+                if normalized and normalized not in self._normalized:
+                    self._normalized[normalized] = alternative
+                    self.answers.append(alternative)
+
+    def __bool__(self):
+        return bool(self._normalized)
+
+    @property
+    def max_words(self) -> int:
+        """허용 답안 중 가장 긴 답안의 단어 수"""
+        return max((len(answer.split()) for answer in self._normalized), default=0)
+
+    def match(self, student_answer: str) -> Optional[str]:
+        """학생 답안과 일치하는 허용 답안을 반환합니다. 없으면 None을 반환합니다."""
+        return self._normalized.get(normalize_objective_answer(student_answer))
+
+    def score(self, student_answer: str) -> Dict:
+        """정답 여부와 일치한 허용 답안, 전체 허용 답안 목록을 반환합니다."""
+        matched = self.match(student_answer)
+        return {
+            'correct': matched is not None,
+            'matched': matched,
+            'answers': list(self.answers)
+        }
+
+
+@lru_cache(maxsize=1024)
+def _compile(answers: Tuple[str, ...]) -> ObjectiveMatcher:
+    return ObjectiveMatcher(list(answers))
+
+
+def get_objective_matcher(problem_type: str, model_answer: str = '',
+                          problem: Optional[Dict] = None) -> Optional[ObjectiveMatcher]:
+    """객관식 채점 대상이면 허용 답안 채점기를 반환합니다. 아니면 None을 반환합니다.
+
+    문제 유형이 `OBJECTIVE_TYPES`에 속하고 모든 허용 답안이 `MAX_OBJECTIVE_WORDS` 단어 이하일 때만
+    대상이 됩니다. 같은 허용 답안 목록은 한 번만 정규화합니다.
+    """
+    if problem_type not in OBJECTIVE_TYPES:
+        return None
+    problem = problem or {}
+    answers = tuple(answer for answer in (problem.get('correct_answer'), problem.get('model_answer'), model_answer)
+                    if answer)
+    if not answers:
+        return None
+    matcher = _compile(answers)
+    if not matcher or matcher.max_words > MAX_OBJECTIVE_WORDS:
+        return None
+    return matcher
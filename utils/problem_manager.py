@@ -5,6 +5,20 @@ import json
 import os
 from datetime import datetime
 import uuid
+from utils.similarity import SimilarityService
+
+# 난이도 표기(초급/중급/고급 또는 1~5점)를 1~3 레벨로 변환하기 위한 매핑
+DIFFICULTY_MAPPING = {
+    '초급': 1,
+    '중급': 2,
+    '고급': 3
+}
+SCORE_DIFFICULTY_MAPPING = {1: 1, 2: 1, 3: 2, 4: 3, 5: 3}
+# 보정된 난이도(logit)의 레벨 경계값: -0.5 미만은 초급, 0.5 미만은 중급, 그 이상은 고급
+CALIBRATED_LEVEL_BOUNDARIES = (-0.5, 0.5)
+# add_problem/add_problems가 받는 문제 필드
+PROBLEM_FIELDS = ('title', 'type', 'content', 'difficulty', 'correct_answer', 'keywords', 'explanation',
+                  'time_limit', 'points')
 
 class ProblemManager:
     def __init__(self, data_dir: str = "data"):
@@ -28,6 +42,18 @@ class ProblemManager:
         with open(self.problems_file, 'w', encoding='utf-8') as f:
             json.dump(self.problems, f, ensure_ascii=False, indent=2)
 
+    def _rebuild_similarity_index(self):
+        """모범 답안 유사도 인덱스(TF-IDF 벡터)를 문제 은행 전체 기준으로 다시 계산해 저장합니다.
+
+        IDF가 문제 은행 전체에 따라 바뀌므로 문제 하나만 갱신할 수 없습니다.
+        여러 문제를 추가할 때는 `add_problems`로 한 번만 다시 계산하세요.
+        """
+        try:
+            SimilarityService(self.data_dir).build(self.problems)
+        except Exception as e:
+            # 인덱스가 없으면 첨삭 시 모범 답안을 직접 벡터화합니다.
+            print(f"모범 답안 분석 중 오류 발생: {str(e)}")
+
     def _load_pending_problems(self):
         """검토 대기 중인 문제들을 불러옵니다."""
         try:
@@ -43,7 +69,25 @@ class ProblemManager:
 
     def add_problem(self, title, type, content, difficulty, correct_answer, keywords=None, explanation=None, time_limit=None, points=None):
         """새로운 문제를 추가합니다."""
-        problem = {
+        return self.add_problems([{
+            'title': title, 'type': type, 'content': content, 'difficulty': difficulty,
+            'correct_answer': correct_answer, 'keywords': keywords, 'explanation': explanation,
+            'time_limit': time_limit, 'points': points
+        }])[0]
+
+    def add_problems(self, problems: List[Dict]) -> List[Dict]:
+        """여러 문제를 한 번에 추가합니다. 파일 저장과 유사도 인덱스 계산은 한 번만 합니다."""
+        added = [self._new_problem(**{k: p[k] for k in PROBLEM_FIELDS if k in p}) for p in problems]
+        if added:
+            self.problems.extend(added)
+            self._save_problems()
+            self._rebuild_similarity_index()
+        return added
+
+    @staticmethod
+    def _new_problem(title, type, content, difficulty, correct_answer, keywords=None, explanation=None, time_limit=None, points=None):
+        """새 문제 기록을 만듭니다."""
+        return {
             'id': str(uuid.uuid4()),
             'title': title,
             'type': type,
@@ -56,9 +100,6 @@ class ProblemManager:
             'points': points or 100,
             'created_at': datetime.now().isoformat()
         }
-        self.problems.append(problem)
-        self._save_problems()
-        return problem
 
     def get_problem(self, problem_id: int) -> Optional[Dict]:
         """특정 ID의 문제를 가져옵니다."""
@@ -78,6 +119,7 @@ class ProblemManager:
                 problem.update(kwargs)
                 self.problems[i] = problem
                 self._save_problems()
+                self._rebuild_similarity_index()
                 return True
         return False
 
@@ -87,6 +129,7 @@ class ProblemManager:
             if problem['id'] == problem_id:
                 del self.problems[i]
                 self._save_problems()
+                self._rebuild_similarity_index()
                 return True
         return False
 
@@ -141,12 +184,31 @@ class ProblemManager:
         """특정 키워드가 포함된 문제 목록을 반환합니다."""
         return [p for p in self.problems if keyword in p['keywords']]
 
+    @staticmethod
+    def get_difficulty_level(problem) -> int:
+        """문제의 난이도를 1~3 레벨로 반환합니다. 보정된 난이도가 있으면 우선 사용합니다."""
+        calibrated = problem.get('calibrated_difficulty')
+        if calibrated is not None:
+            low, high = CALIBRATED_LEVEL_BOUNDARIES
+            return 1 if calibrated < low else 2 if calibrated < high else 3
+
+        difficulty = problem.get('difficulty')
+        if isinstance(difficulty, str) and difficulty.isdigit():
+            difficulty = int(difficulty)
+        if isinstance(difficulty, (int, float)):
+            return SCORE_DIFFICULTY_MAPPING.get(int(round(difficulty)), 2)
+        return DIFFICULTY_MAPPING.get(difficulty, 2)  # 기본값: 중급
+
     def get_problems_by_level(self, level):
         """특정 레벨에 맞는 문제 목록을 반환합니다."""
-        difficulty_mapping = {
-            '초급': 1,
-            '중급': 2,
-            '고급': 3
-        }
-        target_difficulty = difficulty_mapping.get(level, 2)  # 기본값: 중급
-        return [p for p in self.problems if difficulty_mapping.get(p['difficulty'], 2) <= target_difficulty] 
\ No newline at end of file
+        target_difficulty = DIFFICULTY_MAPPING.get(level, 2)  # 기본값: 중급
+        return [p for p in self.problems if self.get_difficulty_level(p) <= target_difficulty]
+
+    def get_problems_by_calibrated_difficulty(self, min_difficulty=None, max_difficulty=None):
+        """보정된 난이도(logit)가 주어진 범위에 있는 문제 목록을 반환합니다."""
+        return [
+            p for p in self.problems
+            if p.get('calibrated_difficulty') is not None
+            and (min_difficulty is None or p['calibrated_difficulty'] >= min_difficulty)
+            and (max_difficulty is None or p['calibrated_difficulty'] <= max_difficulty)
+        ]
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+from typing import Dict, List, Optional
+
+REQUIRED_FIELDS = ['type', 'title', 'content', 'difficulty', 'correct_answer', 'keywords', 'explanation']
+
+
+def build_problem_prompt(problem_type: str, difficulty: int, count: int = 1, topic: Optional[str] = None) -> str:
+    """AI 문제 생성 프롬프트를 만듭니다."""
+    return f"""
+        영어 교육 전문가로서 다음 조건에 맞는 영어 문제를 생성해주세요:
+
+        조건:
+        - 문제 유형: {problem_type}
+        - 난이도: {difficulty}점 (1-5점 척도)
+        {f'- 주제: {topic}' if topic else ''}
+        - 생성할 문제 수: {count}개
+
+        각 문제는 다음 JSON 형식으로 생성해주세요:
+        {{
+            "type": "문제 유형",
+            "title": "문제 제목",
+            "content": "문제 내용",
+            "difficulty": 난이도,
+            "correct_answer": "정답",
+            "keywords": ["채점", "키워드", "목록"],
+            "explanation": "문제 해설"
+        }}
+
+        응답은 반드시 유효한 JSON 형식이어야 하며, 여러 문제의 경우 JSON 배열로 반환해주세요.
+        """
+
+
+def parse_problem_response(response_text: str) -> List[Dict]:
+    """모델 응답에서 JSON 부분을 찾아 문제 목록으로 반환합니다."""
+    # JSON 부분만 추출 (텍스트에서 [...] 또는 {...} 찾기)
+    json_start = response_text.find('[')
+    json_end = response_text.rfind(']') + 1
+    object_start = response_text.find('{')
+    if json_start == -1 or (object_start != -1 and object_start < json_start):
+        json_start = object_start
+        json_end = response_text.rfind('}') + 1
+
+    if json_start == -1 or json_end == 0:
+        raise ValueError("유효한 JSON 응답을 찾을 수 없습니다.")
+
+    problems = json.loads(response_text[json_start:json_end])
+
+    # 단일 문제인 경우 리스트로 변환
+    if not isinstance(problems, list):
+        problems = [problems]
+    return problems
+
+
+def validate_problem(problem: Dict) -> bool:
+    """생성된 문제가 올바른 형식인지 검증합니다."""
+    # 모든 필수 필드가 있는지 확인
+    if not isinstance(problem, dict) or not all(field in problem for field in REQUIRED_FIELDS):
+        return False
+
+    # 타입 검증
+    try:
+        assert isinstance(problem['type'], str)
+        assert isinstance(problem['title'], str)
+        assert isinstance(problem['content'], str)
+        assert isinstance(problem['difficulty'], (int, float))
+        assert isinstance(problem['correct_answer'], str)
+        assert isinstance(problem['keywords'], list)
+        assert isinstance(problem['explanation'], str)
+        assert all(isinstance(k, str) for k in problem['keywords'])
+        return True
+    except AssertionError:
+        return False
@@ -0,0 +1,204 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+# AI 문제 생성 한도 (최근 24시간 동안 생성한 문제 수)
+DAILY_LIMIT = 100
+WINDOW_SECONDS = 24 * 60 * 60
+# 대기열에서 이 시간 동안 갱신이 없는 요청(세션이 끊긴 경우)은 빠집니다.
+STALE_WAITER_SECONDS = 30
+# 페이지에서 생성할 때 한도를 기다리는 최대 시간(초). 더 기다려야 하면 바로 알리고 다시 시도하게 합니다.
+INTERACTIVE_WAIT_SECONDS = 5
+
+
+class QuotaExceededError(ValueError):
+    """대기 시간 안에 생성 한도를 받을 수 없을 때 발생합니다."""
+
+    def __init__(self, limit: int, remaining: int, wait_seconds: Optional[float]):
+        self.limit = limit
+        self.remaining = remaining
+        self.wait_seconds = wait_seconds
+        message = f"일일 생성 한도({limit}개)를 초과했습니다. 남은 생성 가능 횟수: {remaining}개"
+        if wait_seconds:
+            message += f" (약 {format_wait(wait_seconds)} 후 다시 생성할 수 있습니다)"
+        super().__init__(message)
+
+
+def format_wait(seconds: float) -> str:
+    """대기 시간을 '3시간 5분', '40초' 같은 문자열로 바꿉니다."""
+    seconds = int(seconds + 0.999)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}시간 {minutes}분"
+    if minutes:
+        return f"{minutes}분"
+    return f"{seconds}초"
+
+
+class QuotaLedger:
+    """AI 문제 생성 한도를 모든 세션과 서버 프로세스가 함께 쓰는 SQLite 원장(`data/ai_quota.db`)입니다.
+
+    최근 window초 동안 생성한 문제 수가 limit을 넘지 않도록 하는 슬라이딩 윈도 방식이라,
+    사용 기록이 window초를 지나면 그만큼 한도가 다시 채워집니다. 한도가 모자란 요청은 바로 실패시키지 않고
+    대기열에 넣어 먼저 온 요청부터 승인하며, 승인된 요청은 요청한 수만큼 먼저 예약한 뒤
+    생성이 끝나면 실제로 생성한 수로 정산합니다.
+    """
+
+    def __init__(self, data_dir: str = "data", limit: int = DAILY_LIMIT, window: float = WINDOW_SECONDS,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep,
+                 poll_interval: float = 0.5):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.db_file = self.data_dir / "ai_quota.db"
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+        self.poll_interval = poll_interval
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        """사용 기록과 대기열 테이블을 생성합니다."""
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    used_at REAL NOT NULL,
+                    amount INTEGER NOT NULL,
+                    source TEXT,
+                    settled INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_quota_usage_used ON quota_usage (used_at)")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS quota_waiters (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    amount INTEGER NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """)
+
+    def _prune(self, connection, now: float):
+        connection.execute("DELETE FROM quota_usage WHERE used_at <= ?", (now - self.window,))
+        connection.execute("DELETE FROM quota_waiters WHERE last_seen < ?", (now - STALE_WAITER_SECONDS,))
+
+    def _used(self, connection) -> int:
+        return connection.execute("SELECT COALESCE(SUM(amount), 0) FROM quota_usage").fetchone()[0]
+
+    def _wait_time(self, connection, now: float, amount: int) -> float:
+        """amount개를 더 사용할 수 있을 때까지 남은 시간(초)을 사용 기록의 만료 시각으로 계산합니다."""
+        rows = connection.execute("SELECT used_at, amount FROM quota_usage ORDER BY used_at").fetchall()
+        needed = sum(row[1] for row in rows) + amount - self.limit
+        if needed <= 0:
+            return 0.0
+        for used_at, used in rows:
+            needed -= used
+            if needed <= 0:
+                return max(0.0, used_at + self.window - now)
+        return float('inf')
+
+    def get_status(self) -> Dict:
+        """한도, 사용량, 남은 수, 대기 중인 요청 수, 다음 한도가 채워질 때까지의 시간을 반환합니다."""
+        now = self.clock()
+        with self._connect() as connection:
+            self._prune(connection, now)
+            used = self._used(connection)
+            waiting = connection.execute("SELECT COUNT(*) FROM quota_waiters").fetchone()[0]
+            oldest = connection.execute("SELECT MIN(used_at) FROM quota_usage").fetchone()[0]
+        return {
+            'limit': self.limit,
+            'used': used,
+            'remaining': max(0, self.limit - used),
+            'waiting': waiting,
+            'next_release': max(0.0, oldest + self.window - now) if oldest is not None else None
+        }
+
+    def remaining(self) -> int:
+        """지금 바로 사용할 수 있는 생성 한도를 반환합니다."""
+        return self.get_status()['remaining']
+
+    def acquire(self, amount: int, timeout: float = 60.0, source: str = "") -> int:
+        """amount개의 한도를 예약하고 예약 ID를 반환합니다.
+
+        한도가 모자라면 대기열에서 차례와 한도를 기다립니다. timeout초 안에 받을 수 없거나
+        기다려도 받을 수 없는 요청이면 `QuotaExceededError`가 발생합니다.
+        """
+        if amount > self.limit:
+            raise QuotaExceededError(self.limit, self.remaining(), None)
+        now = self.clock()
+        deadline = now + timeout
+        with self._connect() as connection:
+            ticket = connection.execute(
+                "INSERT INTO quota_waiters (amount, enqueued_at, last_seen) VALUES (?, ?, ?)", (amount, now, now)
+            ).lastrowid
+        try:
+            while True:
+                now = self.clock()
+                with self._connect() as connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    self._prune(connection, now)
+                    first = connection.execute("SELECT MIN(id) FROM quota_waiters").fetchone()[0]
+                    wait = self._wait_time(connection, now, amount)
+                    if first in (ticket, None) and wait <= 0:
+                        reservation = connection.execute(
+                            "INSERT INTO quota_usage (used_at, amount, source) VALUES (?, ?, ?)", (now, amount, source)
+                        ).lastrowid
+                        connection.execute("DELETE FROM quota_waiters WHERE id = ?", (ticket,))
+                        connection.execute("COMMIT")
+                        return reservation
+                    # 대기 중임을 갱신합니다 (오래 갱신되지 않은 요청은 다른 프로세스가 대기열에서 뺍니다).
+                    connection.execute(
+                        "INSERT OR REPLACE INTO quota_waiters (id, amount, enqueued_at, last_seen) "
+                        "VALUES (?, ?, COALESCE((SELECT enqueued_at FROM quota_waiters WHERE id = ?), ?), ?)",
+                        (ticket, amount, ticket, now, now)
+                    )
+                    remaining = max(0, self.limit - self._used(connection))
+                    in_flight = connection.execute(
+                        "SELECT COUNT(*) FROM quota_usage WHERE settled = 0").fetchone()[0]
+                    connection.execute("COMMIT")
+
+                # 정산을 기다리는 예약이 없어 기록이 만료되는 것만으로는 기한 안에 받을 수 없으면 기다리지 않습니다.
+                if now >= deadline or (not in_flight and now + wait > deadline):
+                    raise QuotaExceededError(self.limit, remaining, wait if first == ticket else None)
+                self.sleep(min(self.poll_interval, wait) if wait > 0 else self.poll_interval)
+        except BaseException:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM quota_waiters WHERE id = ?", (ticket,))
+            raise
+
+    def settle(self, reservation: int, used: int):
+        """예약한 한도를 실제로 생성한 수로 정산합니다. 사용하지 않은 만큼은 바로 다시 사용할 수 있습니다."""
+        with self._connect() as connection:
+            if used > 0:
+                connection.execute(
+                    "UPDATE quota_usage SET amount = MIN(amount, ?), settled = 1 WHERE id = ?", (used, reservation)
+                )
+            else:
+                connection.execute("DELETE FROM quota_usage WHERE id = ?", (reservation,))
+
+
+def get_quota_ledger(data_dir: str = "data") -> QuotaLedger:
+    """프로세스에서 공유하는 AI 생성 한도 원장을 반환합니다."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger(data_dir)
+    return _ledger
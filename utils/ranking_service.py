@@ -0,0 +1,147 @@
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+RANKING_METRICS = {
+    'completed': '완료한 문제 수',
+    'average': '평균 점수',
+    'improvement': '향상도'
+}
+
+
+def get_week_key(value=None) -> str:
+    """시각을 ISO 주차 키(예: 2024-W09)로 변환합니다."""
+    if value is None:
+        moment = datetime.now()
+    elif isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(value)
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _previous_week_key(week: str) -> str:
+    """이전 주차 키를 반환합니다."""
+    year, week_number = week.split('-W')
+    monday = datetime.fromisocalendar(int(year), int(week_number), 1)
+    return get_week_key(datetime.fromordinal(monday.toordinal() - 7))
+
+
+class RankingService:
+    """주간 학생 집계값을 유지하고 heap 기반으로 상위 k명을 선택합니다.
+
+    집계값(주차 → 학생 → 완료 수, 점수 합계/개수, 마지막 제출 시각)은 제출/채점 시
+    점진적으로 갱신되며 `data/rankings.json`에 저장됩니다. 동점이면 마지막 제출 시각이
+    빠른(먼저 달성한) 학생이 앞섭니다.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.rankings_file = self.data_dir / "rankings.json"
+        self.weekly = {}
+        self._load_rankings()
+
+    def _load_rankings(self):
+        """저장된 집계값을 로드합니다."""
+        if self.rankings_file.exists():
+            with open(self.rankings_file, 'r', encoding='utf-8') as f:
+                self.weekly = json.load(f)
+
+    def _save_rankings(self):
+        """집계값을 임시 파일에 쓴 뒤 교체합니다 (페이지가 잠금 없이 읽어도 잘린 파일을 보지 않습니다)."""
+        tmp_path = self.rankings_file.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.weekly, f, ensure_ascii=False)
+        os.replace(tmp_path, self.rankings_file)
+
+    def exists(self) -> bool:
+        return self.rankings_file.exists()
+
+    def rebuild(self, assignments: List[Dict]):
+        """과제 기록 전체로 집계값을 다시 만듭니다."""
+        self.weekly = {}
+        for assignment in assignments:
+            if assignment.get('completed') and assignment.get('submitted_at'):
+                self._apply(assignment['student_id'], assignment['submitted_at'],
+                            completed=1, score=assignment.get('score'))
+        self._save_rankings()
+
+    def _apply(self, student_id: str, submitted_at: str, completed: int = 0, score=None, previous_score=None):
+        """한 학생의 주간 집계값을 갱신합니다."""
+        week = get_week_key(submitted_at)
+        stats = self.weekly.setdefault(week, {}).setdefault(student_id, {
+            'completed': 0, 'score_sum': 0.0, 'score_count': 0, 'last_submitted_at': submitted_at
+        })
+        stats['completed'] += completed
+        if previous_score is not None:
+            stats['score_sum'] -= previous_score
+            stats['score_count'] -= 1
+        if score is not None:
+            stats['score_sum'] += score
+            stats['score_count'] += 1
+        stats['last_submitted_at'] = max(stats['last_submitted_at'], submitted_at)
+
+    def record_submission(self, student_id: str, submitted_at: str, score=None, save: bool = True):
+        """제출 한 건을 반영합니다."""
+        self._apply(student_id, submitted_at, completed=1, score=score)
+        if save:
+            self._save_rankings()
+
+    def record_grade(self, student_id: str, submitted_at: str, score, previous_score=None, save: bool = True):
+        """채점(또는 재채점) 한 건을 반영합니다."""
+        self._apply(student_id, submitted_at, score=score, previous_score=previous_score)
+        if save:
+            self._save_rankings()
+
+    def save(self):
+        """집계값을 저장합니다."""
+        self._save_rankings()
+
+    @staticmethod
+    def _average(stats: Optional[Dict]) -> Optional[float]:
+        if not stats or not stats['score_count']:
+            return None
+        return stats['score_sum'] / stats['score_count']
+
+    def _iter_entries(self, metric: str, week: str, student_ids=None):
+        """(지표값, -마지막 제출 시각, 학생 ID) 튜플을 생성합니다."""
+        current = self.weekly.get(week, {})
+        previous = self.weekly.get(_previous_week_key(week), {}) if metric == 'improvement' else {}
+        for student_id, stats in current.items():
+            if student_ids is not None and student_id not in student_ids:
+                continue
+            if metric == 'completed':
+                value = stats['completed']
+            elif metric == 'average':
+                value = self._average(stats)
+            else:
+                this_week, last_week = self._average(stats), self._average(previous.get(student_id))
+                value = None if this_week is None or last_week is None else this_week - last_week
+            if value is None:
+                continue
+            last_submitted = datetime.fromisoformat(stats['last_submitted_at']).timestamp()
+            yield value, -last_submitted, student_id
+
+    def top_k(self, metric: str = 'completed', k: int = 10, week: Optional[str] = None, student_ids=None) -> List[Dict]:
+        """지표 기준 상위 k명을 반환합니다. 전체 정렬 없이 크기 k의 heap만 사용합니다."""
+        week = week or get_week_key()
+        top = heapq.nlargest(k, self._iter_entries(metric, week, student_ids))
+        return [
+            {'rank': i, 'student_id': student_id, 'value': round(value, 1)}
+            for i, (value, _, student_id) in enumerate(top, 1)
+        ]
+
+    def get_rank(self, student_id: str, metric: str = 'completed', week: Optional[str] = None, student_ids=None):
+        """학생의 순위와 비교 대상 인원을 반환합니다. 기록이 없으면 (None, 인원)을 반환합니다."""
+        week = week or get_week_key()
+        entries = list(self._iter_entries(metric, week, student_ids))
+        target = next((entry for entry in entries if entry[2] == student_id), None)
+        if target is None:
+            return None, len(entries)
+        better = sum(1 for entry in entries if entry[:2] > target[:2])
+        return better + 1, len(entries)
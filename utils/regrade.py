@@ -0,0 +1,173 @@
+"""제출된 과제 일괄 재채점
+
+분석기 코드(점수 계산식 포함)가 바뀌면 과제에 기록된 분석기 버전과 현재 버전이 달라집니다.
+버전이 다른 제출 답안만 골라 여러 프로세스에서 다시 첨삭하고, 결과를 묶어서 기록합니다.
+중단되더라도 체크포인트 파일로 이어서 실행할 수 있습니다.
+
+    python -m utils.regrade [--workers 4] [--chunk-size 32] [--commit-every 200] [--force] [--dry-run]
+
+Streamlit 앱과 같은 `data/assignments.json`에 기록하므로 채점이 많지 않은 시간에 실행하세요.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from utils.feedback_cache import get_analyzer_version
+from utils.model_answer_store import get_model_answer_text
+from utils.problem_manager import ProblemManager
+from utils.student_manager import StudentManager
+
+_feedback_generator = None
+
+
+def _init_worker():
+    """작업 프로세스마다 첨삭 생성기를 하나씩 만듭니다 (모델은 첫 답안에서 로드됩니다)."""
+    global _feedback_generator
+    from utils.feedback_generator import FeedbackGenerator
+    _feedback_generator = FeedbackGenerator()
+
+
+def _regrade_chunk(items: List[tuple]) -> List[tuple]:
+    """(과제 ID, 학생 답안, 모범 답안, 문제 유형, 문제) 묶음을 첨삭해 (과제 ID, 점수, 피드백) 목록을 반환합니다."""
+    if _feedback_generator is None:
+        _init_worker()
+    feedback_items = [item[1:] for item in items]
+    results = []
+    for item, feedback in zip(items, _feedback_generator.generate_feedback_batch(feedback_items)):
+        results.append((item[0], feedback['overall_score'], feedback))
+    return results
+
+
+class RegradeCheckpoint:
+    """재채점이 끝난 과제 ID를 `data/regrade_checkpoint.json`에 기록합니다.
+
+    분석기 버전이 바뀌면 이전 체크포인트는 무시하고 처음부터 시작합니다.
+    """
+
+    def __init__(self, path: Path, version: str):
+        self.path = Path(path)
+        self.version = version
+        self.done: Set[str] = set()
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == version:
+                    self.done = set(data.get('done', []))
+            except Exception as e:
+                print(f"재채점 체크포인트 로드 중 오류 발생: {str(e)}")
+
+    def add(self, assignment_ids: List[str]):
+        self.done.update(assignment_ids)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'done': sorted(self.done), 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def iter_outdated_assignments(student_manager: StudentManager, problems: Dict[str, Dict], version: str,
+                              skip: Set[str], force: bool = False) -> Iterator[tuple]:
+    """재채점할 제출 과제를 (과제 ID, 학생 답안, 모범 답안, 문제 유형, 문제) 형태로 하나씩 생성합니다."""
+    for assignment in student_manager.assignments:
+        if not (assignment.get('completed') and assignment.get('student_answer')):
+            continue
+        if assignment['id'] in skip or (not force and assignment.get('analyzer_version') == version):
+            continue
+        problem = problems.get(assignment['problem_id'])
+        if problem is None:
+            continue
+        yield (assignment['id'], assignment['student_answer'], get_model_answer_text(problem),
+               problem['type'], problem)
+
+
+def _chunks(items: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def regrade(workers: int = 1, chunk_size: int = 32, commit_every: int = 200, force: bool = False,
+            dry_run: bool = False, data_dir: str = "data", checkpoint_file: Optional[str] = None) -> Dict:
+    """분석기 버전이 다른 제출 과제를 재채점하고 처리 결과를 반환합니다."""
+    version = get_analyzer_version()
+    checkpoint = RegradeCheckpoint(checkpoint_file or Path(data_dir) / "regrade_checkpoint.json", version)
+    student_manager = StudentManager(data_dir)
+    problems = {p['id']: p for p in ProblemManager(data_dir).get_all_problems()}
+    pending = sum(1 for _ in iter_outdated_assignments(student_manager, problems, version, checkpoint.done, force))
+    stats = {'version': version, 'pending': pending, 'resumed': len(checkpoint.done), 'graded': 0, 'elapsed': 0.0}
+    if dry_run or not pending:
+        return stats
+
+    start = time.perf_counter()
+    pending_results = []
+
+    def commit():
+        # 여러 결과를 한 번에 기록하고, 기록이 끝난 과제만 체크포인트에 남깁니다.
+        stats['graded'] += student_manager.grade_assignments(pending_results)
+        checkpoint.add([assignment_id for assignment_id, _, _ in pending_results])
+        pending_results.clear()
+        elapsed = time.perf_counter() - start
+        print(f"{stats['graded']}/{stats['pending']}건 재채점 ({stats['graded'] / elapsed:.1f}건/초)")
+
+    chunks = _chunks(iter_outdated_assignments(student_manager, problems, version, set(checkpoint.done), force),
+                     chunk_size)
+    if workers <= 1:
+        _init_worker()
+        for chunk in chunks:
+            pending_results.extend(_regrade_chunk(chunk))
+            if len(pending_results) >= commit_every:
+                commit()
+    else:
+        # 답안을 한꺼번에 넘기지 않고 프로세스당 두 묶음까지만 대기시킵니다.
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = set()
+            for chunk in chunks:
+                futures.add(executor.submit(_regrade_chunk, chunk))
+                if len(futures) < workers * 2:
+                    continue
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending_results.extend(future.result())
+                if len(pending_results) >= commit_every:
+                    commit()
+            for future in futures:
+                pending_results.extend(future.result())
+    if pending_results:
+        commit()
+
+    stats['elapsed'] = round(time.perf_counter() - start, 3)
+    checkpoint.clear()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석기 버전이 다른 제출 과제를 일괄 재채점합니다.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="작업 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=32, help="프로세스에 한 번에 보내는 답안 수")
+    parser.add_argument("--commit-every", type=int, default=200, help="몇 건마다 결과를 기록할지")
+    parser.add_argument("--force", action="store_true", help="버전이 같은 과제도 모두 재채점합니다")
+    parser.add_argument("--dry-run", action="store_true", help="재채점할 과제 수만 확인합니다")
+    parser.add_argument("--data-dir", default="data", help="학생/문제 데이터 디렉터리")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 경로 (기본: <데이터 디렉터리>/regrade_checkpoint.json)")
+    args = parser.parse_args()
+
+    stats = regrade(args.workers, args.chunk_size, args.commit_every, args.force, args.dry_run,
+                    data_dir=args.data_dir, checkpoint_file=args.checkpoint)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
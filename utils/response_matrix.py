@@ -0,0 +1,240 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+import numpy as np
+
+
+def _to_timestamp(value) -> float:
+    """ISO 형식 시각을 epoch 초로 변환합니다."""
+    if not value:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class ResponseMatrix:
+    """학생 × 문제 응답(점수, 제출 시각)을 CSR 형식으로 저장하는 희소 행렬입니다.
+
+    - 행(학생) 조회: indptr/indices/scores/timestamps 구간을 그대로 잘라 반환합니다.
+    - 열(문제) 조회: 압축 시 만들어 두는 열 순서(CSC 인덱스)로 해당 열의 항목만 읽습니다.
+    - 제출 시 추가되는 응답은 행/열별 대기 목록에 쌓였다가 일정 개수가 되면 압축됩니다.
+    두 조회 모두 해당 행/열의 항목 수에 비례하는 시간만 걸립니다.
+    """
+
+    ARRAY_NAMES = ('indptr', 'indices', 'scores', 'timestamps', 'col_indptr', 'col_order')
+
+    def __init__(self, student_ids: Optional[List[str]] = None, problem_ids: Optional[List[str]] = None,
+                 compact_threshold: int = 1000):
+        self.student_ids = list(student_ids or [])
+        self.problem_ids = list(problem_ids or [])
+        self._student_index = {sid: i for i, sid in enumerate(self.student_ids)}
+        self._problem_index = {pid: j for j, pid in enumerate(self.problem_ids)}
+        self.compact_threshold = compact_threshold
+
+        self.indptr = np.zeros(len(self.student_ids) + 1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.scores = np.zeros(0, dtype=np.float32)
+        self.timestamps = np.zeros(0, dtype=np.float64)
+        self.col_indptr = np.zeros(len(self.problem_ids) + 1, dtype=np.int64)
+        self.col_order = np.zeros(0, dtype=np.int64)
+
+        # 압축 전 추가된 응답 (행/열 인덱스 → [(상대 인덱스, 점수, 시각)])
+        self._pending_rows: Dict[int, List[Tuple[int, float, float]]] = {}
+        self._pending_cols: Dict[int, List[Tuple[int, float, float]]] = {}
+        self._pending_count = 0
+        self._dirty = True
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.student_ids), len(self.problem_ids)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices) + self._pending_count
+
+    @classmethod
+    def from_assignments(cls, assignments: List[Dict], **kwargs) -> "ResponseMatrix":
+        """채점된 과제 목록으로 행렬을 생성합니다."""
+        graded = [a for a in assignments if a.get('completed') and a.get('score') is not None]
+        matrix = cls(sorted({a['student_id'] for a in graded}),
+                     sorted({a['problem_id'] for a in graded}), **kwargs)
+        if not graded:
+            return matrix
+
+        rows = np.fromiter((matrix._student_index[a['student_id']] for a in graded), dtype=np.int64, count=len(graded))
+        cols = np.fromiter((matrix._problem_index[a['problem_id']] for a in graded), dtype=np.int32, count=len(graded))
+        scores = np.fromiter((float(a['score']) for a in graded), dtype=np.float32, count=len(graded))
+        timestamps = np.fromiter((_to_timestamp(a.get('submitted_at')) for a in graded), dtype=np.float64, count=len(graded))
+        matrix._build(rows, cols, scores, timestamps)
+        return matrix
+
+    def _build(self, rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, timestamps: np.ndarray):
+        """COO 배열로 CSR/CSC 인덱스를 만듭니다."""
+        n_students, n_problems = self.shape
+        order = np.lexsort((timestamps, rows))
+        self.indices = cols[order].astype(np.int32)
+        self.scores = scores[order].astype(np.float32)
+        self.timestamps = timestamps[order].astype(np.float64)
+        self.indptr = np.zeros(n_students + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_students), out=self.indptr[1:])
+
+        self.col_order = np.argsort(self.indices, kind='stable').astype(np.int64)
+        self.col_indptr = np.zeros(n_problems + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_problems), out=self.col_indptr[1:])
+
+        self._pending_rows, self._pending_cols, self._pending_count = {}, {}, 0
+        self._dirty = True
+
+    def _to_coo(self, include_pending: bool = True):
+        """행렬을 (행, 열, 점수, 시각) 배열로 반환합니다."""
+        rows = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+        cols, scores, timestamps = self.indices, self.scores, self.timestamps
+        if include_pending and self._pending_count:
+            pending = [(r, c, s, t) for r, items in self._pending_rows.items() for c, s, t in items]
+            p_rows, p_cols, p_scores, p_times = (np.array(v) for v in zip(*pending))
+            rows = np.concatenate([rows, p_rows.astype(np.int64)])
+            cols = np.concatenate([cols, p_cols.astype(np.int32)])
+            scores = np.concatenate([scores, p_scores.astype(np.float32)])
+            timestamps = np.concatenate([timestamps, p_times.astype(np.float64)])
+        return rows, cols, scores, timestamps
+
+    def to_coo(self):
+        """(학생 인덱스, 문제 인덱스, 점수, 시각) 배열을 반환합니다."""
+        return self._to_coo()
+
+    def compact(self):
+        """대기 중인 응답을 CSR/CSC 배열에 병합합니다."""
+        if self._pending_count:
+            self._build(*self._to_coo())
+
+    def append(self, student_id: str, problem_id: str, score: float, submitted_at=None):
+        """제출된 응답 하나를 추가합니다."""
+        row = self._student_index.get(student_id)
+        if row is None:
+            row = self._student_index[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+        col = self._problem_index.get(problem_id)
+        if col is None:
+            col = self._problem_index[problem_id] = len(self.problem_ids)
+            self.problem_ids.append(problem_id)
+
+        timestamp = _to_timestamp(submitted_at) or datetime.now().timestamp()
+        self._pending_rows.setdefault(row, []).append((col, float(score), timestamp))
+        self._pending_cols.setdefault(col, []).append((row, float(score), timestamp))
+        self._pending_count += 1
+        if self._pending_count >= self.compact_threshold:
+            self.compact()
+
+    def set_score(self, student_id: str, problem_id: str, score: float, submitted_at=None):
+        """기존 응답의 점수를 바꿉니다(재채점). 같은 제출이 없으면 새 응답으로 추가합니다."""
+        i, j = self._student_index.get(student_id), self._problem_index.get(problem_id)
+        timestamp = _to_timestamp(submitted_at)
+        if i is not None and j is not None:
+            if i + 1 < len(self.indptr):
+                start, end = self.indptr[i], self.indptr[i + 1]
+                matches = np.flatnonzero((self.indices[start:end] == j) & (self.timestamps[start:end] == timestamp))
+                if len(matches):
+                    self.scores[start + matches[0]] = score
+                    self._dirty = True
+                    return
+
+            pending_row = self._pending_rows.get(i, [])
+            for k, (col, _, t) in enumerate(pending_row):
+                if col == j and t == timestamp:
+                    pending_row[k] = (col, float(score), t)
+                    pending_col = self._pending_cols[j]
+                    for m, (row, _, t2) in enumerate(pending_col):
+                        if row == i and t2 == timestamp:
+                            pending_col[m] = (row, float(score), t2)
+                    return
+        self.append(student_id, problem_id, score, submitted_at)
+
+    def row(self, student_id: str):
+        """학생의 응답을 (문제 ID 목록, 점수 배열, 시각 배열)로 반환합니다."""
+        i = self._student_index.get(student_id)
+        if i is None:
+            return [], np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float64)
+
+        cols, scores, timestamps = [], [], []
+        if i + 1 < len(self.indptr):
+            start, end = self.indptr[i], self.indptr[i + 1]
+            cols, scores, timestamps = [self.indices[start:end]], [self.scores[start:end]], [self.timestamps[start:end]]
+        pending = self._pending_rows.get(i)
+        if pending:
+            p_cols, p_scores, p_times = zip(*pending)
+            cols.append(np.array(p_cols, dtype=np.int32))
+            scores.append(np.array(p_scores, dtype=np.float32))
+            timestamps.append(np.array(p_times, dtype=np.float64))
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int32)
+        return ([self.problem_ids[c] for c in cols],
+                np.concatenate(scores) if scores else np.zeros(0, dtype=np.float32),
+                np.concatenate(timestamps) if timestamps else np.zeros(0, dtype=np.float64))
+
+    def column(self, problem_id: str):
+        """문제에 대한 응답을 (학생 ID 목록, 점수 배열, 시각 배열)로 반환합니다."""
+        j = self._problem_index.get(problem_id)
+        if j is None:
+            return [], np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float64)
+
+        entries = np.zeros(0, dtype=np.int64)
+        if j + 1 < len(self.col_indptr):
+            entries = self.col_order[self.col_indptr[j]:self.col_indptr[j + 1]]
+        # 항목 위치로 행 번호를 찾습니다 (indptr에서 이진 탐색).
+        rows = np.searchsorted(self.indptr, entries, side='right') - 1
+        scores, timestamps = self.scores[entries], self.timestamps[entries]
+        pending = self._pending_cols.get(j)
+        if pending:
+            p_rows, p_scores, p_times = zip(*pending)
+            rows = np.concatenate([rows, np.array(p_rows, dtype=np.int64)])
+            scores = np.concatenate([scores, np.array(p_scores, dtype=np.float32)])
+            timestamps = np.concatenate([timestamps, np.array(p_times, dtype=np.float64)])
+        return [self.student_ids[r] for r in rows], scores, timestamps
+
+    def save(self, directory):
+        """행렬을 `.npy` 파일로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 저장 중 중단되어도 이전 파일이 남습니다."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        if self._dirty:
+            for name in self.ARRAY_NAMES:
+                tmp_path = directory / f"{name}.npy.tmp"
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, getattr(self, name))
+                os.replace(tmp_path, directory / f"{name}.npy")
+            self._dirty = False
+
+        meta = {
+            'student_ids': self.student_ids,
+            'problem_ids': self.problem_ids,
+            'pending': [[r, c, s, t] for r, items in self._pending_rows.items() for c, s, t in items]
+        }
+        tmp_path = directory / "meta.json.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, directory / "meta.json")
+
+    @classmethod
+    def load(cls, directory, **kwargs) -> Optional["ResponseMatrix"]:
+        """저장된 행렬을 불러옵니다."""
+        directory = Path(directory)
+        if not (directory / "meta.json").exists():
+            return None
+        with open(directory / "meta.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        matrix = cls(meta['student_ids'], meta['problem_ids'], **kwargs)
+        for name in cls.ARRAY_NAMES:
+            # 재채점 시 점수를 바꾸고 같은 파일에 다시 저장하므로 메모리 맵이 아닌 메모리로 읽습니다.
+            setattr(matrix, name, np.array(np.load(directory / f"{name}.npy")))
+        matrix._dirty = False
+        for r, c, s, t in meta.get('pending', []):
+            matrix._pending_rows.setdefault(r, []).append((c, s, t))
+            matrix._pending_cols.setdefault(c, []).append((r, s, t))
+            matrix._pending_count += 1
+        return matrix
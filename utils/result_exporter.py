@@ -0,0 +1,169 @@
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from datetime import date
+
+from utils.student_manager import get_student_class
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 Parquet 내보내기를 제공하지 않습니다.
+    pa = None
+    pq = None
+
+EXPORT_COLUMNS = [
+    'assignment_id', 'student_id', 'student_name', 'student_grade', 'student_class',
+    'problem_id', 'problem_title', 'problem_type', 'difficulty',
+    'assigned_at', 'submitted_at', 'completed', 'score'
+]
+# 이 크기보다 큰 내보내기 파일은 다운로드 버튼으로 메모리에 올리지 않습니다.
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+# 내보내기 파일을 보관하는 시간 (초)
+EXPORT_RETENTION_SECONDS = 24 * 60 * 60
+
+
+def cleanup_exports(export_dir, max_age: float = EXPORT_RETENTION_SECONDS) -> int:
+    """보관 시간이 지난 내보내기 파일을 삭제하고 삭제한 파일 수를 반환합니다."""
+    export_dir = Path(export_dir)
+    if not export_dir.exists():
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for path in export_dir.glob("results_*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError as e:
+            print(f"내보내기 파일 삭제 중 오류 발생: {str(e)}")
+    return removed
+
+
+class ResultExporter:
+    """과제 결과를 학생/문제 정보와 결합해 청크 단위로 파일에 기록합니다.
+
+    전체 결과를 하나의 데이터프레임으로 만들지 않고 청크 크기만큼만 메모리에
+    올리므로, 내보내는 기간이 길어도 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, students: List[Dict], assignments: List[Dict], problems: List[Dict],
+                 chunk_size: int = 1000):
+        self.students = {s['id']: s for s in students}
+        self.problems = {p['id']: p for p in problems}
+        self.assignments = assignments
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def available_formats() -> List[str]:
+        """사용 가능한 내보내기 형식을 반환합니다."""
+        formats = ['csv', 'jsonl']
+        if pq is not None:
+            formats.append('parquet')
+        return formats
+
+    def iter_rows(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                  class_name: Optional[str] = None, problem_type: Optional[str] = None) -> Iterator[Dict]:
+        """필터 조건에 맞는 결과 행을 하나씩 생성합니다."""
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+
+        for assignment in self.assignments:
+            submitted_at = assignment.get('submitted_at')
+            if (start or end) and not submitted_at:
+                continue
+            if start and submitted_at[:10] < start:
+                continue
+            if end and submitted_at[:10] > end:
+                continue
+
+            student = self.students.get(assignment['student_id'])
+            problem = self.problems.get(assignment['problem_id'])
+            if not student or not problem:
+                continue
+            if class_name and get_student_class(student) != class_name:
+                continue
+            if problem_type and problem.get('type') != problem_type:
+                continue
+
+            yield {
+                'assignment_id': assignment['id'],
+                'student_id': student['id'],
+                'student_name': student.get('name'),
+                'student_grade': student.get('grade'),
+                'student_class': get_student_class(student),
+                'problem_id': problem['id'],
+                'problem_title': problem.get('title'),
+                'problem_type': problem.get('type'),
+                'difficulty': str(problem.get('difficulty', '')),
+                'assigned_at': assignment.get('assigned_at'),
+                'submitted_at': submitted_at,
+                'completed': bool(assignment.get('completed')),
+                'score': assignment.get('score')
+            }
+
+    def iter_chunks(self, **filters) -> Iterator[List[Dict]]:
+        """결과 행을 청크 크기 단위로 묶어 생성합니다."""
+        chunk = []
+        for row in self.iter_rows(**filters):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def export(self, path, fmt: str = 'csv', **filters) -> int:
+        """결과를 파일로 내보내고 기록한 행 수를 반환합니다."""
+        if fmt not in self.available_formats():
+            raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == 'csv':
+            return self._export_csv(path, filters)
+        if fmt == 'jsonl':
+            return self._export_jsonl(path, filters)
+        return self._export_parquet(path, filters)
+
+    def _export_csv(self, path: Path, filters: Dict) -> int:
+        count = 0
+        # 엑셀에서 한글이 깨지지 않도록 BOM을 포함합니다.
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for chunk in self.iter_chunks(**filters):
+                writer.writerows(chunk)
+                count += len(chunk)
+        return count
+
+    def _export_jsonl(self, path: Path, filters: Dict) -> int:
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_chunks(**filters):
+                f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in chunk)
+                count += len(chunk)
+        return count
+
+    def _export_parquet(self, path: Path, filters: Dict) -> int:
+        schema = pa.schema([
+            (name, pa.bool_() if name == 'completed' else pa.float64() if name == 'score' else pa.string())
+            for name in EXPORT_COLUMNS
+        ])
+        # 학년처럼 화면에서 숫자로 저장되는 값도 있으므로 문자열 열은 모두 문자열로 바꿉니다.
+        string_columns = [field.name for field in schema if pa.types.is_string(field.type)]
+        count = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in self.iter_chunks(**filters):
+                for row in chunk:
+                    for name in string_columns:
+                        if row[name] is not None:
+                            row[name] = str(row[name])
+                batch = pa.RecordBatch.from_pylist(chunk, schema=schema)
+                writer.write_batch(batch)
+                count += len(chunk)
+            if count == 0:
+                writer.write_table(schema.empty_table())
+        return count
@@ -0,0 +1,176 @@
+import hashlib
+import math
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.model_answer_store import get_model_answer_text
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+# 해시 공간 크기 (충돌이 드물 만큼 크고, 어휘 사전을 따로 저장할 필요가 없습니다)
+N_FEATURES = 2 ** 20
+
+_service = None
+_service_lock = threading.Lock()
+
+
+class SimilarityService:
+    """문제 은행의 모범 답안으로 만든 해시 n-gram TF-IDF 유사도 서비스입니다.
+
+    단어 1-gram과 2-gram을 해시해 희소 벡터(정렬된 인덱스, 값)로 표현합니다.
+    모범 답안 벡터는 미리 계산해 `data/similarity_index.npz`에 저장하므로,
+    채점 시에는 학생 답안만 벡터화해 한 번의 희소 내적으로 코사인 유사도를 구합니다.
+    """
+
+    def __init__(self, data_dir: str = "data", n_features: int = N_FEATURES):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.index_file = self.data_dir / "similarity_index.npz"
+        self.n_features = n_features
+        self.n_docs = 0
+        self._df_indices = np.empty(0, dtype=np.int64)
+        self._idf = np.empty(0, dtype=np.float32)
+        self._vectors = {}  # 모범 답안 텍스트 해시 → (인덱스, 값)
+        self._loaded_mtime = None
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _features(self, text: str) -> np.ndarray:
+        """텍스트의 1-gram, 2-gram 해시 인덱스를 반환합니다."""
+        words = WORD_PATTERN.findall(text.lower())
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return np.fromiter(
+            (zlib.crc32(gram.encode('utf-8')) % self.n_features for gram in grams),
+            dtype=np.int64, count=len(grams)
+        )
+
+    def _idf_weights(self, indices: np.ndarray) -> np.ndarray:
+        """인덱스별 IDF 가중치를 반환합니다. 문제 은행에 없는 n-gram은 가장 큰 가중치를 받습니다."""
+        max_idf = math.log((1 + self.n_docs) / 1) + 1
+        weights = np.full(len(indices), max_idf, dtype=np.float32)
+        if len(self._df_indices):
+            positions = np.searchsorted(self._df_indices, indices)
+            positions = np.minimum(positions, len(self._df_indices) - 1)
+            found = self._df_indices[positions] == indices
+            weights[found] = self._idf[positions[found]]
+        return weights
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """텍스트를 L2 정규화된 TF-IDF 희소 벡터로 변환합니다."""
+        self._load()
+        indices, counts = np.unique(self._features(text), return_counts=True)
+        values = counts.astype(np.float32) * self._idf_weights(indices)
+        norm = np.linalg.norm(values)
+        if norm > 0:
+            values /= norm
+        return indices, values
+
+    def build(self, problems: List[Dict]):
+        """문제 은행의 모범 답안으로 IDF를 계산하고 모범 답안 벡터를 미리 만들어 저장합니다."""
+        texts = list(dict.fromkeys(t for t in (get_model_answer_text(p) for p in problems) if t))
+        features = [np.unique(self._features(text)) for text in texts]
+        self.n_docs = len(texts)
+        if features:
+            self._df_indices, df = np.unique(np.concatenate(features), return_counts=True)
+        else:
+            self._df_indices, df = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        self._idf = (np.log((1 + self.n_docs) / (1 + df)) + 1).astype(np.float32)
+
+        self._vectors = {}
+        for text in texts:
+            indices, counts = np.unique(self._features(text), return_counts=True)
+            values = counts.astype(np.float32) * self._idf_weights(indices)
+            norm = np.linalg.norm(values)
+            self._vectors[self._hash(text)] = (indices, values / norm if norm > 0 else values)
+        self._save()
+
+    def _save(self):
+        hashes = list(self._vectors)
+        lengths = [len(self._vectors[h][0]) for h in hashes]
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        indices = np.concatenate([self._vectors[h][0] for h in hashes]) if hashes else np.empty(0, dtype=np.int64)
+        values = np.concatenate([self._vectors[h][1] for h in hashes]) if hashes else np.empty(0, dtype=np.float32)
+        # 임시 파일에 쓴 뒤 교체하므로 다른 프로세스가 저장 중인 인덱스를 읽지 않습니다.
+        tmp_path = self.index_file.with_suffix('.npz.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f, n_docs=self.n_docs, n_features=self.n_features,
+                df_indices=self._df_indices, idf=self._idf,
+                hashes=np.array(hashes, dtype='U40'), indptr=indptr, indices=indices, values=values
+            )
+        os.replace(tmp_path, self.index_file)
+        self._loaded_mtime = self.index_file.stat().st_mtime_ns
+
+    def _load(self):
+        """저장된 인덱스를 불러옵니다. 다른 프로세스에서 갱신되었으면 다시 읽습니다."""
+        if not self.index_file.exists():
+            return
+        mtime = self.index_file.stat().st_mtime_ns
+        if mtime == self._loaded_mtime:
+            return
+        self._loaded_mtime = mtime
+        with np.load(self.index_file) as data:
+            if int(data['n_features']) != self.n_features:
+                return
+            self.n_docs = int(data['n_docs'])
+            self._df_indices = data['df_indices']
+            self._idf = data['idf']
+            indptr, indices, values = data['indptr'], data['indices'], data['values']
+            self._vectors = {
+                str(h): (indices[indptr[i]:indptr[i + 1]], values[indptr[i]:indptr[i + 1]])
+                for i, h in enumerate(data['hashes'])
+            }
+
+    def get_model_vector(self, model_answer: str) -> Tuple[np.ndarray, np.ndarray]:
+        """모범 답안 벡터를 반환합니다. 미리 계산되지 않은 답안은 벡터화해 메모리에 보관합니다."""
+        self._load()
+        key = self._hash(model_answer)
+        vector = self._vectors.get(key)
+        if vector is None:
+            vector = self.vectorize(model_answer)
+            self._vectors[key] = vector
+        return vector
+
+    @staticmethod
+    def _dot(a: Tuple[np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray]) -> float:
+        _, ia, ib = np.intersect1d(a[0], b[0], assume_unique=True, return_indices=True)
+        return float(np.dot(a[1][ia], b[1][ib]))
+
+    def similarity(self, student_answer: str, model_answer: str) -> float:
+        """학생 답안과 모범 답안의 코사인 유사도(0~1)를 반환합니다."""
+        if not student_answer or not model_answer:
+            return 0.0
+        return self._dot(self.vectorize(student_answer), self.get_model_vector(model_answer))
+
+    def score_batch(self, student_answers: List[str], model_answer: str) -> np.ndarray:
+        """여러 학생 답안을 하나의 모범 답안과 비교해 유사도 배열을 반환합니다."""
+        model_indices, model_values = self.get_model_vector(model_answer)
+        vectors = [self.vectorize(answer or '') for answer in student_answers]
+        if not vectors or not len(model_indices):
+            return np.zeros(len(vectors), dtype=np.float32)
+
+        rows = np.repeat(np.arange(len(vectors)), [len(v[0]) for v in vectors])
+        indices = np.concatenate([v[0] for v in vectors])
+        values = np.concatenate([v[1] for v in vectors])
+        positions = np.minimum(np.searchsorted(model_indices, indices), len(model_indices) - 1)
+        matched = model_indices[positions] == indices
+        return np.bincount(
+            rows[matched], weights=values[matched] * model_values[positions[matched]], minlength=len(vectors)
+        ).astype(np.float32)
+
+
+def get_similarity_service(data_dir: str = "data") -> SimilarityService:
+    """프로세스에서 공유하는 유사도 서비스를 반환합니다."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SimilarityService(data_dir)
+    return _service
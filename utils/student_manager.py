@@ -1,26 +1,74 @@
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from datetime import datetime
 import uuid
 import random
+from utils.response_matrix import ResponseMatrix
+from utils.ranking_service import RankingService
+from utils.feedback_cache import get_analyzer_version
+
+@contextmanager
+def _file_lock(path):
+    """여러 프로세스가 함께 쓰는 배타적 파일 잠금입니다 (Windows는 msvcrt, 그 외에는 fcntl)."""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _write_json(path, data):
+    """임시 파일에 쓴 뒤 교체해, 잠금 없이 읽는 쪽도 쓰다 만 파일을 보지 않게 합니다."""
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def get_student_class(student: Dict) -> Optional[str]:
+    """학생의 반을 반환합니다. 학생 관리 화면은 'class_name'으로 저장하며, 이전 기록의 'class'도 읽습니다."""
+    return student.get('class_name') or student.get('class') or None
 
 class StudentManager:
-    def __init__(self):
+    def __init__(self, data_dir: str = "data"):
         """학생 관리자를 초기화합니다."""
-        self.data_dir = Path("data")
+        self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
         self.students_file = self.data_dir / "students.json"
         self.assignments_file = self.data_dir / "assignments.json"
         self.settings_file = self.data_dir / "settings.json"
         self.problem_requests_file = self.data_dir / "problem_requests.json"
+        self.response_matrix_dir = self.data_dir / "response_matrix"
+        self.lock_file = self.data_dir / "student_data.lock"
         
         # 초기화
         self.students = []
         self.assignments = []
         self.settings = {}
         self.problem_requests = []
+        self._response_matrix = None
+        self._ranking_service = None
+        self._lock_state = threading.local()
         
         self._load_data()
     
@@ -57,39 +105,57 @@ class StudentManager:
         else:
             self.problem_requests = []
     
+    @contextmanager
+    def _data_lock(self):
+        """파일 잠금을 잡고 최신 데이터를 다시 읽습니다.
+        
+        페이지와 첨삭 작업자처럼 여러 인스턴스(또는 프로세스)가 같은 파일을 저장하므로,
+        변경은 항상 이 안에서 최신 데이터에 적용해 다른 인스턴스가 저장한 내용을 덮어쓰지 않습니다.
+        """
+        if getattr(self._lock_state, 'depth', 0):
+            yield
+            return
+        with _file_lock(self.lock_file):
+            self._lock_state.depth = 1
+            try:
+                self._load_data()
+                # 응답 행렬과 순위 집계도 다른 인스턴스가 갱신했을 수 있으므로 다음 사용 시 파일에서 읽습니다.
+                self._response_matrix = None
+                self._ranking_service = None
+                yield
+            finally:
+                self._lock_state.depth = 0
+    
     def _save_data(self):
         """데이터를 저장합니다."""
         # 학생 데이터 저장
-        with open(self.students_file, 'w', encoding='utf-8') as f:
-            json.dump(self.students, f, ensure_ascii=False, indent=2)
+        _write_json(self.students_file, self.students)
             
         # 과제 데이터 저장
-        with open(self.assignments_file, 'w', encoding='utf-8') as f:
-            json.dump(self.assignments, f, ensure_ascii=False, indent=2)
+        _write_json(self.assignments_file, self.assignments)
             
         # 설정 데이터 저장
-        with open(self.settings_file, 'w', encoding='utf-8') as f:
-            json.dump(self.settings, f, ensure_ascii=False, indent=2)
+        _write_json(self.settings_file, self.settings)
             
         # 문제 요청 데이터 저장
-        with open(self.problem_requests_file, 'w', encoding='utf-8') as f:
-            json.dump(self.problem_requests, f, ensure_ascii=False, indent=2)
+        _write_json(self.problem_requests_file, self.problem_requests)
     
     def add_student(self, name, grade, level, contact=None, notes=None):
         """새로운 학생을 추가합니다."""
-        student = {
-            'id': str(uuid.uuid4()),
-            'name': name,
-            'grade': grade,
-            'level': level,
-            'contact': contact or '',
-            'notes': notes or '',
-            'status': '활성',
-            'created_at': datetime.now().isoformat()
-        }
-        self.students.append(student)
-        self._save_data()
-        return student
+        with self._data_lock():
+            student = {
+                'id': str(uuid.uuid4()),
+                'name': name,
+                'grade': grade,
+                'level': level,
+                'contact': contact or '',
+                'notes': notes or '',
+                'status': '활성',
+                'created_at': datetime.now().isoformat()
+            }
+            self.students.append(student)
+            self._save_data()
+            return student
     
     def get_all_students(self):
         """모든 학생 목록을 반환합니다."""
@@ -102,23 +168,33 @@ class StudentManager:
                 return student
         return None
     
+    def get_student_by_name(self, name):
+        """이름으로 학생 정보를 반환합니다. 같은 이름이 여러 명이면 먼저 등록된 학생을 반환합니다."""
+        name = (name or '').strip()
+        for student in self.students:
+            if student['name'].strip() == name:
+                return student
+        return None
+    
     def update_student(self, student_id, **kwargs):
         """학생 정보를 업데이트합니다."""
-        for student in self.students:
-            if student['id'] == student_id:
-                student.update(kwargs)
-                self._save_data()
-                return True
-        return False
+        with self._data_lock():
+            for student in self.students:
+                if student['id'] == student_id:
+                    student.update(kwargs)
+                    self._save_data()
+                    return True
+            return False
     
     def delete_student(self, student_id):
         """학생을 삭제합니다."""
-        for i, student in enumerate(self.students):
-            if student['id'] == student_id:
-                del self.students[i]
-                self._save_data()
-                return True
-        return False
+        with self._data_lock():
+            for i, student in enumerate(self.students):
+                if student['id'] == student_id:
+                    del self.students[i]
+                    self._save_data()
+                    return True
+            return False
     
     def get_auto_assign_settings(self):
         """자동 할당 설정을 반환합니다."""
@@ -131,13 +207,14 @@ class StudentManager:
     
     def update_auto_assign_settings(self, new_settings):
         """자동 할당 설정을 업데이트합니다."""
-        try:
-            self.settings['auto_assign'] = new_settings
-            self._save_data()
-            return True
-        except Exception as e:
-            print(f"설정 업데이트 중 오류 발생: {str(e)}")
-            return False
+        with self._data_lock():
+            try:
+                self.settings['auto_assign'] = new_settings
+                self._save_data()
+                return True
+            except Exception as e:
+                print(f"설정 업데이트 중 오류 발생: {str(e)}")
+                return False
 
     def get_student_assignments(self, student_id):
         """학생에게 할당된 문제 목록을 반환합니다."""
@@ -145,46 +222,143 @@ class StudentManager:
     
     def assign_problems(self, student_id, problem_ids):
         """학생에게 문제를 할당합니다."""
-        for problem_id in problem_ids:
-            assignment = {
-                'id': str(uuid.uuid4()),
-                'student_id': student_id,
-                'problem_id': problem_id,
-                'assigned_at': datetime.now().isoformat(),
-                'completed': False,
-                'submitted_at': None,
-                'score': None
-            }
-            self.assignments.append(assignment)
-        self._save_data()
-        return True
+        with self._data_lock():
+            for problem_id in problem_ids:
+                assignment = {
+                    'id': str(uuid.uuid4()),
+                    'student_id': student_id,
+                    'problem_id': problem_id,
+                    'assigned_at': datetime.now().isoformat(),
+                    'completed': False,
+                    'submitted_at': None,
+                    'score': None
+                }
+                self.assignments.append(assignment)
+            self._save_data()
+            return True
     
     def submit_assignment(self, assignment_id, answer, score=None):
         """학생의 답안을 제출하고 점수를 기록합니다."""
-        for assignment in self.assignments:
-            if assignment['id'] == assignment_id:
-                assignment['completed'] = True
-                assignment['submitted_at'] = datetime.now().isoformat()
+        with self._data_lock():
+            for assignment in self.assignments:
+                if assignment['id'] == assignment_id:
+                    assignment['completed'] = True
+                    assignment['submitted_at'] = datetime.now().isoformat()
+                    assignment['student_answer'] = answer
+                    assignment['score'] = score
+                    self._save_data()
+                    if score is not None:
+                        self._record_response(assignment)
+                    self._record_ranking(assignment, completed=True)
+                    return True
+            return False
+    
+    def grade_assignment(self, assignment_id, score, feedback=None):
+        """제출된 과제를 채점(또는 재채점)합니다."""
+        return self.grade_assignments([(assignment_id, score, feedback)]) > 0
+    
+    def grade_assignments(self, results):
+        """여러 과제의 (과제 ID, 점수, 피드백) 채점 결과를 한 번에 기록합니다."""
+        with self._data_lock():
+            assignments = {a['id']: a for a in self.assignments}
+            graded = 0
+            for assignment_id, score, feedback in results:
+                assignment = assignments.get(assignment_id)
+                if assignment is None:
+                    continue
+                previous_score = assignment.get('score')
                 assignment['score'] = score
+                if feedback is not None:
+                    assignment['feedback'] = feedback
+                    if feedback.get('partial'):
+                        # 시간 예산 때문에 일부 단계만 반영된 결과는 재채점 대상으로 남깁니다.
+                        assignment.pop('analyzer_version', None)
+                    else:
+                        # 분석기 코드가 바뀐 뒤 재채점이 필요한 과제를 찾을 수 있도록 버전을 기록합니다.
+                        assignment['analyzer_version'] = get_analyzer_version()
+                        if 'keyword_matches' in feedback:
+                            assignment['matched_keywords'] = feedback['keyword_matches']['matched']
+                self._record_response(assignment, save=False)
+                self._record_ranking(assignment, previous_score=previous_score, save=False)
+                graded += 1
+        
+            if graded:
                 self._save_data()
-                return True
-        return False
+                if self._response_matrix is not None:
+                    self._response_matrix.save(self.response_matrix_dir)
+                if self._ranking_service is not None:
+                    self._ranking_service.save()
+            return graded
+    
+    def get_response_matrix(self):
+        """학생×문제 응답 행렬을 반환합니다. 저장된 행렬이 없으면 과제 기록으로 생성합니다."""
+        if self._response_matrix is None:
+            self._response_matrix = ResponseMatrix.load(self.response_matrix_dir)
+            if self._response_matrix is None:
+                self._response_matrix = ResponseMatrix.from_assignments(self.assignments)
+                self._response_matrix.save(self.response_matrix_dir)
+        return self._response_matrix
+    
+    def get_ranking_service(self):
+        """주간 순위 서비스를 반환합니다. 집계값이 없으면 과제 기록으로 생성합니다."""
+        if self._ranking_service is None:
+            self._ranking_service = RankingService(self.data_dir)
+            if not self._ranking_service.exists():
+                self._ranking_service.rebuild(self.assignments)
+        return self._ranking_service
+    
+    def get_class_names(self):
+        """등록된 학생들의 반 목록을 정렬해 반환합니다."""
+        return sorted({get_student_class(s) for s in self.students if get_student_class(s)})
+    
+    def get_class_student_ids(self, class_name=None):
+        """반에 속한 학생 ID 집합을 반환합니다. 반을 지정하지 않으면 None을 반환합니다."""
+        if not class_name:
+            return None
+        return {s['id'] for s in self.students if get_student_class(s) == class_name}
+    
+    def _record_ranking(self, assignment, completed=False, previous_score=None, save=True):
+        """제출/채점 결과를 주간 순위 집계에 반영합니다."""
+        if not assignment.get('submitted_at'):
+            return
+        # 아직 집계 파일이 없으면 다음 조회 시 전체 기록으로 만들어집니다.
+        if self._ranking_service is None and not (self.data_dir / "rankings.json").exists():
+            return
+        ranking_service = self.get_ranking_service()
+        if completed:
+            ranking_service.record_submission(assignment['student_id'], assignment['submitted_at'],
+                                              assignment['score'], save=save)
+        else:
+            ranking_service.record_grade(assignment['student_id'], assignment['submitted_at'],
+                                         assignment['score'], previous_score, save=save)
+    
+    def _record_response(self, assignment, save=True):
+        """채점된 제출을 응답 행렬에 반영합니다."""
+        # 아직 생성된 행렬이 없으면 다음 조회 시 전체 기록으로 만들어집니다.
+        if self._response_matrix is None and not (self.response_matrix_dir / "meta.json").exists():
+            return
+        matrix = self.get_response_matrix()
+        matrix.set_score(assignment['student_id'], assignment['problem_id'],
+                         assignment['score'], assignment['submitted_at'])
+        if save:
+            matrix.save(self.response_matrix_dir)
     
     def request_problem(self, student_id, problem_type, difficulty, description):
         """학생이 문제를 요청합니다."""
-        request = {
-            'id': str(uuid.uuid4()),
-            'student_id': student_id,
-            'problem_type': problem_type,
-            'difficulty': difficulty,
-            'description': description,
-            'status': '대기',
-            'created_at': datetime.now().isoformat(),
-            'processed_at': None
-        }
-        self.problem_requests.append(request)
-        self._save_data()
-        return request
+        with self._data_lock():
+            request = {
+                'id': str(uuid.uuid4()),
+                'student_id': student_id,
+                'problem_type': problem_type,
+                'difficulty': difficulty,
+                'description': description,
+                'status': '대기',
+                'created_at': datetime.now().isoformat(),
+                'processed_at': None
+            }
+            self.problem_requests.append(request)
+            self._save_data()
+            return request
     
     def get_problem_requests(self, status=None):
         """문제 요청 목록을 반환합니다."""
@@ -194,14 +368,15 @@ class StudentManager:
     
     def process_problem_request(self, request_id, action, feedback=None):
         """문제 요청을 처리합니다."""
-        for request in self.problem_requests:
-            if request['id'] == request_id:
-                request['status'] = action
-                request['processed_at'] = datetime.now().isoformat()
-                request['feedback'] = feedback
-                self._save_data()
-                return True
-        return False
+        with self._data_lock():
+            for request in self.problem_requests:
+                if request['id'] == request_id:
+                    request['status'] = action
+                    request['processed_at'] = datetime.now().isoformat()
+                    request['feedback'] = feedback
+                    self._save_data()
+                    return True
+            return False
     
     def get_auto_assigned_problems(self, student_id, count=3):
         """학생의 레벨에 맞는 문제를 자동으로 할당합니다."""
@@ -209,17 +384,10 @@ class StudentManager:
         if not student:
             return []
         
-        # 난이도 매핑
-        difficulty_mapping = {
-            '초급': 1,
-            '중급': 2,
-            '고급': 3
-        }
-        
-        student_level = difficulty_mapping.get(student['level'], 2)  # 기본값: 중급
-        
         # 문제 목록 가져오기
-        from utils.problem_manager import ProblemManager
+        from utils.problem_manager import ProblemManager, DIFFICULTY_MAPPING
+        student_level = DIFFICULTY_MAPPING.get(student['level'], 2)  # 기본값: 중급
+        
         problem_manager = ProblemManager()
         problems = problem_manager.get_all_problems()
         if not problems:
@@ -228,7 +396,7 @@ class StudentManager:
         # 학생 레벨에 맞는 문제 필터링
         suitable_problems = [
             p for p in problems 
-            if difficulty_mapping.get(p['difficulty'], 2) <= student_level
+            if problem_manager.get_difficulty_level(p) <= student_level
         ]
         
         # 랜덤으로 문제 선택
@@ -242,4 +410,3 @@ class StudentManager:
         self.assign_problems(student_id, problem_ids)
         
         return selected_problems 
-            return False 
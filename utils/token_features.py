@@ -0,0 +1,100 @@
+import numpy as np
+
+# Doc.to_array로 한 번에 추출하는 토큰 속성 (열 순서)
+ATTRIBUTES = ["POS", "DEP", "TAG", "LEMMA", "LOWER", "MORPH", "IS_ALPHA", "IS_SPACE", "LENGTH", "SENT_START", "HEAD", "SPACY"]
+
+
+class TokenFeatures:
+    """`Doc`을 한 번만 순회해 분석기에 필요한 토큰 속성을 NumPy 배열로 보관합니다.
+
+    품사/의존 관계/태그/표제어는 spaCy 문자열 저장소의 해시 값이므로 `ids()`로 비교할
+    값을 구해 벡터 연산으로 검사합니다. 피드백 문장에 들어갈 토큰 텍스트는 `doc`에서
+    필요한 위치만 꺼내 씁니다.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.strings = doc.vocab.strings
+        n = len(doc)
+        array = doc.to_array(ATTRIBUTES).reshape(n, len(ATTRIBUTES)) if n else \
+            np.zeros((0, len(ATTRIBUTES)), dtype=np.uint64)
+        (self.pos, self.dep, self.tag, self.lemma, self.lower, self.morph,
+         is_alpha, is_space, length, sent_start, head, spacy) = array.T
+        self.is_alpha = is_alpha.astype(bool)
+        self.is_space = is_space.astype(bool)
+        self.trailing_space = spacy.astype(bool)
+        self.length = length.astype(np.int64)
+
+        self.index = np.arange(n)
+        # HEAD는 상대 위치(음수는 uint64로 저장됨)이므로 절대 위치로 바꿉니다.
+        # 문장의 ROOT는 자기 자신을 가리킵니다.
+        self.head = self.index + head.astype(np.int64)
+        starts = sent_start.astype(np.int64) == 1
+        if n:
+            starts[0] = True
+        self.sent_starts = np.flatnonzero(starts)
+        self.sent_id = np.cumsum(starts) - 1
+        self.n_sents = len(self.sent_starts)
+
+    def __len__(self):
+        return len(self.doc)
+
+    def ids(self, *labels):
+        """문자열 라벨들의 해시 값을 배열로 반환합니다."""
+        return np.array([self.strings[label] for label in labels], dtype=np.uint64)
+
+    def is_in(self, values, *labels):
+        """속성 배열의 각 값이 주어진 라벨 중 하나인지 반환합니다."""
+        return np.isin(values, self.ids(*labels))
+
+    def sentence_lengths(self) -> np.ndarray:
+        """문장별 토큰 수를 반환합니다."""
+        return np.bincount(self.sent_id, minlength=self.n_sents)
+
+    def sentence_word_counts(self) -> np.ndarray:
+        """문장별 공백 기준 단어 수(`sent.text.split()`의 길이)를 반환합니다."""
+        if not len(self.doc):
+            return np.zeros(0, dtype=np.int64)
+        previous_space = np.concatenate([[True], self.trailing_space[:-1] | self.is_space[:-1]])
+        previous_space[self.sent_starts] = True
+        word_start = previous_space & ~self.is_space
+        return np.bincount(self.sent_id[word_start], minlength=self.n_sents)
+
+    def last_per_sentence(self, mask) -> np.ndarray:
+        """문장마다 조건을 만족하는 마지막 토큰 위치를 반환합니다 (없으면 -1)."""
+        result = np.full(self.n_sents, -1, dtype=np.int64)
+        positions = np.flatnonzero(mask)
+        np.maximum.at(result, self.sent_id[positions], positions)
+        return result
+
+    def has_child(self, mask) -> np.ndarray:
+        """토큰마다 조건을 만족하는 자식 토큰이 있는지 반환합니다."""
+        children = mask & (self.head != self.index)
+        result = np.zeros(len(self.doc), dtype=bool)
+        result[self.head[children]] = True
+        return result
+
+    def morph_values(self, mask, feature: str) -> set:
+        """조건을 만족하는 토큰들의 형태 정보(예: Tense) 값 집합을 반환합니다."""
+        values = set()
+        for morph_hash in np.unique(self.morph[mask]):
+            if morph_hash == 0:
+                continue
+            for field in self.strings[int(morph_hash)].split('|'):
+                name, _, value = field.partition('=')
+                if name == feature:
+                    values.update(value.split(','))
+        return values
+
+    def texts(self, positions):
+        """위치 목록의 토큰 텍스트를 반환합니다."""
+        return [self.doc[int(i)].text for i in positions]
+
+
+def get_token_features(doc) -> TokenFeatures:
+    """Doc의 토큰 속성 배열을 반환합니다. 같은 Doc은 한 번만 추출합니다."""
+    features = doc.user_data.get('token_features')
+    if features is None:
+        features = TokenFeatures(doc)
+        doc.user_data['token_features'] = features
+    return features